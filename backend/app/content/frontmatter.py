@@ -1,12 +1,16 @@
 """Frontmatter parser — splits YAML front matter from Markdown body."""
 
 import re
+from pathlib import Path
 from typing import Any
 
 import yaml
 
 _DELIMITER = re.compile(r"^---\s*$", re.MULTILINE)
 
+# libyaml's loader when PyYAML was built with it; same results, far less time.
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def parse_frontmatter(text: str) -> tuple[dict[str, Any], str]:
     """Split YAML front matter from Markdown body.
@@ -29,15 +33,41 @@ def parse_frontmatter(text: str) -> tuple[dict[str, Any], str]:
     yaml_block = text[first.end() : second.start()].strip()
     body = text[second.end() :].lstrip("\n")
 
+    return _load_yaml(yaml_block), body
+
+
+def read_frontmatter(file_path: Path) -> dict[str, Any]:
+    """Read only the front matter of a Markdown file.
+
+    Reads line by line and stops at the closing ``---``, so the body is never
+    decoded or held in memory. Returns the same metadata ``parse_frontmatter``
+    would for the file's full text.
+
+    Raises:
+        ValueError: If the YAML block is present but cannot be parsed.
+    """
+    lines: list[str] = []
+    with file_path.open("rb") as f:
+        if not _DELIMITER.match(f.readline().decode("utf-8")):
+            return {}
+        for raw in f:
+            line = raw.decode("utf-8")
+            if _DELIMITER.match(line):
+                return _load_yaml("".join(lines).strip())
+            lines.append(line)
+    return {}  # unterminated block: parse_frontmatter treats it as body
+
+
+def _load_yaml(yaml_block: str) -> dict[str, Any]:
     if not yaml_block:
-        return {}, body
+        return {}
 
     try:
-        metadata = yaml.safe_load(yaml_block)
+        metadata = yaml.load(yaml_block, Loader=_SafeLoader)
     except yaml.YAMLError as exc:
         raise ValueError(f"Invalid YAML front matter: {exc}") from exc
 
     if not isinstance(metadata, dict):
         raise ValueError("Front matter must be a YAML mapping")
 
-    return metadata, body
+    return metadata
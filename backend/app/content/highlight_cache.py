@@ -0,0 +1,83 @@
+"""Disk-backed, content-addressed cache for highlighted code blocks.
+
+Entries are immutable files named by a caller-supplied content hash, so any
+number of processes can share one directory without locking: writes go to a
+temporary file that is atomically renamed into place. The directory is kept
+under ``max_bytes`` by ``prune``, which evicts least recently used entries.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+class HighlightCache:
+    """Key/value store of rendered HTML fragments under ``directory``.
+
+    ``hits`` and ``misses`` count lookups made through this instance.
+    """
+
+    def __init__(self, directory: Path, *, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.html"
+
+    def get(self, key: str) -> str | None:
+        """Return the cached HTML for ``key``, or None on a miss."""
+        path = self._path(key)
+        try:
+            html = path.read_text(encoding="utf-8")
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            os.utime(path)  # mark as recently used for LRU eviction
+        except OSError:
+            pass
+        return html
+
+    def put(self, key: str, html: str) -> None:
+        """Store ``html`` under ``key``. Failures are ignored — the cache is best-effort."""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+                tmp.write(html)
+            os.replace(tmp_name, path)
+        except OSError:
+            pass
+
+    def prune(self) -> int:
+        """Evict least recently used entries until the cache fits ``max_bytes``.
+
+        Returns the number of entries removed.
+        """
+        entries: list[tuple[float, int, Path]] = []
+        total = 0
+        for path in self.directory.glob("*/*.html"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.max_bytes:
+            return 0
+
+        evicted = 0
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        return evicted
@@ -3,15 +3,26 @@
 No DB access. Returns dataclasses that sync.py bridges into CRUD calls.
 """
 
+import hashlib
 import re
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import UTC, date, datetime, time
+from itertools import repeat
 from pathlib import Path
 from typing import Any
 
 from app.content import slugify
-from app.content.frontmatter import parse_frontmatter
-from app.content.renderer import TocEntry, extract_toc, render_markdown
+from app.content.frontmatter import parse_frontmatter, read_frontmatter
+from app.content.renderer import (
+    RENDERER_VERSION,
+    TocEntry,
+    configure_highlight_cache,
+    get_highlight_cache,
+    render_document,
+    render_markdown,
+)
 
 # Matches filenames like 2024-01-15-my-post-slug.md
 _DATE_SLUG_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})-(.+)$")
@@ -45,11 +56,30 @@ def _relative_source(file_path: Path, content_dir: Path) -> str:
     return file_path.relative_to(content_dir).as_posix()
 
 
+def source_fingerprint(data: bytes) -> str:
+    """Return a SHA-256 hex digest of raw file bytes and ``RENDERER_VERSION``.
+
+    Content sync compares this against the value stored on the row to skip
+    files whose source and renderer are both unchanged.
+    """
+    digest = hashlib.sha256(RENDERER_VERSION.encode("utf-8"))
+    digest.update(data)
+    return digest.hexdigest()
+
+
 # ---------------------------------------------------------------------------
 # Dataclasses
 # ---------------------------------------------------------------------------
 
 
+@dataclass(slots=True)
+class SourceFile:
+    """A content file's bytes, read once, and their ``source_fingerprint``."""
+
+    data: bytes
+    fingerprint: str
+
+
 @dataclass(slots=True)
 class ParsedPost:
     source_path: str
@@ -62,6 +92,10 @@ class ParsedPost:
     published_at: datetime | None
     tags: list[str]
     toc: list[TocEntry]
+    word_count: int
+    images: list[str]
+    links: list[str]
+    source_hash: str
 
 
 @dataclass(slots=True)
@@ -76,6 +110,7 @@ class ParsedProject:
     repo_url: str | None
     featured: bool
     sort_order: int
+    source_hash: str
 
 
 @dataclass(slots=True)
@@ -88,37 +123,60 @@ class ParsedPage:
     frontmatter: dict[str, Any]
 
 
+@dataclass(slots=True)
+class PostMeta:
+    """Frontmatter-derived fields of a post, read without touching the body."""
+
+    source_path: str
+    title: str
+    slug: str
+    published: bool
+    published_at: datetime | None
+    tags: list[str]
+
+
+@dataclass(slots=True)
+class ProjectMeta:
+    """Frontmatter-derived fields of a project, read without touching the body."""
+
+    source_path: str
+    title: str
+    slug: str
+    featured: bool
+    sort_order: int
+
+
 # ---------------------------------------------------------------------------
 # Single-file loaders
 # ---------------------------------------------------------------------------
 
 
-def load_post(file_path: Path, content_dir: Path) -> ParsedPost:
-    """Parse a single post Markdown file.
+def read_source(file_path: Path) -> SourceFile:
+    """Read a content file and fingerprint exactly the bytes that were read."""
+    data = file_path.read_bytes()
+    return SourceFile(data=data, fingerprint=source_fingerprint(data))
 
-    Slug and date are derived from the ``YYYY-MM-DD-slug.md`` filename.
-    Frontmatter fields override filename-derived values when present.
 
-    Args:
-        file_path: Absolute path to the ``.md`` file.
-        content_dir: Root content directory (used to compute ``source_path``).
+def _source_text(source: SourceFile) -> str:
+    """Decode like ``Path.read_text``, including its newline translation."""
+    return source.data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
 
-    Raises:
-        ValueError: If ``title`` is missing from frontmatter.
-    """
-    text = file_path.read_text(encoding="utf-8")
-    meta, body = parse_frontmatter(text)
 
+def _require_title(meta: dict[str, Any], file_path: Path) -> str:
     if "title" not in meta:
         raise ValueError(f"Missing required frontmatter field 'title' in {file_path}")
+    return str(meta["title"])
+
+
+def _post_meta(meta: dict[str, Any], file_path: Path, content_dir: Path) -> PostMeta:
+    """Derive a post's metadata from its frontmatter and ``YYYY-MM-DD-slug`` filename."""
+    title = _require_title(meta, file_path)
 
     stem = file_path.stem
     date_match = _DATE_SLUG_RE.match(stem)
     filename_slug = date_match.group(2) if date_match else stem
     filename_date_str = date_match.group(1) if date_match else None
 
-    slug = str(meta.get("slug", filename_slug))
-
     # Resolve published_at: frontmatter > filename date
     published_at: datetime | None = None
     if "published_at" in meta:
@@ -128,50 +186,119 @@ def load_post(file_path: Path, content_dir: Path) -> ParsedPost:
     elif filename_date_str:
         published_at = _to_utc_datetime(date.fromisoformat(filename_date_str))
 
-    html = render_markdown(body)
-    return ParsedPost(
+    return PostMeta(
         source_path=_relative_source(file_path, content_dir),
-        title=str(meta["title"]),
-        slug=slug,
-        excerpt=str(meta["excerpt"]) if "excerpt" in meta else None,
-        content_markdown=body,
-        content_html=html,
+        title=title,
+        slug=str(meta.get("slug", filename_slug)),
         published=bool(meta.get("published", False)),
         published_at=published_at,
         tags=_parse_tags(meta.get("tags")),
-        toc=extract_toc(html),
     )
 
 
-def load_project(file_path: Path, content_dir: Path) -> ParsedProject:
-    """Parse a single project Markdown file.
+def _project_meta(
+    meta: dict[str, Any], file_path: Path, content_dir: Path
+) -> ProjectMeta:
+    title = _require_title(meta, file_path)
+    return ProjectMeta(
+        source_path=_relative_source(file_path, content_dir),
+        title=title,
+        slug=str(meta.get("slug", slugify(file_path.stem))),
+        featured=bool(meta.get("featured", False)),
+        sort_order=int(meta.get("sort_order", 0)),
+    )
+
+
+def scan_post(file_path: Path, content_dir: Path) -> PostMeta:
+    """Read a post's metadata from its frontmatter without reading the body.
+
+    Slug, date and tags resolve exactly as in ``load_post``; nothing is
+    rendered or hashed.
+
+    Raises:
+        ValueError: If ``title`` is missing or the frontmatter is invalid.
+    """
+    return _post_meta(read_frontmatter(file_path), file_path, content_dir)
+
+
+def scan_project(file_path: Path, content_dir: Path) -> ProjectMeta:
+    """Read a project's metadata from its frontmatter without reading the body.
+
+    Raises:
+        ValueError: If ``title`` is missing or the frontmatter is invalid.
+    """
+    return _project_meta(read_frontmatter(file_path), file_path, content_dir)
+
+
+def load_post(
+    file_path: Path, content_dir: Path, source: SourceFile | None = None
+) -> ParsedPost:
+    """Parse a single post Markdown file.
+
+    Slug and date are derived from the ``YYYY-MM-DD-slug.md`` filename.
+    Frontmatter fields override filename-derived values when present.
 
     Args:
         file_path: Absolute path to the ``.md`` file.
         content_dir: Root content directory (used to compute ``source_path``).
+        source: The file's contents if already read (see ``read_source``);
+            ``source_hash`` is always the fingerprint of the bytes parsed.
 
     Raises:
         ValueError: If ``title`` is missing from frontmatter.
     """
-    text = file_path.read_text(encoding="utf-8")
-    meta, body = parse_frontmatter(text)
+    source = source or read_source(file_path)
+    meta, body = parse_frontmatter(_source_text(source))
+    post_meta = _post_meta(meta, file_path, content_dir)
 
-    if "title" not in meta:
-        raise ValueError(f"Missing required frontmatter field 'title' in {file_path}")
+    rendered = render_document(body)
+    return ParsedPost(
+        source_path=post_meta.source_path,
+        title=post_meta.title,
+        slug=post_meta.slug,
+        excerpt=str(meta["excerpt"]) if "excerpt" in meta else None,
+        content_markdown=body,
+        content_html=rendered.html,
+        published=post_meta.published,
+        published_at=post_meta.published_at,
+        tags=post_meta.tags,
+        toc=rendered.toc,
+        word_count=rendered.word_count,
+        images=rendered.images,
+        links=rendered.links,
+        source_hash=source.fingerprint,
+    )
 
-    slug = str(meta.get("slug", slugify(file_path.stem)))
+
+def load_project(
+    file_path: Path, content_dir: Path, source: SourceFile | None = None
+) -> ParsedProject:
+    """Parse a single project Markdown file.
+
+    Args:
+        file_path: Absolute path to the ``.md`` file.
+        content_dir: Root content directory (used to compute ``source_path``).
+        source: The file's contents if already read; see ``load_post``.
+
+    Raises:
+        ValueError: If ``title`` is missing from frontmatter.
+    """
+    source = source or read_source(file_path)
+    meta, body = parse_frontmatter(_source_text(source))
+    project_meta = _project_meta(meta, file_path, content_dir)
 
     return ParsedProject(
-        source_path=_relative_source(file_path, content_dir),
-        title=str(meta["title"]),
-        slug=slug,
+        source_path=project_meta.source_path,
+        title=project_meta.title,
+        slug=project_meta.slug,
         description=str(meta["description"]) if "description" in meta else None,
         content_markdown=body,
         content_html=render_markdown(body),
         url=str(meta["url"]) if "url" in meta else None,
         repo_url=str(meta["repo_url"]) if "repo_url" in meta else None,
-        featured=bool(meta.get("featured", False)),
-        sort_order=int(meta.get("sort_order", 0)),
+        featured=project_meta.featured,
+        sort_order=project_meta.sort_order,
+        source_hash=source.fingerprint,
     )
 
 
@@ -203,34 +330,182 @@ def load_page(file_path: Path, content_dir: Path) -> ParsedPage:
     )
 
 
+# ---------------------------------------------------------------------------
+# Batch loaders
+# ---------------------------------------------------------------------------
+
+
+def _load_or_error(
+    load_fn: Callable[..., Any],
+    file_path: Path,
+    content_dir: Path,
+    source: SourceFile | None = None,
+) -> Any:
+    """Run ``load_fn`` and return the exception instead of raising it.
+
+    Module-level so it can be pickled into worker processes.
+    """
+    try:
+        if source is None:
+            return load_fn(file_path, content_dir)
+        return load_fn(file_path, content_dir, source)
+    except Exception as exc:
+        return exc
+
+
+def _load_in_worker(
+    load_fn: Callable[..., Any],
+    file_path: Path,
+    content_dir: Path,
+    source: SourceFile | None,
+) -> tuple[Any, int, int]:
+    """Worker-side ``_load_or_error`` that also reports highlight cache hits/misses."""
+    cache = get_highlight_cache()
+    if cache is None:
+        return _load_or_error(load_fn, file_path, content_dir, source), 0, 0
+    hits, misses = cache.hits, cache.misses
+    result = _load_or_error(load_fn, file_path, content_dir, source)
+    return result, cache.hits - hits, cache.misses - misses
+
+
+def _load_all(
+    load_fn: Callable[..., Any],
+    file_paths: Sequence[Path],
+    content_dir: Path,
+    workers: int,
+    sources: Sequence[SourceFile | None] | None = None,
+) -> list[Any]:
+    if sources is None:
+        sources = [None] * len(file_paths)
+    if workers <= 1 or len(file_paths) < 2:
+        return [
+            _load_or_error(load_fn, f, content_dir, source)
+            for f, source in zip(file_paths, sources, strict=True)
+        ]
+    workers = min(workers, len(file_paths))
+    chunksize = max(1, len(file_paths) // (workers * 4))
+    cache = get_highlight_cache()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=configure_highlight_cache,
+        initargs=(cache,),
+    ) as pool:
+        outcomes = list(
+            pool.map(
+                _load_in_worker,
+                repeat(load_fn),
+                file_paths,
+                repeat(content_dir),
+                sources,
+                chunksize=chunksize,
+            )
+        )
+    if cache is not None:
+        cache.hits += sum(hits for _, hits, _ in outcomes)
+        cache.misses += sum(misses for _, _, misses in outcomes)
+    return [result for result, _, _ in outcomes]
+
+
+def load_post_files(
+    file_paths: Sequence[Path],
+    content_dir: Path,
+    *,
+    workers: int = 1,
+    sources: Sequence[SourceFile | None] | None = None,
+) -> list[ParsedPost | Exception]:
+    """Parse and render post files, optionally across a process pool.
+
+    Results are returned in the same order as ``file_paths``. A file that
+    fails to load yields its exception in place of a ``ParsedPost`` so the
+    caller can isolate failures per file.
+
+    Args:
+        file_paths: Post ``.md`` files to load.
+        content_dir: Root content directory (used to compute ``source_path``).
+        workers: Number of worker processes. ``1`` loads in-process.
+        sources: Contents already read for each file (see ``read_source``),
+            or None where the file should be read here.
+    """
+    return _load_all(load_post, file_paths, content_dir, workers, sources)
+
+
+def load_project_files(
+    file_paths: Sequence[Path],
+    content_dir: Path,
+    *,
+    workers: int = 1,
+    sources: Sequence[SourceFile | None] | None = None,
+) -> list[ParsedProject | Exception]:
+    """Parse and render project files, optionally across a process pool.
+
+    Same ordering, ``sources`` and per-file error semantics as
+    ``load_post_files``.
+    """
+    return _load_all(load_project, file_paths, content_dir, workers, sources)
+
+
+def scan_post_files(
+    file_paths: Sequence[Path], content_dir: Path
+) -> list[PostMeta | Exception]:
+    """Scan post frontmatter only, with ``load_post_files``' per-file error semantics.
+
+    Cheap enough to run in-process over the whole content directory — use it
+    for sync planning and validation, where rendering would be wasted work.
+    """
+    return [_load_or_error(scan_post, f, content_dir) for f in file_paths]
+
+
+def scan_project_files(
+    file_paths: Sequence[Path], content_dir: Path
+) -> list[ProjectMeta | Exception]:
+    """Scan project frontmatter only. See ``scan_post_files``."""
+    return [_load_or_error(scan_project, f, content_dir) for f in file_paths]
+
+
+def _raise_first_error(results: list[Any]) -> list[Any]:
+    """Re-raise the first per-file failure, preserving all-or-nothing scanners."""
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    return results
+
+
 # ---------------------------------------------------------------------------
 # Directory scanners
 # ---------------------------------------------------------------------------
 
 
-def load_posts(content_dir: Path) -> list[ParsedPost]:
+def load_posts(content_dir: Path, *, workers: int = 1) -> list[ParsedPost]:
     """Scan ``<content_dir>/posts/*.md`` and return posts sorted by ``published_at`` descending.
 
     Posts with ``published_at=None`` are sorted last. Returns an empty list if
-    the directory does not exist.
+    the directory does not exist. ``workers > 1`` parses files in a process
+    pool (see ``load_post_files``).
     """
     posts_dir = content_dir / "posts"
     if not posts_dir.is_dir():
         return []
-    posts = [load_post(f, content_dir) for f in sorted(posts_dir.glob("*.md"))]
+    posts = _raise_first_error(
+        load_post_files(sorted(posts_dir.glob("*.md")), content_dir, workers=workers)
+    )
     _min_dt = datetime.min.replace(tzinfo=UTC)
     return sorted(posts, key=lambda p: p.published_at or _min_dt, reverse=True)
 
 
-def load_projects(content_dir: Path) -> list[ParsedProject]:
+def load_projects(content_dir: Path, *, workers: int = 1) -> list[ParsedProject]:
     """Scan ``<content_dir>/projects/*.md`` and return all parsed projects.
 
-    Returns an empty list if the directory does not exist.
+    Returns an empty list if the directory does not exist. ``workers > 1``
+    parses files in a process pool (see ``load_project_files``).
     """
     projects_dir = content_dir / "projects"
     if not projects_dir.is_dir():
         return []
-    return [load_project(f, content_dir) for f in sorted(projects_dir.glob("*.md"))]
+    return _raise_first_error(
+        load_project_files(
+            sorted(projects_dir.glob("*.md")), content_dir, workers=workers
+        )
+    )
 
 
 def load_pages(content_dir: Path) -> list[ParsedPage]:
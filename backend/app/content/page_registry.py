@@ -0,0 +1,81 @@
+"""In-memory registry of rendered static pages (``<content_dir>/pages/*.md``).
+
+Pages are parsed and rendered once and then served from memory. Every lookup
+stats the directory (see ``watch.snapshot``) and re-renders only files whose
+mtime or size changed, so edits show up on the next request in every worker
+without a restart, and an unchanged page costs a directory scan and a dict
+lookup.
+"""
+
+import threading
+from pathlib import Path
+
+import structlog
+
+from app.content.loader import ParsedPage, load_page
+from app.content.watch import Snapshot, snapshot
+
+logger = structlog.stdlib.get_logger(__name__)
+
+
+class PageRegistry:
+    """Rendered pages under ``<content_dir>/pages``, keyed by slug.
+
+    ``loads`` counts files parsed and rendered by this instance. Safe to
+    share between threads.
+    """
+
+    def __init__(self, content_dir: Path) -> None:
+        self.content_dir = content_dir
+        self.pages_dir = content_dir / "pages"
+        self.loads = 0
+        self._signatures: Snapshot = {}
+        self._pages: dict[Path, ParsedPage | None] = {}
+        self._by_slug: dict[str, ParsedPage] = {}
+        self._lock = threading.Lock()
+
+    def get(self, slug: str) -> ParsedPage | None:
+        """Return the page with ``slug``, or None if there is no valid one."""
+        self._refresh()
+        return self._by_slug.get(slug)
+
+    def get_file(self, name: str) -> ParsedPage | None:
+        """Return the page loaded from ``pages/<name>``, whatever its slug."""
+        self._refresh()
+        return self._pages.get(self.pages_dir / name)
+
+    def pages(self) -> list[ParsedPage]:
+        """Return every valid page, ordered by source path."""
+        self._refresh()
+        return list(self._by_slug.values())
+
+    def _refresh(self) -> None:
+        current = snapshot([self.pages_dir])
+        if current == self._signatures:
+            return
+        with self._lock:
+            if current == self._signatures:
+                return
+            for path in self._signatures.keys() - current.keys():
+                del self._pages[path]
+            for path, signature in current.items():
+                if self._signatures.get(path) != signature:
+                    self._pages[path] = self._load(path)
+
+            by_slug: dict[str, ParsedPage] = {}
+            for path in sorted(self._pages):
+                page = self._pages[path]
+                if page is not None:
+                    by_slug.setdefault(page.slug, page)
+            self._by_slug = by_slug
+            self._signatures = current
+
+    def _load(self, path: Path) -> ParsedPage | None:
+        # A broken page is remembered as None until the file changes again,
+        # so it is reported once rather than re-parsed on every request.
+        self.loads += 1
+        try:
+            return load_page(path, self.content_dir)
+        except (OSError, ValueError) as exc:
+            logger.warning("page_load_failed", source_path=path.name, exc_info=exc)
+            return None
@@ -1,64 +1,88 @@
-"""Markdown renderer — mistune 3 with Pygments syntax highlighting and heading anchors."""
+"""Markdown renderer — mistune 3 with Pygments syntax highlighting and heading anchors.
 
-import re
-from dataclasses import dataclass
+A document is rendered in a single walk of the mistune AST that also collects
+the table of contents, word count and referenced images and links (see
+``render_document``), so no derived field costs another pass over the output.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
 
 import mistune
-from mistune import HTMLRenderer
+import pygments
+from mistune import BlockState, HTMLRenderer
+from mistune.util import escape as escape_text
 from pygments import highlight
 from pygments.formatters import HtmlFormatter  # type: ignore[attr-defined]
+from pygments.lexer import Lexer
 from pygments.lexers import TextLexer, get_lexer_by_name  # type: ignore[attr-defined]
 from pygments.util import ClassNotFound
 
 from app.content import slugify
+from app.content.highlight_cache import HighlightCache
 
+# Folded into each content file's source fingerprint. Bump the leading number
+# whenever rendered output changes so content sync re-renders unchanged files.
+RENDERER_VERSION = f"2:mistune-{mistune.__version__}:pygments-{pygments.__version__}"
 
-class _HighlightRenderer(HTMLRenderer):
-    """Custom HTML renderer with syntax highlighting and heading anchors."""
 
-    def block_code(self, code: str, info: str | None = None, **attrs: object) -> str:
-        """Render a fenced code block with Pygments syntax highlighting."""
-        lang = info.strip().split(None, 1)[0] if info else ""
-
-        try:
-            lexer = (
-                get_lexer_by_name(lang, stripall=True)
-                if lang
-                else TextLexer(stripall=True)
-            )
-        except ClassNotFound:
-            lexer = TextLexer(stripall=True)
-
-        formatter = HtmlFormatter(nowrap=False, cssclass="highlight")
-        return highlight(code, lexer, formatter)
-
-    def heading(self, text: str, level: int, **attrs: object) -> str:
-        """Render a heading with a slugified ``id`` attribute for anchor links."""
-        plain = re.sub(r"<[^>]+>", "", text)
-        anchor = slugify(plain)
-        return f'<h{level} id="{anchor}">{text}</h{level}>\n'
+# Formatters and lexers hold no per-call state, so one instance of each is
+# shared across every code block.
+_FORMATTER = HtmlFormatter(nowrap=False, cssclass="highlight")
 
 
-_md = mistune.create_markdown(renderer=_HighlightRenderer(), plugins=["table"])
+@lru_cache(maxsize=128)
+def _get_lexer(lang: str) -> Lexer:
+    """Return a lexer for a fence language alias, falling back to plain text.
 
+    Cached per lowercased alias, including unknown aliases, so Pygments'
+    registry scan runs at most once per language.
+    """
+    if not lang:
+        return TextLexer(stripall=True)
+    try:
+        return get_lexer_by_name(lang, stripall=True)
+    except ClassNotFound:
+        return TextLexer(stripall=True)
 
-def render_markdown(text: str) -> str:
-    """Convert Markdown text to an HTML string.
 
-    Uses mistune 3 with Pygments syntax highlighting on fenced code blocks
-    and slugified ``id`` anchors on all headings.
+def preload_lexers(languages: Iterable[str]) -> None:
+    """Warm the lexer cache so the first render doesn't pay for registry lookups."""
+    for lang in languages:
+        _get_lexer(lang.strip().lower())
 
-    Args:
-        text: Raw Markdown source.
 
-    Returns:
-        Rendered HTML string.
-    """
-    result = _md(text)
-    return str(result) if result is not None else ""
+# Everything besides (lang, code) that changes highlighted output.
+_HIGHLIGHT_SALT = (
+    f"pygments-{pygments.__version__}:{_FORMATTER.style.__name__}:{_FORMATTER.cssclass}"
+)
+
+_highlight_cache: HighlightCache | None = None
+
+
+def configure_highlight_cache(cache: HighlightCache | None) -> None:
+    """Attach (or with None, detach) the on-disk highlighted code cache."""
+    global _highlight_cache
+    _highlight_cache = cache
+
+
+def get_highlight_cache() -> HighlightCache | None:
+    return _highlight_cache
 
 
-_TOC_RE = re.compile(r'<h([2-6]) id="([^"]+)">(.*?)</h\1>')
+def _highlight(code: str, lang: str) -> str:
+    cache = _highlight_cache
+    if cache is None:
+        return highlight(code, _get_lexer(lang), _FORMATTER)
+    key = hashlib.sha256(f"{_HIGHLIGHT_SALT}\0{lang}\0{code}".encode()).hexdigest()
+    html = cache.get(key)
+    if html is None:
+        html = highlight(code, _get_lexer(lang), _FORMATTER)
+        cache.put(key, html)
+    return html
 
 
 @dataclass(slots=True)
@@ -68,23 +92,124 @@ class TocEntry:
     text: str
 
 
-def extract_toc(html: str) -> list[TocEntry]:
-    """Extract table of contents entries from rendered HTML.
+@dataclass(slots=True)
+class RenderedDocument:
+    """HTML plus the metadata derived from the same render pass."""
+
+    html: str
+    toc: list[TocEntry] = field(default_factory=list)
+    word_count: int = 0
+    images: list[str] = field(default_factory=list)
+    links: list[str] = field(default_factory=list)
+
 
-    Parses h2–h6 headings with id attributes from the rendered HTML.
-    h1 is excluded as it represents the post title, not a ToC entry.
-    Inline HTML tags (like ``<code>``, ``<em>``) are stripped from the text.
+# Leaf tokens whose raw text is readable prose (and heading text).
+_TEXT_TOKENS = frozenset({"text", "codespan", "inline_html"})
+# Blocks holding inline content directly; words never run across two of them.
+_PROSE_BLOCKS = frozenset({"paragraph", "block_text", "table_cell"})
+
+
+@dataclass(slots=True)
+class _Walk:
+    """Per-document state threaded through rendering on ``state.env``."""
+
+    doc: RenderedDocument
+    prose: list[str] = field(default_factory=list)
+    heading: list[str] | None = None
+    in_image: bool = False
+
+    def add_text(self, raw: str) -> None:
+        if self.in_image:  # alt text is neither prose nor heading text
+            return
+        self.prose.append(raw)
+        if self.heading is not None:
+            self.heading.append(raw)
+
+
+class _HighlightRenderer(HTMLRenderer):
+    """Custom HTML renderer with syntax highlighting and heading anchors.
+
+    ``render_token`` sees every AST node exactly once, so it also records
+    the derived metadata into the ``_Walk`` stored on the block state. The
+    renderer itself holds no per-document state and is safe to share.
+    """
+
+    def render_token(self, token: dict[str, Any], state: BlockState) -> str:
+        walk: _Walk = state.env["walk"]
+        kind = token["type"]
+        if kind in _TEXT_TOKENS:
+            walk.add_text(token["raw"])
+        elif kind in ("softbreak", "linebreak"):
+            walk.add_text(" ")
+        elif kind == "heading":
+            return self._heading(token, state, walk)
+        elif kind == "link":
+            walk.doc.links.append(token["attrs"]["url"])
+        elif kind == "image":
+            walk.doc.images.append(token["attrs"]["url"])
+            walk.in_image = True
+            try:
+                return super().render_token(token, state)
+            finally:
+                walk.in_image = False
+
+        html = super().render_token(token, state)
+        if kind in _PROSE_BLOCKS:
+            walk.prose.append("\n")
+        return html
+
+    def _heading(self, token: dict[str, Any], state: BlockState, walk: _Walk) -> str:
+        """Render a heading with a slugified ``id`` and record its TOC entry.
+
+        h1 is left out of the TOC as it represents the post title. The anchor
+        is slugified from the escaped text, as it appears in the HTML.
+        """
+        walk.heading = []
+        text = self.render_tokens(token["children"], state)
+        plain = "".join(walk.heading).strip()
+        walk.heading = None
+        walk.prose.append("\n")
+
+        level = token["attrs"]["level"]
+        anchor = slugify(escape_text(plain))
+        if level >= 2 and anchor:
+            walk.doc.toc.append(TocEntry(level=level, id=anchor, text=plain))
+        return f'<h{level} id="{anchor}">{text}</h{level}>\n'
+
+    def block_code(self, code: str, info: str | None = None, **attrs: object) -> str:
+        """Render a fenced code block with Pygments syntax highlighting."""
+        lang = info.strip().split(None, 1)[0].lower() if info else ""
+        return _highlight(code, lang)
+
+
+_md = mistune.create_markdown(renderer=_HighlightRenderer(), plugins=["table"])
+
+
+def render_document(text: str) -> RenderedDocument:
+    """Render Markdown to HTML and derive its metadata in one AST walk.
+
+    Uses mistune 3 with Pygments syntax highlighting on fenced code blocks
+    and slugified ``id`` anchors on all headings.
 
     Args:
-        html: Rendered HTML string produced by ``render_markdown``.
+        text: Raw Markdown source.
 
     Returns:
-        Ordered list of ``TocEntry`` objects, one per matched heading.
+        The HTML with its h2–h6 table of contents, prose word count (code
+        blocks excluded), and the image and link URLs in first-seen order.
     """
-    entries = []
-    for match in _TOC_RE.finditer(html):
-        level = int(match.group(1))
-        anchor = match.group(2)
-        text = re.sub(r"<[^>]+>", "", match.group(3))
-        entries.append(TocEntry(level=level, id=anchor, text=text))
-    return entries
+    doc = RenderedDocument(html="")
+    walk = _Walk(doc)
+    state = _md.block.state_cls()
+    state.env["walk"] = walk
+    result, _ = _md.parse(text, state=state)
+    doc.html = str(result) if result is not None else ""
+    doc.word_count = len("".join(walk.prose).split())
+    doc.images = list(dict.fromkeys(doc.images))
+    doc.links = list(dict.fromkeys(doc.links))
+    return doc
+
+
+def render_markdown(text: str) -> str:
+    """Convert Markdown text to an HTML string. See ``render_document``."""
+    return render_document(text).html
@@ -0,0 +1,608 @@
+"""In-memory BM25 index over published posts, for search without the DB.
+
+Content sync builds the index from the database and publishes it as one
+gzip-compressed JSON file, written to a temporary file and atomically renamed
+into place. Every web worker loads that file at startup; each lookup stats it
+(like ``PageRegistry``) and reloads it only after a sync replaced it, so a
+search costs a stat and a few dict lookups and never checks out a database
+connection.
+
+Posts are scored with BM25 over one weighted bag of words (title, tags,
+excerpt and body, see ``FIELD_WEIGHTS``). Every query term must match, like
+the Postgres search it stands in for; the last term also matches as a prefix
+while it is still being typed. Prefixes are matched against the words as
+written rather than their stems (a typed "runn" is not a prefix of the stem
+"run"), so the index keeps its vocabulary of surface words with their stems.
+
+Result snippets are cut from each post's excerpt and body, which the index
+stores as plain whitespace-collapsed text (the file grows by roughly the
+compressed size of the posts' Markdown), like the ``ts_headline`` snippets
+of the Postgres search.
+"""
+
+import gzip
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import uuid
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+import structlog
+
+logger = structlog.stdlib.get_logger(__name__)
+
+FORMAT_VERSION = 3
+# Term frequency multipliers per field. A title word counts as three body words.
+FIELD_WEIGHTS = {"title": 3.0, "tags": 2.0, "excerpt": 1.5, "body": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Cap on vocabulary words a trailing prefix expands to, so a one-letter
+# prefix costs no more than a few ordinary terms.
+MAX_PREFIX_EXPANSIONS = 50
+# Snippet length in words, and how many of them come before the first match.
+SNIPPET_WORDS = 30
+SNIPPET_LEAD = 6
+
+_WORD_RE = re.compile(r"[^\W_]+")
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have he her his i if in into is"
+    " it its me my no not of on or our she so that the their them then there"
+    " these they this to was we were what when which who will with you your".split()
+)
+
+
+# ---------------------------------------------------------------------------
+# Tokenization (Porter stemmer)
+# ---------------------------------------------------------------------------
+
+
+def _is_consonant(word: str, i: int) -> bool:
+    ch = word[i]
+    if ch in "aeiou":
+        return False
+    if ch == "y":
+        return i == 0 or not _is_consonant(word, i - 1)
+    return True
+
+
+def _measure(stem: str) -> int:
+    """Number of vowel-consonant sequences in ``stem`` (Porter's *m*)."""
+    forms = "".join("c" if _is_consonant(stem, i) else "v" for i in range(len(stem)))
+    return re.sub(r"(.)\1+", r"\1", forms).count("vc")
+
+
+def _has_vowel(stem: str) -> bool:
+    return any(not _is_consonant(stem, i) for i in range(len(stem)))
+
+
+def _ends_double_consonant(word: str) -> bool:
+    return (
+        len(word) >= 2 and word[-1] == word[-2] and _is_consonant(word, len(word) - 1)
+    )
+
+
+def _ends_cvc(word: str) -> bool:
+    return (
+        len(word) >= 3
+        and _is_consonant(word, len(word) - 3)
+        and not _is_consonant(word, len(word) - 2)
+        and _is_consonant(word, len(word) - 1)
+        and word[-1] not in "wxy"
+    )
+
+
+_STEP2 = sorted(
+    {
+        "ational": "ate",
+        "tional": "tion",
+        "enci": "ence",
+        "anci": "ance",
+        "izer": "ize",
+        "bli": "ble",
+        "alli": "al",
+        "entli": "ent",
+        "eli": "e",
+        "ousli": "ous",
+        "ization": "ize",
+        "ation": "ate",
+        "ator": "ate",
+        "alism": "al",
+        "iveness": "ive",
+        "fulness": "ful",
+        "ousness": "ous",
+        "aliti": "al",
+        "iviti": "ive",
+        "biliti": "ble",
+    }.items(),
+    key=lambda item: -len(item[0]),
+)
+_STEP3 = sorted(
+    {
+        "icate": "ic",
+        "ative": "",
+        "alize": "al",
+        "iciti": "ic",
+        "ical": "ic",
+        "ful": "",
+        "ness": "",
+    }.items(),
+    key=lambda item: -len(item[0]),
+)
+_STEP4 = sorted(
+    "al ance ence er ic able ible ant ement ment ent ion ou ism ate iti ous ive ize".split(),
+    key=len,
+    reverse=True,
+)
+
+
+def _replace_suffix(word: str, rules: list[tuple[str, str]], min_measure: int) -> str:
+    for suffix, replacement in rules:
+        if word.endswith(suffix):
+            stem = word[: -len(suffix)]
+            return stem + replacement if _measure(stem) > min_measure else word
+    return word
+
+
+@lru_cache(maxsize=1 << 16)
+def stem(word: str) -> str:
+    """Reduce a lowercase English word to its Porter stem.
+
+    Memoized: rebuilding the index in a long-lived watch process stems the
+    same vocabulary again and again.
+    """
+    if len(word) <= 2:
+        return word
+
+    # Step 1a: plurals.
+    if word.endswith("sses") or word.endswith("ies"):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+
+    # Step 1b: -ed and -ing.
+    if word.endswith("eed"):
+        if _measure(word[:-3]) > 0:
+            word = word[:-1]
+    else:
+        for suffix in ("ed", "ing"):
+            stem_ = word[: -len(suffix)]
+            if word.endswith(suffix) and _has_vowel(stem_):
+                word = stem_
+                if word.endswith(("at", "bl", "iz")):
+                    word += "e"
+                elif _ends_double_consonant(word) and word[-1] not in "lsz":
+                    word = word[:-1]
+                elif _measure(word) == 1 and _ends_cvc(word):
+                    word += "e"
+                break
+
+    # Step 1c: terminal y.
+    if word.endswith("y") and _has_vowel(word[:-1]):
+        word = word[:-1] + "i"
+
+    # Steps 2-3: double and derivational suffixes.
+    word = _replace_suffix(word, _STEP2, 0)
+    word = _replace_suffix(word, _STEP3, 0)
+
+    # Step 4: strip remaining suffixes from long stems.
+    for suffix in _STEP4:
+        if word.endswith(suffix):
+            stem_ = word[: -len(suffix)]
+            if _measure(stem_) > 1 and (suffix != "ion" or stem_.endswith(("s", "t"))):
+                word = stem_
+            break
+
+    # Step 5: final e and double l.
+    if word.endswith("e"):
+        stem_ = word[:-1]
+        measure = _measure(stem_)
+        if measure > 1 or (measure == 1 and not _ends_cvc(stem_)):
+            word = stem_
+    if word.endswith("ll") and _measure(word) > 1:
+        word = word[:-1]
+    return word
+
+
+def words(text: str) -> list[str]:
+    """Lowercase and split into words, dropping stop words."""
+    return [word for word in _WORD_RE.findall(text.lower()) if word not in STOP_WORDS]
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase, split into words, drop stop words and stem the rest."""
+    return [stem(word) for word in words(text)]
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedTag:
+    slug: str
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedPost:
+    """The fields a search result card shows, so results need no DB read."""
+
+    id: uuid.UUID
+    slug: str
+    title: str
+    excerpt: str | None
+    published_at: datetime | None
+    tags: tuple[IndexedTag, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class SearchHit:
+    post: IndexedPost
+    score: float
+    # Index terms the query matched, for highlighting (see ``mark_terms``)
+    terms: frozenset[str]
+    # Excerpt and body the snippet is cut from (see ``SearchIndex.snippet``)
+    text: str
+
+
+def weighted_terms(
+    post: IndexedPost, body: str, *, stemmed: bool = True
+) -> dict[str, float]:
+    """Terms of a post with their ``FIELD_WEIGHTS``-weighted frequencies."""
+    split = tokenize if stemmed else words
+    fields = {
+        "title": post.title,
+        "tags": " ".join(tag.name for tag in post.tags),
+        "excerpt": post.excerpt or "",
+        "body": body,
+    }
+    frequencies: defaultdict[str, float] = defaultdict(float)
+    for field, text in fields.items():
+        for term in split(text):
+            frequencies[term] += FIELD_WEIGHTS[field]
+    return frequencies
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedDocument:
+    """A post analysed for indexing, reusable across rebuilds (see ``analyse``)."""
+
+    post: IndexedPost
+    # Unstemmed words with their weighted frequencies (``weighted_terms``)
+    words: dict[str, float]
+    # Excerpt and body, whitespace-collapsed, that snippets are cut from
+    text: str
+
+
+def analyse(post: IndexedPost, body: str) -> IndexedDocument:
+    return IndexedDocument(
+        post=post,
+        words=dict(weighted_terms(post, body, stemmed=False)),
+        text=" ".join(f"{post.excerpt or ''} {body}".split()),
+    )
+
+
+# term -> [(document number, weighted term frequency), ...]
+Postings = dict[str, list[tuple[int, float]]]
+# surface word -> its stem (the postings term)
+Vocabulary = dict[str, str]
+
+
+class SearchIndex:
+    """BM25 inverted index over a fixed list of posts."""
+
+    def __init__(
+        self,
+        posts: list[IndexedPost],
+        lengths: list[float],
+        postings: Postings,
+        vocabulary: Vocabulary,
+        texts: list[str],
+    ) -> None:
+        self.posts = posts
+        self.texts = texts
+        self.lengths = lengths
+        self.postings = postings
+        self.vocabulary = vocabulary
+        self._words = sorted(vocabulary)
+        self._average_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+    def __len__(self) -> int:
+        return len(self.posts)
+
+    @classmethod
+    def build(cls, documents: Iterable[tuple[IndexedPost, str]]) -> SearchIndex:
+        """Index ``(post, body text)`` pairs."""
+        return cls.from_documents(analyse(post, body) for post, body in documents)
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[IndexedDocument]) -> SearchIndex:
+        """Index already analysed posts."""
+        posts: list[IndexedPost] = []
+        lengths: list[float] = []
+        postings: Postings = {}
+        vocabulary: Vocabulary = {}
+        texts: list[str] = []
+        for number, document in enumerate(documents):
+            frequencies: defaultdict[str, float] = defaultdict(float)
+            for word, frequency in document.words.items():
+                if word not in vocabulary:
+                    vocabulary[word] = stem(word)
+                frequencies[vocabulary[word]] += frequency
+            for term, frequency in frequencies.items():
+                postings.setdefault(term, []).append((number, frequency))
+            posts.append(document.post)
+            lengths.append(sum(frequencies.values()))
+            texts.append(document.text)
+        return cls(posts, lengths, postings, vocabulary, texts)
+
+    def _expand_prefix(self, prefix: str) -> set[str]:
+        """Stems of the vocabulary words that start with ``prefix``."""
+        start = bisect_left(self._words, prefix)
+        expansions: set[str] = set()
+        for word in self._words[start : start + MAX_PREFIX_EXPANSIONS]:
+            if not word.startswith(prefix):
+                break
+            expansions.add(self.vocabulary[word])
+        return expansions
+
+    def _term_scores(self, term: str) -> dict[int, float]:
+        postings = self.postings.get(term, [])
+        if not postings:
+            return {}
+        count = len(self.posts)
+        idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+        scores: dict[int, float] = {}
+        for number, frequency in postings:
+            norm = 1 - BM25_B + BM25_B * self.lengths[number] / self._average_length
+            scores[number] = (
+                idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm)
+            )
+        return scores
+
+    def search(self, query: str, *, limit: int = 20) -> list[SearchHit]:
+        """Return the best ``limit`` posts matching every term of ``query``.
+
+        Unless ``query`` ends in whitespace its last word also matches any
+        indexed word it is a prefix of. Ties go to the newer post.
+        """
+        query_words = words(query)
+        if not query_words or not self.posts:
+            return []
+        prefix = query_words[-1] if not query[-1:].isspace() else None
+
+        totals: dict[int, float] | None = None
+        matched: dict[int, set[str]] = {}
+        for word in query_words:
+            # Each query word may match several index terms (its stem, or a
+            # typed prefix); a post scores its best one.
+            terms = {stem(word)}
+            if word == prefix:
+                terms.update(self._expand_prefix(word))
+            word_scores: dict[int, float] = {}
+            for term in terms:
+                for number, score in self._term_scores(term).items():
+                    if score > word_scores.get(number, 0.0):
+                        word_scores[number] = score
+                    matched.setdefault(number, set()).add(term)
+            if totals is None:
+                totals = word_scores
+            else:
+                totals = {
+                    number: total + word_scores[number]
+                    for number, total in totals.items()
+                    if number in word_scores
+                }
+            if not totals:
+                return []
+        if totals is None:
+            return []
+
+        def _rank(number: int) -> tuple[float, float]:
+            published_at = self.posts[number].published_at
+            return totals[number], published_at.timestamp() if published_at else 0.0
+
+        best = sorted(totals, key=_rank, reverse=True)[:limit]
+        return [
+            SearchHit(self.posts[n], totals[n], frozenset(matched[n]), self.texts[n])
+            for n in best
+        ]
+
+    def snippet(self, hit: SearchHit, start: str, end: str) -> str:
+        """Up to ``SNIPPET_WORDS`` words of the hit's text around its first match.
+
+        Matches are wrapped in ``start``/``end`` and elided text is marked
+        with "…". Returns "" when the text contains no match (the post
+        matched on its title or tags only).
+        """
+        window: list[re.Match[str]] = []
+        first: int | None = None
+        for match in _WORD_RE.finditer(hit.text):
+            window.append(match)
+            if first is None:
+                if self.vocabulary.get(match.group().lower()) in hit.terms:
+                    first = len(window) - 1
+                elif len(window) > SNIPPET_LEAD:
+                    window.pop(0)
+            elif len(window) - first >= SNIPPET_WORDS - SNIPPET_LEAD:
+                break
+        if first is None:
+            return ""
+        head, tail = window[0].start(), window[-1].end()
+        text = mark_terms(hit.text[head:tail], hit.terms, start, end)
+        prefix = "… " if head > 0 else ""
+        suffix = " …" if tail < len(hit.text) else ""
+        return f"{prefix}{text}{suffix}"
+
+    # -- Serialization -----------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        payload = {
+            "version": FORMAT_VERSION,
+            "posts": [
+                [
+                    post.id.hex,
+                    post.slug,
+                    post.title,
+                    post.excerpt,
+                    post.published_at.isoformat() if post.published_at else None,
+                    [[tag.slug, tag.name] for tag in post.tags],
+                ]
+                for post in self.posts
+            ],
+            "lengths": self.lengths,
+            # Postings flattened to [doc, tf, doc, tf, ...] to keep the file small.
+            "postings": {
+                term: [value for posting in postings for value in posting]
+                for term, postings in self.postings.items()
+            },
+            # Only the words that differ from their stem; the rest are terms.
+            "words": {
+                word: term for word, term in self.vocabulary.items() if word != term
+            },
+            "texts": self.texts,
+        }
+        data = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+        return gzip.compress(data.encode(), mtime=0)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> SearchIndex:
+        """Load an index written by ``to_bytes``.
+
+        Raises:
+            ValueError: If ``data`` is not a search index of this format.
+        """
+        try:
+            payload = json.loads(gzip.decompress(data))
+        except (OSError, EOFError, json.JSONDecodeError) as exc:
+            raise ValueError(f"Unreadable search index: {exc}") from exc
+        if payload.get("version") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported search index version: {payload.get('version')!r}"
+            )
+        posts = [
+            IndexedPost(
+                id=uuid.UUID(hex=post_id),
+                slug=slug,
+                title=title,
+                excerpt=excerpt,
+                published_at=datetime.fromisoformat(published) if published else None,
+                tags=tuple(IndexedTag(slug=s, name=n) for s, n in tags),
+            )
+            for post_id, slug, title, excerpt, published, tags in payload["posts"]
+        ]
+        postings: Postings = {
+            term: list(zip(flat[::2], flat[1::2], strict=True))
+            for term, flat in payload["postings"].items()
+        }
+        vocabulary: Vocabulary = {term: term for term in postings}
+        vocabulary.update(payload["words"])
+        return cls(posts, payload["lengths"], postings, vocabulary, payload["texts"])
+
+    def write(self, path: Path) -> None:
+        """Atomically replace ``path`` with this index."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(self.to_bytes())
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+
+def mark_terms(text: str, terms: Iterable[str], start: str, end: str) -> str:
+    """Wrap the words of ``text`` that stem to one of ``terms`` in ``start``/``end``.
+
+    Returns "" when no word matches.
+    """
+    wanted = set(terms)
+    marked = False
+
+    def _mark(match: re.Match[str]) -> str:
+        nonlocal marked
+        word = match.group()
+        if stem(word.lower()) not in wanted:
+            return word
+        marked = True
+        return f"{start}{word}{end}"
+
+    result = _WORD_RE.sub(_mark, text)
+    return result if marked else ""
+
+
+# ---------------------------------------------------------------------------
+# Published index file
+# ---------------------------------------------------------------------------
+
+
+class SearchIndexFile:
+    """The index published at ``path``, reloaded whenever the file changes.
+
+    ``loads`` counts successful loads by this instance. Safe to share between
+    threads.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.loads = 0
+        self._signature: tuple[int, int, int] | None = None
+        self._index: SearchIndex | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> SearchIndex | None:
+        """Return the current index, or None if none has been published."""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if signature == self._signature:
+            return self._index
+        with self._lock:
+            if signature != self._signature:
+                # A broken file is remembered as None until it is replaced,
+                # so it is reported once rather than re-read on every search.
+                try:
+                    self._index = SearchIndex.from_bytes(self.path.read_bytes())
+                    self.loads += 1
+                except (OSError, ValueError) as exc:
+                    logger.warning(
+                        "search_index_load_failed", path=str(self.path), exc_info=exc
+                    )
+                    self._index = None
+                self._signature = signature
+            return self._index
+
+    def publish(self, index: SearchIndex) -> None:
+        index.write(self.path)
+
+
+_search_index_file: SearchIndexFile | None = None
+
+
+def configure_search_index(path: Path | None) -> None:
+    """Set (or with None, clear) the file the search index is published to."""
+    global _search_index_file
+    _search_index_file = SearchIndexFile(path) if path is not None else None
+
+
+def get_search_index_file() -> SearchIndexFile | None:
+    return _search_index_file
+
+
+def get_search_index() -> SearchIndex | None:
+    """The published index, if one is configured and has been written."""
+    index_file = _search_index_file
+    return index_file.get() if index_file is not None else None
@@ -0,0 +1,155 @@
+"""Prebuilt JSON search index served from ``/static`` for in-browser search.
+
+Content sync writes ``index.<fingerprint>.json`` into a directory under the
+static root. The fingerprint hashes the contents, so the file never changes
+under its URL and is served with an immutable ``Cache-Control``; the next
+sync that changes anything produces a new URL. The SearchDialog island
+fetches it once and searches locally (``islands/src/lib/search-index.js``),
+falling back to ``/search``, which stays the no-JS path.
+
+The index holds each published post's card fields and postings of unstemmed
+words, weighted like ``search_index`` but without stemming: the client
+matches every query word as a prefix, which covers most inflections. To keep
+the download small, only a post's title, tag and excerpt words and its
+``MAX_BODY_TERMS`` most frequent body words are indexed; when the island
+finds nothing locally it asks ``/search``, which searches whole bodies.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+from app.content.search_index import STOP_WORDS, IndexedDocument, weighted_terms
+
+FORMAT_VERSION = 1
+STATIC_INDEX_DIR = Path(__file__).resolve().parents[1] / "static" / "search"
+STATIC_INDEX_URL = "/static/search"
+# Superseded index files kept after a publish, so pages rendered just before
+# a sync can still load the index they link to.
+KEEP_PREVIOUS = 1
+_INDEX_GLOB = "index.*.json"
+# Body words indexed per post, most frequent first.
+MAX_BODY_TERMS = 32
+
+
+def build_static_index(documents: Iterable[IndexedDocument]) -> bytes:
+    """Serialize analysed posts (``search_index.analyse``) as the client's index."""
+    posts: list[list[object]] = []
+    lengths: list[float] = []
+    postings: dict[str, list[float]] = {}
+    for number, document in enumerate(documents):
+        post, frequencies = document.post, document.words
+        summary = weighted_terms(post, "", stemmed=False)
+        body_terms = sorted(
+            (term for term in frequencies if term not in summary),
+            key=lambda term: (-frequencies[term], term),
+        )
+        for term in [*summary, *body_terms[:MAX_BODY_TERMS]]:
+            postings.setdefault(term, []).extend((number, frequencies[term]))
+        posts.append(
+            [
+                post.slug,
+                post.title,
+                post.excerpt,
+                post.published_at.isoformat() if post.published_at else None,
+                [[tag.slug, tag.name] for tag in post.tags],
+            ]
+        )
+        lengths.append(sum(frequencies.values()))
+    payload = {
+        "version": FORMAT_VERSION,
+        "stopWords": sorted(STOP_WORDS),
+        "posts": posts,
+        "lengths": lengths,
+        # term -> [doc, tf, doc, tf, ...]
+        "terms": dict(sorted(postings.items())),
+    }
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class StaticSearchIndexDir:
+    """Fingerprinted index files in ``directory``, published at ``url_prefix``.
+
+    ``url()`` re-lists the directory only when its mtime changes, so every
+    worker picks up a new file after a sync at the cost of one stat.
+    """
+
+    def __init__(self, directory: Path, url_prefix: str) -> None:
+        self.directory = directory
+        self.url_prefix = url_prefix.rstrip("/")
+        self._signature: int | None = None
+        self._current: str | None = None
+        self._lock = threading.Lock()
+
+    def _files(self) -> list[Path]:
+        """Index files, newest first."""
+        entries: list[tuple[int, Path]] = []
+        for path in self.directory.glob(_INDEX_GLOB):
+            try:
+                entries.append((path.stat().st_mtime_ns, path))
+            except OSError:
+                continue
+        return [path for _mtime, path in sorted(entries, reverse=True)]
+
+    def publish(self, data: bytes) -> str:
+        """Write ``data`` as the current index; return its URL.
+
+        Files older than the ``KEEP_PREVIOUS`` before it are removed.
+        """
+        name = f"index.{hashlib.sha256(data).hexdigest()[:16]}.json"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Rewritten even when the file exists, so it becomes the newest again.
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_name, self.directory / name)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        superseded = [path for path in self._files() if path.name != name]
+        for path in superseded[KEEP_PREVIOUS:]:
+            path.unlink(missing_ok=True)
+        return f"{self.url_prefix}/{name}"
+
+    def url(self) -> str | None:
+        """URL of the newest index file, or None if none has been published."""
+        try:
+            signature = self.directory.stat().st_mtime_ns
+        except OSError:
+            return None
+        if signature == self._signature:
+            return self._current
+        with self._lock:
+            if signature != self._signature:
+                files = self._files()
+                self._current = f"{self.url_prefix}/{files[0].name}" if files else None
+                self._signature = signature
+            return self._current
+
+
+_static_index_dir: StaticSearchIndexDir | None = None
+
+
+def configure_static_search_index(directory: Path | None) -> None:
+    """Set (or with None, clear) the directory static indexes are published to."""
+    global _static_index_dir
+    _static_index_dir = (
+        StaticSearchIndexDir(directory, STATIC_INDEX_URL)
+        if directory is not None
+        else None
+    )
+
+
+def get_static_search_index_dir() -> StaticSearchIndexDir | None:
+    return _static_index_dir
+
+
+def static_search_index_url() -> str | None:
+    """URL of the current static index, for templates."""
+    index_dir = _static_index_dir
+    return index_dir.url() if index_dir is not None else None
@@ -1,38 +1,128 @@
 """CLI entrypoint for content sync.
 
-Run as:  python -m app.content.sync
+Run as:  python -m app.content.sync [--watch | --check]
 
 All orchestration logic lives in ``services.content_sync``. This module
-exists solely to provide the ``python -m`` entrypoint for ``prestart.sh``.
+exists solely to provide the ``python -m`` entrypoint for ``prestart.sh``
+and, with ``--watch``, a local authoring loop that re-syncs only the files
+that change. ``--check`` validates frontmatter without touching the DB.
 """
 
+import argparse
+import os
+import sys
+import time
 from pathlib import Path
 
 import structlog
 from sqlmodel import Session
 
+from app.content.watch import watch_changes
 from app.core.config import settings
 from app.core.db import engine
 from app.core.logging import setup_logging
-from app.services.content_sync import sync_content
+from app.core.page_cache import configure_content_version
+from app.services.content_sync import (
+    check_content,
+    configure_renderer,
+    configure_search,
+    sync_changed_files,
+    sync_content,
+)
 
 logger = structlog.stdlib.get_logger(__name__)
 
 
+def watch(content_path: Path) -> None:
+    directories = [content_path / name for name in ("posts", "projects", "pages")]
+    logger.info("content_watch_started", content_dir=str(content_path))
+    try:
+        for changes in watch_changes(
+            directories, poll_interval=settings.CONTENT_WATCH_POLL_INTERVAL
+        ):
+            started = time.perf_counter()
+            with Session(engine) as session:
+                try:
+                    sync_changed_files(
+                        session=session,
+                        content_dir=content_path,
+                        changed=changes.changed,
+                        deleted=changes.deleted,
+                    )
+                except Exception:
+                    # One bad batch (a DB error, a slug conflict) must not
+                    # end the authoring loop; the next edit retries it.
+                    session.rollback()
+                    logger.exception(
+                        "content_watch_batch_failed",
+                        changed=len(changes.changed),
+                        deleted=len(changes.deleted),
+                    )
+                    continue
+            logger.info(
+                "content_watch_batch_done",
+                changed=len(changes.changed),
+                deleted=len(changes.deleted),
+                elapsed_ms=round((time.perf_counter() - started) * 1000),
+            )
+    except KeyboardInterrupt:
+        logger.info("content_watch_stopped")
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Sync Markdown content into the DB.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--watch",
+        action="store_true",
+        help="after the initial sync, keep re-syncing files as they change",
+    )
+    mode.add_argument(
+        "--check",
+        action="store_true",
+        help="validate frontmatter and slugs without syncing; exit 1 on problems",
+    )
+    args = parser.parse_args()
+
     setup_logging(log_level="INFO", json_output=False)
 
     content_path = Path(settings.CONTENT_DIR)
     if not content_path.is_absolute():
         content_path = Path(__file__).resolve().parents[3] / content_path
 
-    logger.info("content_sync_starting", content_dir=str(content_path))
+    if args.check:
+        problems = check_content(content_dir=content_path)
+        for problem in problems:
+            logger.error("content_check_problem", problem=problem)
+        logger.info("content_check_finished", problems=len(problems))
+        sys.exit(1 if problems else 0)
+
+    configure_renderer()
+    configure_search()
+    configure_content_version(
+        Path(settings.CONTENT_VERSION_PATH) if settings.CONTENT_VERSION_PATH else None
+    )
+    workers = settings.CONTENT_SYNC_WORKERS or os.cpu_count() or 1
+    logger.info(
+        "content_sync_starting",
+        content_dir=str(content_path),
+        workers=workers,
+        bulk=settings.CONTENT_SYNC_BULK,
+    )
 
     with Session(engine) as session:
-        sync_content(session=session, content_dir=content_path)
+        sync_content(
+            session=session,
+            content_dir=content_path,
+            workers=workers,
+            bulk=settings.CONTENT_SYNC_BULK,
+        )
 
     logger.info("content_sync_finished")
 
+    if args.watch:
+        watch(content_path)
+
 
 if __name__ == "__main__":
     main()
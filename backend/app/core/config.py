@@ -53,6 +53,10 @@ class Settings(BaseSettings):
 
     # Security
     CSP_REPORT_ONLY: bool = False
+    # How inline scripts are allowed: "hash" lists the SHA-256 of each inline
+    # script in the templates, so the policy and pages are identical across
+    # requests (and cacheable); "nonce" adds a fresh nonce per request.
+    CSP_MODE: Literal["hash", "nonce"] = "hash"
 
     # Site
     SITE_TITLE: str = "jmpd.sh blog"
@@ -60,7 +64,44 @@ class Settings(BaseSettings):
     SITE_DESCRIPTION: str = ""
     GITHUB_USERNAME: str = ""
     GITHUB_TOKEN: SecretStr = SecretStr("")
+    GITHUB_API_URL: str = "https://api.github.com"
+    # Concurrent GitHub requests (and pooled connections) during enrichment
+    GITHUB_MAX_CONCURRENCY: int = 8
+    # Repo metadata older than this is re-fetched (conditionally) by the
+    # background refresh, which runs every GITHUB_REFRESH_INTERVAL_SECONDS
+    # (0 disables it)
+    GITHUB_METADATA_TTL_SECONDS: int = 6 * 60 * 60
+    GITHUB_REFRESH_INTERVAL_SECONDS: int = 15 * 60
     CONTENT_DIR: str = "content"
+    # Processes used to parse/render Markdown during content sync (0 = one per CPU)
+    CONTENT_SYNC_WORKERS: int = 0
+    # Write changed posts/projects with batched upserts instead of per file
+    CONTENT_SYNC_BULK: bool = True
+    # Seconds between directory polls in ``python -m app.content.sync --watch``
+    CONTENT_WATCH_POLL_INTERVAL: float = 0.2
+    # Pygments lexers to load at startup, e.g. "python,bash,yaml"
+    CONTENT_PRELOAD_LEXERS: Annotated[list[str] | str, BeforeValidator(parse_cors)] = []
+    # On-disk cache of highlighted code blocks, shared by sync runs and
+    # worker processes ("" disables it)
+    HIGHLIGHT_CACHE_DIR: str = "/tmp/blog-highlight-cache"
+    HIGHLIGHT_CACHE_MAX_MB: int = 64
+    # Search index file written by content sync and loaded by every worker,
+    # so /search needs no DB connection ("" disables it; Postgres answers).
+    # compose.yml keeps it on the content-state volume, which prestart (where
+    # sync runs) shares with the backend.
+    SEARCH_INDEX_PATH: str = "/tmp/blog-search-index.json.gz"
+    # Also emit a fingerprinted JSON index under /static/search that the
+    # SearchDialog island searches in the browser
+    SEARCH_STATIC_INDEX: bool = True
+    # Directory the static index is written to and served from ("" keeps it
+    # in app/static/search); on the content-state volume in compose.yml
+    SEARCH_STATIC_INDEX_DIR: str = ""
+    # Rendered public pages kept in memory per worker (0 disables the cache),
+    # dropped whenever content sync rewrites CONTENT_VERSION_PATH — which
+    # must be visible to the workers, hence the content-state volume in
+    # compose.yml
+    PAGE_CACHE_MAX_MB: int = 32
+    CONTENT_VERSION_PATH: str = "/tmp/blog-content-version"
     SITE_URL: str = "http://localhost:8000"
     SITE_AUTHOR_URL: str = ""
     SITE_AUTHOR_TITLE: str = ""
@@ -0,0 +1,60 @@
+"""Content-Security-Policy hashes of the inline scripts in the templates.
+
+With ``CSP_MODE=hash`` the policy allows inline scripts by the SHA-256 of
+their text instead of a per-request nonce, so the policy and the rendered
+pages are the same for every request and can be cached whole. The hashes
+are computed once from the template sources; an inline script must
+therefore be plain text — any Jinja inside it would change what is hashed
+per render, and is rejected at load time.
+"""
+
+import base64
+import hashlib
+import re
+
+from jinja2 import Environment
+
+_SCRIPT_RE = re.compile(
+    r"<script\b(?P<attrs>[^>]*)>(?P<body>.*?)</script\s*>", re.DOTALL | re.IGNORECASE
+)
+_TYPE_RE = re.compile(r"""\btype\s*=\s*["']?([^"'\s>]*)""", re.IGNORECASE)
+_SRC_RE = re.compile(r"\bsrc\s*=", re.IGNORECASE)
+_JINJA_RE = re.compile(r"\{[{%#]")
+# Script types the browser executes; others (e.g. application/ld+json) are
+# data blocks that CSP does not govern.
+_EXECUTABLE_TYPES = frozenset(
+    {"", "text/javascript", "application/javascript", "module"}
+)
+
+
+def script_hash(source: str) -> str:
+    """CSP source expression (``'sha256-…'``) allowing an inline script."""
+    digest = hashlib.sha256(source.encode()).digest()
+    return f"'sha256-{base64.b64encode(digest).decode()}'"
+
+
+def inline_script_hashes(env: Environment) -> list[str]:
+    """Hashes of every executable inline script in ``env``'s templates.
+
+    Raises ValueError if an inline script contains Jinja syntax.
+    """
+    if env.loader is None:
+        return []
+    hashes: set[str] = set()
+    for name in env.loader.list_templates():
+        source, _filename, _uptodate = env.loader.get_source(env, name)
+        for match in _SCRIPT_RE.finditer(source):
+            attrs = match.group("attrs")
+            if _SRC_RE.search(attrs):
+                continue
+            script_type = _TYPE_RE.search(attrs)
+            if script_type and script_type.group(1).lower() not in _EXECUTABLE_TYPES:
+                continue
+            body = match.group("body").replace("\r\n", "\n")
+            if _JINJA_RE.search(body):
+                raise ValueError(
+                    f"Inline script in {name} contains template syntax; "
+                    "move the dynamic part into a data attribute or a static file"
+                )
+            hashes.add(script_hash(body))
+    return sorted(hashes)
@@ -1,3 +1,4 @@
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, create_engine, select
 
 from app import crud
@@ -13,6 +14,18 @@ engine = create_engine(
     pool_recycle=settings.DB_POOL_RECYCLE,
 )
 
+# Public page routes read through this engine so DB round trips never block
+# the event loop. psycopg 3 is used in its native asyncio mode; the pool is
+# separate from (and sized like) the sync engine's, which keeps serving the
+# API, content sync and background jobs.
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+)
+
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
 # otherwise, SQLModel might fail to initialize relationships properly
@@ -9,6 +9,7 @@ import ipaddress
 import secrets
 import time
 import uuid
+from collections.abc import Iterable
 from typing import Any
 
 import structlog
@@ -53,11 +54,14 @@ def anonymize_ip(ip: str | None) -> str | None:
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     """Add security headers (HSTS, CSP, X-Frame-Options, etc.) to all responses.
 
-    Generates a per-request nonce for CSP and stores it in ``request.state.csp_nonce``
-    so Jinja2 templates can reference it via ``{{ request.state.csp_nonce }}``.
+    ``script_hashes`` (see ``app.core.csp``) allow the templates' inline
+    scripts. With ``CSP_MODE=nonce`` a per-request nonce is also generated and
+    stored in ``request.state.csp_nonce`` so Jinja2 templates can reference it
+    via ``{{ request.state.csp_nonce }}``; with ``CSP_MODE=hash`` the policy is
+    the same for every request.
     """
 
-    def __init__(self, app: Any) -> None:
+    def __init__(self, app: Any, *, script_hashes: Iterable[str] = ()) -> None:
         super().__init__(app)
         self._static_headers: dict[str, str] = {
             "X-Frame-Options": "DENY",
@@ -70,8 +74,15 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
                 "max-age=63072000; includeSubDomains"
             )
 
-        # Build CSP template with {nonce} placeholder
-        script_src = "'self' 'nonce-{nonce}'"
+        # Build CSP template, with a {nonce} placeholder in nonce mode
+        self._use_nonce = settings.CSP_MODE == "nonce"
+        script_src = " ".join(
+            [
+                "'self'",
+                *(["'nonce-{nonce}'"] if self._use_nonce else []),
+                *script_hashes,
+            ]
+        )
         connect_src = "'self'"
         if settings.UMAMI_ENABLED and settings.UMAMI_HOST:
             script_src += f" {settings.UMAMI_HOST}"
@@ -97,12 +108,15 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     async def dispatch(
         self, request: Request, call_next: RequestResponseEndpoint
     ) -> Response:
-        nonce = secrets.token_urlsafe(16)
-        request.state.csp_nonce = nonce
+        csp = self._csp_template
+        if self._use_nonce:
+            nonce = secrets.token_urlsafe(16)
+            request.state.csp_nonce = nonce
+            csp = csp.format(nonce=nonce)
         response = await call_next(request)
         for header, value in self._static_headers.items():
             response.headers[header] = value
-        response.headers[self._csp_header_name] = self._csp_template.format(nonce=nonce)
+        response.headers[self._csp_header_name] = csp
         return response
 
 
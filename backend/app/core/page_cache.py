@@ -0,0 +1,260 @@
+"""In-memory cache of rendered public pages, invalidated by content version.
+
+Public pages change only when content sync runs (or the GitHub refresh
+updates project metadata), so ``PageCacheMiddleware`` keeps their complete
+responses in an LRU and replays them without running the route, its
+queries or its templates. Processes share one ``ContentVersion`` file: sync
+bumps it when it finishes, and every worker drops its whole cache the next
+time a request finds the file changed — a single stat per request.
+
+With ``CSP_MODE=hash`` pages carry no per-request data and are replayed
+byte for byte. In nonce mode the CSP nonce is swapped for a placeholder when
+a response is stored and for the current request's nonce when it is
+replayed, so cached pages keep matching their ``Content-Security-Policy``
+header.
+"""
+
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import parse_qsl, urlencode
+
+import structlog
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = structlog.get_logger(__name__)
+
+_NONCE_PLACEHOLDER = b"\x00csp-nonce\x00"
+
+
+class ContentVersion:
+    """Version stamp of published content, shared by processes through a file.
+
+    ``bump`` atomically rewrites ``path``; ``signature`` is its stat
+    signature, or None before the first bump.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def signature(self) -> tuple[int, int, int] | None:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def bump(self) -> None:
+        """Mark published content as changed. Failures are logged, not raised."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+                tmp.write(uuid.uuid4().hex)
+            os.replace(tmp_name, self.path)
+        except OSError:
+            logger.warning(
+                "content_version_bump_failed", path=str(self.path), exc_info=True
+            )
+
+
+_content_version: ContentVersion | None = None
+
+
+def configure_content_version(path: Path | None) -> None:
+    """Set (or with None, clear) the file content changes are published to."""
+    global _content_version
+    _content_version = ContentVersion(path) if path is not None else None
+
+
+def get_content_version() -> ContentVersion | None:
+    return _content_version
+
+
+def bump_content_version() -> None:
+    """Invalidate every worker's page cache, if a version file is configured."""
+    if _content_version is not None:
+        _content_version.bump()
+
+
+class CachedPage(NamedTuple):
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+
+
+class PageCache:
+    """LRU of ``CachedPage`` bounded by total body size.
+
+    ``hits`` and ``misses`` count lookups made through this instance.
+    """
+
+    def __init__(self, *, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._pages: OrderedDict[tuple[str, ...], CachedPage] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def get(self, key: tuple[str, ...]) -> CachedPage | None:
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None:
+                self.misses += 1
+                return None
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return page
+
+    def put(self, key: tuple[str, ...], page: CachedPage) -> None:
+        size = len(page.body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._pages.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous.body)
+            self._pages[key] = page
+            self.size += size
+            while self.size > self.max_bytes:
+                _key, evicted = self._pages.popitem(last=False)
+                self.size -= len(evicted.body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+            self.size = 0
+
+
+def _cache_key(scope: Scope, query_params: frozenset[str]) -> tuple[str, ...] | None:
+    """Key of a request's page, or None to bypass the cache.
+
+    Requests with a query parameter outside ``query_params`` bypass it, so
+    junk parameters can't fill the cache and evict real pages. Scheme, host
+    and root path are part of the key because pages such as the feeds and
+    sitemap embed ``request.base_url``; ``TrustedHostMiddleware`` runs first,
+    so hosts are limited to the allowed ones.
+    """
+    headers = dict(scope["headers"])
+    query = sorted(
+        parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+    )
+    if any(name not in query_params for name, _value in query):
+        return None
+    return (
+        scope["scheme"],
+        headers.get(b"host", b"").decode("latin-1"),
+        scope.get("root_path", ""),
+        scope["path"],
+        urlencode(query),
+        "htmx" if headers.get(b"hx-request") == b"true" else "",
+        "boosted" if b"hx-boosted" in headers else "",
+    )
+
+
+class PageCacheMiddleware:
+    """Serve GET requests for ``routes`` from a ``PageCache``.
+
+    Only complete ``200`` responses without ``Set-Cookie`` are stored. Paths
+    in ``exclude`` (e.g. search, whose keys are unbounded user input), and
+    requests with a query parameter not in ``query_params``, always run the
+    route.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        routes: Iterable[BaseRoute],
+        max_bytes: int,
+        exclude: Iterable[str] = (),
+        query_params: Iterable[str] = (),
+    ) -> None:
+        self.app = app
+        self.routes = list(routes)
+        self.exclude = frozenset(exclude)
+        self.query_params = frozenset(query_params)
+        self.cache = PageCache(max_bytes=max_bytes)
+        self._version: tuple[int, int, int] | None = None
+
+    def _cacheable(self, scope: Scope) -> bool:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return False
+        if scope["path"] in self.exclude or _content_version is None:
+            return False
+        return any(route.matches(scope)[0] == Match.FULL for route in self.routes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        key = _cache_key(scope, self.query_params) if self._cacheable(scope) else None
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        version = _content_version.signature() if _content_version else None
+        if version != self._version:
+            if self.cache:
+                logger.info("page_cache_cleared", pages=len(self.cache))
+            self.cache.clear()
+            self._version = version
+
+        nonce = scope.get("state", {}).get("csp_nonce", "").encode()
+        page = self.cache.get(key)
+        if page is not None:
+            body = page.body.replace(_NONCE_PLACEHOLDER, nonce) if nonce else page.body
+            headers = [
+                (name, str(len(body)).encode() if name == b"content-length" else value)
+                for name, value in page.headers
+            ]
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": page.status,
+                    "headers": headers,
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        start: Message | None = None
+        chunks: list[bytes] = []
+
+        async def send_and_capture(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body" and start is not None:
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    self._store(key, start, b"".join(chunks), nonce, version)
+            await send(message)
+
+        await self.app(scope, receive, send_and_capture)
+
+    def _store(
+        self,
+        key: tuple[str, ...],
+        start: Message,
+        body: bytes,
+        nonce: bytes,
+        version: tuple[int, int, int] | None,
+    ) -> None:
+        headers = list(start.get("headers", []))
+        if start["status"] != 200 or any(
+            name.lower() == b"set-cookie" for name, _value in headers
+        ):
+            return
+        if version != self._version:
+            return  # content changed while this page rendered
+        if nonce:
+            body = body.replace(nonce, _NONCE_PLACEHOLDER)
+        self.cache.put(key, CachedPage(start["status"], headers, body))
@@ -3,7 +3,6 @@ from app.crud.post import (  # noqa: F401
     get_or_create_tag,
     get_post_by_slug,
     get_posts,
-    get_tags_with_counts,
     upsert_post,
 )
 from app.crud.project import (  # noqa: F401
@@ -0,0 +1,179 @@
+"""Set-based writes keyed on ``source_path`` for file-backed content rows.
+
+Shared by ``crud.post`` and ``crud.project``. Does NOT commit — the caller
+owns the transaction boundary.
+"""
+
+import uuid
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from sqlalchemy import ARRAY, String, Table, any_, bindparam, delete, not_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlmodel import Session, SQLModel, select
+from sqlmodel.sql.expression import Select
+
+from app.models.base import get_datetime_utc
+
+# Per-row failure reasons.
+INVALID = "invalid"
+SLUG_CONFLICT = "slug_conflict"
+WRITE_FAILED = "write_failed"
+
+_BATCH_SIZE = 500
+
+
+def _text_array(name: str, values: Sequence[str]) -> Any:
+    """Bind a whole list as one ``text[]`` parameter (``col = ANY(:name)``)."""
+    return any_(bindparam(name, list(values), type_=ARRAY(String)))
+
+
+def _upsert_statement(
+    table: Table, values: list[dict[str, Any]], update_columns: Sequence[str]
+) -> Any:
+    stmt = insert(table).values(values)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.source_path],
+        set_={name: stmt.excluded[name] for name in update_columns},
+    ).returning(table.c.source_path, table.c.id)
+
+
+def bulk_upsert_by_source_path(
+    *,
+    session: Session,
+    table: Table,
+    rows: Sequence[tuple[str, SQLModel, str | None]],
+) -> tuple[dict[str, uuid.UUID], dict[str, str]]:
+    """Upsert ``(source_path, data, source_hash)`` rows with batched statements.
+
+    Existing rows for the given paths, and rows already holding the requested
+    slugs, are each loaded in one query. A row whose slug is held by another
+    source path (in the DB or earlier in ``rows``) is reported as
+    ``SLUG_CONFLICT`` rather than failing its batch. Rows with unchanged
+    fields and hash are not written, and ``updated_at`` only moves when a
+    field changed — the same rules as the single-row upserts.
+
+    Changed rows are sent as ``INSERT ... ON CONFLICT (source_path) DO UPDATE``
+    in batches of 500. A batch that still fails is retried row by row, each
+    in its own savepoint, so one bad row can't take the others down.
+
+    Returns:
+        ``(ids, failures)``: ``{source_path: id}`` for every row present after
+        the call, and ``{source_path: reason}`` for rows that were skipped.
+    """
+    if not rows:
+        return {}, {}
+
+    fields = list(rows[0][1].model_dump())
+    paths = [path for path, _, _ in rows]
+    columns = ["id", "source_hash", "updated_at", *fields]
+    # sqlmodel's Select rather than select(): the column list is built at
+    # runtime, which select()'s typed overloads don't cover.
+    existing_stmt = Select(
+        table.c.source_path, *(table.c[name] for name in columns)
+    ).where(table.c.source_path == _text_array("paths", paths))
+    existing = {
+        path: dict(zip(columns, values, strict=True))
+        for path, *values in session.exec(existing_stmt)
+    }
+    slugs = [data.slug for _, data, _ in rows]  # ty: ignore[unresolved-attribute]
+    slug_holders: dict[str, str] = dict(
+        session.exec(
+            select(table.c.slug, table.c.source_path).where(
+                table.c.slug == _text_array("slugs", slugs)
+            )
+        ).all()
+    )
+
+    now = get_datetime_utc()
+    ids: dict[str, uuid.UUID] = {}
+    failures: dict[str, str] = {}
+    to_write: list[dict[str, Any]] = []
+    for path, data, source_hash in rows:
+        values = data.model_dump()
+        holder = slug_holders.get(values["slug"])
+        if holder is not None and holder != path:
+            failures[path] = SLUG_CONFLICT
+            continue
+        slug_holders[values["slug"]] = path
+
+        current = existing.get(path)
+        if current is None:
+            to_write.append(
+                {
+                    "id": uuid.uuid4(),
+                    "source_path": path,
+                    "source_hash": source_hash,
+                    "created_at": now,
+                    "updated_at": None,
+                    **values,
+                }
+            )
+            continue
+
+        ids[path] = current["id"]
+        changed = any(current[name] != value for name, value in values.items())
+        if not changed and current["source_hash"] == source_hash:
+            continue
+        to_write.append(
+            {
+                "id": current["id"],
+                "source_path": path,
+                "source_hash": source_hash,
+                "created_at": now,  # ignored on conflict
+                "updated_at": now if changed else current["updated_at"],
+                **values,
+            }
+        )
+
+    update_columns = [*fields, "source_hash", "updated_at"]
+    for start in range(0, len(to_write), _BATCH_SIZE):
+        batch = to_write[start : start + _BATCH_SIZE]
+        try:
+            with session.begin_nested():
+                result = session.exec(_upsert_statement(table, batch, update_columns))
+                ids.update(result.all())
+        except SQLAlchemyError:
+            for values in batch:
+                try:
+                    with session.begin_nested():
+                        path, row_id = session.exec(
+                            _upsert_statement(table, [values], update_columns)
+                        ).one()
+                    ids[path] = row_id
+                except IntegrityError:
+                    failures[values["source_path"]] = SLUG_CONFLICT
+                    ids.pop(values["source_path"], None)
+                except SQLAlchemyError:
+                    failures[values["source_path"]] = WRITE_FAILED
+                    ids.pop(values["source_path"], None)
+    return ids, failures
+
+
+def delete_source_paths_not_in(
+    *, session: Session, model: type[SQLModel], source_paths: Iterable[str]
+) -> int:
+    """Delete file-backed rows whose ``source_path`` is not in ``source_paths``.
+
+    One ``DELETE ... WHERE NOT (source_path = ANY(:paths))`` statement; rows
+    with a NULL ``source_path`` are never touched. Returns the count deleted.
+    """
+    source_path = model.source_path  # ty: ignore[unresolved-attribute]
+    statement = delete(model).where(
+        source_path.is_not(None),
+        not_(source_path == _text_array("paths", sorted(source_paths))),
+    )
+    return session.exec(statement).rowcount
+
+
+def delete_by_source_paths(
+    *, session: Session, model: type[SQLModel], source_paths: Iterable[str]
+) -> int:
+    """Delete the rows with the given ``source_path`` values. Returns the count."""
+    paths = sorted(source_paths)
+    if not paths:
+        return 0
+    source_path = model.source_path  # ty: ignore[unresolved-attribute]
+    statement = delete(model).where(source_path == _text_array("paths", paths))
+    return session.exec(statement).rowcount
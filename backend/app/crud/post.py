@@ -1,15 +1,126 @@
-from sqlalchemy.orm import selectinload
+import uuid
+from collections.abc import Collection, Sequence
+from datetime import UTC, datetime
+from typing import Any, NamedTuple
+
+from sqlalchemy import (
+    ColumnElement,
+    cast,
+    delete,
+    literal,
+    literal_column,
+    tuple_,
+    union,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG, insert
+from sqlalchemy.orm import defer, selectinload
 from sqlmodel import Session, col, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import Select, SelectOfScalar
 
+from app.crud.bulk import (
+    bulk_upsert_by_source_path,
+    delete_by_source_paths,
+    delete_source_paths_not_in,
+)
 from app.models.base import get_datetime_utc
 from app.models.post import Post, PostTagLink, Tag
 from app.schemas.post import PostUpsert, TagCreate
 
+# List views render title, slug, excerpt, dates and tags only. Their queries
+# defer the body columns, and an accidental access raises instead of lazy
+# loading (which can't run under AsyncSession anyway). ``search_vector`` is
+# only ever read by Postgres, so no read path loads it.
+_BODY_COLUMNS = (Post.content_markdown, Post.content_html, Post.toc)
+
+
+def _without_search_vector() -> Any:
+    return defer(Post.search_vector, raiseload=True)  # ty: ignore[invalid-argument-type]
+
+
+def _without_body() -> list[Any]:
+    return [
+        *(
+            defer(column, raiseload=True)  # ty: ignore[invalid-argument-type]
+            for column in _BODY_COLUMNS
+        ),
+        _without_search_vector(),
+    ]
+
+
+def _post_by_slug_statement(slug: str) -> SelectOfScalar[Post]:
+    eager = selectinload(Post.tags)  # ty: ignore[invalid-argument-type]
+    return (
+        select(Post).options(eager, _without_search_vector()).where(Post.slug == slug)
+    )
+
 
 def get_post_by_slug(*, session: Session, slug: str) -> Post | None:
-    eager = selectinload(Post.tags)  # type: ignore[arg-type]
-    statement = select(Post).options(eager).where(Post.slug == slug)
-    return session.exec(statement).first()
+    return session.exec(_post_by_slug_statement(slug)).first()
+
+
+# Sort value standing in for a missing ``published_at``: undated posts go last.
+UNDATED = datetime.min.replace(tzinfo=UTC)
+
+# Feed sort key. The literal is inlined (not bound) so the expression is the
+# one indexed by ``ix_post_published_feed`` — see ``models.post``.
+post_feed_key: Any = func.coalesce(
+    col(Post.published_at),
+    literal_column("'0001-01-01 00:00:00+00'::timestamptz"),
+)
+
+
+class PostCursor(NamedTuple):
+    """Keyset position in the post feed: the sort key and id of the last row seen."""
+
+    published_at: datetime
+    id: uuid.UUID
+
+    @classmethod
+    def after(cls, post: Post) -> PostCursor:
+        return cls(post.published_at or UNDATED, post.id)
+
+
+def _posts_statement(
+    *,
+    tag_slug: str | None,
+    published_only: bool,
+    skip: int,
+    limit: int,
+    after: PostCursor | None = None,
+    with_body: bool = False,
+) -> SelectOfScalar[Post]:
+    """Return the page statement behind ``get_posts``.
+
+    Selects ``limit + 1`` rows: the extra row only signals that another page
+    exists, which saves a ``COUNT(*)`` over the whole feed.
+    """
+    eager = selectinload(Post.tags)  # ty: ignore[invalid-argument-type]
+    statement = select(Post).options(eager)
+    if with_body:
+        statement = statement.options(_without_search_vector())
+    else:
+        statement = statement.options(*_without_body())
+
+    if after is not None:
+        statement = statement.where(
+            tuple_(post_feed_key, col(Post.id))
+            < tuple_(literal(after.published_at), literal(after.id))
+        )
+
+    if published_only:
+        statement = statement.where(Post.published == True)  # noqa: E712
+
+    if tag_slug:
+        statement = statement.join(PostTagLink).join(Tag).where(Tag.slug == tag_slug)
+
+    return (
+        statement.order_by(post_feed_key.desc(), col(Post.id).desc())
+        .offset(skip)
+        .limit(limit + 1)
+    )
 
 
 def get_posts(
@@ -19,27 +130,40 @@ def get_posts(
     published_only: bool = True,
     skip: int = 0,
     limit: int = 20,
-) -> tuple[list[Post], int]:
-    eager = selectinload(Post.tags)  # type: ignore[arg-type]
-    base = select(Post).options(eager)
-    count_base = select(func.count()).select_from(Post)
+    after: PostCursor | None = None,
+    with_body: bool = False,
+) -> tuple[list[Post], bool]:
+    """Return a page of posts and whether more follow it.
 
-    if published_only:
-        base = base.where(Post.published == True)  # noqa: E712
-        count_base = count_base.where(Post.published == True)  # noqa: E712
+    Body columns are not loaded unless ``with_body`` is set.
+    """
+    statement = _posts_statement(
+        tag_slug=tag_slug,
+        published_only=published_only,
+        skip=skip,
+        limit=limit,
+        after=after,
+        with_body=with_body,
+    )
+    posts = list(session.exec(statement).all())
+    return posts[:limit], len(posts) > limit
 
-    if tag_slug:
-        base = base.join(PostTagLink).join(Tag).where(Tag.slug == tag_slug)
-        count_base = count_base.join(PostTagLink).join(Tag).where(Tag.slug == tag_slug)
 
-    count = session.exec(count_base).one()
-    posts = session.exec(
-        base.order_by(col(Post.published_at).desc()).offset(skip).limit(limit)
-    ).all()
-    return list(posts), count
+def get_post_source_hashes(*, session: Session) -> dict[str, str | None]:
+    """Return ``{source_path: source_hash}`` for every file-backed post."""
+    statement = select(Post.source_path, Post.source_hash).where(
+        Post.source_path.is_not(None)  # type: ignore[union-attr]
+    )
+    return dict(session.exec(statement).all())
 
 
-def upsert_post(*, session: Session, source_path: str, data: PostUpsert) -> Post:
+def upsert_post(
+    *,
+    session: Session,
+    source_path: str,
+    data: PostUpsert,
+    source_hash: str | None = None,
+) -> Post:
     statement = select(Post).where(Post.source_path == source_path)
     existing = session.exec(statement).first()
     if existing:
@@ -48,20 +172,47 @@ def upsert_post(*, session: Session, source_path: str, data: PostUpsert) -> Post
             getattr(existing, field) != value for field, value in update_dict.items()
         )
         if not changed:
+            # A new fingerprint alone (e.g. a renderer bump with identical
+            # output) is recorded without touching updated_at.
+            if existing.source_hash != source_hash:
+                existing.source_hash = source_hash
+                session.add(existing)
+                session.flush()
             return existing
         existing.sqlmodel_update(update_dict)
+        existing.source_hash = source_hash
         existing.updated_at = get_datetime_utc()
         session.add(existing)
         session.flush()
         session.refresh(existing)
         return existing
-    post = Post(source_path=source_path, **data.model_dump())
+    post = Post(source_path=source_path, source_hash=source_hash, **data.model_dump())
     session.add(post)
     session.flush()
     session.refresh(post)
     return post
 
 
+def bulk_upsert_posts(
+    *, session: Session, rows: Sequence[tuple[str, PostUpsert, str | None]]
+) -> tuple[dict[str, uuid.UUID], dict[str, str]]:
+    """Batched ``upsert_post`` for ``(source_path, data, source_hash)`` rows.
+
+    See ``crud.bulk.bulk_upsert_by_source_path`` for the return value.
+    """
+    return bulk_upsert_by_source_path(
+        session=session,
+        table=Post.__table__,  # ty: ignore[unresolved-attribute]
+        rows=rows,
+    )
+
+
+def clear_post_source_hashes(*, session: Session, ids: Sequence[uuid.UUID]) -> None:
+    """Forget the stored fingerprints of the given posts so sync reloads them."""
+    if ids:
+        session.exec(update(Post).where(col(Post.id).in_(ids)).values(source_hash=None))
+
+
 def get_or_create_tag(*, session: Session, data: TagCreate) -> Tag:
     statement = select(Tag).where(Tag.slug == data.slug)
     existing = session.exec(statement).first()
@@ -74,30 +225,209 @@ def get_or_create_tag(*, session: Session, data: TagCreate) -> Tag:
     return tag
 
 
+def get_or_create_tags(
+    *, session: Session, tag_creates: Sequence[TagCreate]
+) -> dict[str, uuid.UUID]:
+    """Return ``{slug: tag id}`` for the given tags, creating missing ones.
+
+    Existing tags are loaded in one query and missing ones inserted in one
+    statement. If a slug appears more than once, the first name wins.
+    """
+    wanted = {data.slug: data for data in reversed(tag_creates)}
+    if not wanted:
+        return {}
+    by_slug_stmt = select(Tag.slug, Tag.id).where(col(Tag.slug).in_(wanted))
+    tag_ids: dict[str, uuid.UUID] = dict(session.exec(by_slug_stmt).all())
+    missing = [data for slug, data in wanted.items() if slug not in tag_ids]
+    if missing:
+        now = get_datetime_utc()
+        insert_stmt = (
+            insert(Tag)
+            .values(
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "name": d.name,
+                        "slug": d.slug,
+                        "created_at": now,
+                    }
+                    for d in missing
+                ]
+            )
+            .on_conflict_do_nothing()
+            .returning(col(Tag.slug), col(Tag.id))
+        )
+        tag_ids.update(session.exec(insert_stmt).all())
+        # Rows skipped by ON CONFLICT (created concurrently) aren't returned.
+        raced = [data.slug for data in missing if data.slug not in tag_ids]
+        if raced:
+            raced_stmt = select(Tag.slug, Tag.id).where(col(Tag.slug).in_(raced))
+            tag_ids.update(session.exec(raced_stmt).all())
+    return tag_ids
+
+
+def reconcile_tags_for_posts(
+    *, session: Session, post_tags: dict[uuid.UUID, list[TagCreate]]
+) -> None:
+    """Set the tags of each post in ``post_tags`` to exactly the given list.
+
+    Only link rows that differ from the stored ones are inserted or deleted,
+    so re-syncing unchanged tags writes nothing. Works on ``posttaglink``
+    directly: callers holding ``Post`` instances should expire their
+    ``tags`` afterwards (``reconcile_post_tags`` does this).
+    """
+    if not post_tags:
+        return
+    tag_ids = get_or_create_tags(
+        session=session,
+        tag_creates=[data for datas in post_tags.values() for data in datas],
+    )
+    wanted = {
+        (post_id, tag_ids[data.slug])
+        for post_id, datas in post_tags.items()
+        for data in datas
+        if data.slug in tag_ids
+    }
+    links_stmt = select(PostTagLink.post_id, PostTagLink.tag_id).where(
+        col(PostTagLink.post_id).in_(post_tags)
+    )
+    current = set(session.exec(links_stmt).all())
+
+    stale = current - wanted
+    if stale:
+        session.exec(
+            delete(PostTagLink).where(
+                tuple_(col(PostTagLink.post_id), col(PostTagLink.tag_id)).in_(stale)
+            )
+        )
+    added = wanted - current
+    if added:
+        session.exec(
+            insert(PostTagLink).values(
+                [{"post_id": post_id, "tag_id": tag_id} for post_id, tag_id in added]
+            )
+        )
+
+
 def reconcile_post_tags(
     *, session: Session, post: Post, tag_creates: list[TagCreate]
 ) -> None:
-    """Replace a post's tags with the given set, flushing changes."""
-    post.tags.clear()
-    for data in tag_creates:
-        tag = get_or_create_tag(session=session, data=data)
-        post.tags.append(tag)
-    session.add(post)
+    """Replace a post's tags with the given set, writing only the differences."""
     session.flush()
+    reconcile_tags_for_posts(session=session, post_tags={post.id: tag_creates})
+    session.expire(post, ["tags"])
+
+
+def delete_posts_by_source_paths(*, session: Session, source_paths: set[str]) -> int:
+    """Delete posts with the given source paths. Returns count deleted."""
+    return delete_by_source_paths(
+        session=session, model=Post, source_paths=source_paths
+    )
 
 
 def delete_posts_not_in(*, session: Session, source_paths: set[str]) -> int:
     """Delete posts whose source_path is not in the given set. Returns count deleted."""
-    statement = select(Post).where(Post.source_path.is_not(None))  # type: ignore[union-attr]
-    all_posts = session.exec(statement).all()
-    deleted = 0
-    for post in all_posts:
-        if post.source_path not in source_paths:
-            session.delete(post)
-            deleted += 1
-    if deleted:
-        session.flush()
-    return deleted
+    return delete_source_paths_not_in(
+        session=session, model=Post, source_paths=source_paths
+    )
+
+
+# Text search configuration for both the stored vectors and parsed queries.
+SEARCH_CONFIG = "english"
+
+# Private-use characters ts_headline wraps matches in; the caller escapes the
+# snippet and then swaps these for markup.
+SNIPPET_START = "\ue000"
+SNIPPET_END = "\ue001"
+_HEADLINE_OPTIONS = (
+    f"StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, "
+    'MaxWords=30, MinWords=12, MaxFragments=2, FragmentDelimiter=" … "'
+)
+
+
+def _regconfig() -> Any:
+    return cast(literal(SEARCH_CONFIG), REGCONFIG)
+
+
+def _weighted(text: Any, weight: str) -> Any:
+    return func.setweight(
+        func.to_tsvector(_regconfig(), func.coalesce(text, "")),
+        literal_column(f"'{weight}'"),
+    )
+
+
+def _search_vector_expression() -> ColumnElement[Any]:
+    tag_names = (
+        select(func.string_agg(Tag.name, " "))
+        .join(PostTagLink, col(PostTagLink.tag_id) == col(Tag.id))
+        .where(PostTagLink.post_id == Post.id)
+        .scalar_subquery()
+    )
+    return (
+        _weighted(Post.title, "A")
+        .op("||")(_weighted(tag_names, "B"))
+        .op("||")(_weighted(Post.excerpt, "C"))
+        .op("||")(_weighted(Post.content_markdown, "D"))
+    )
+
+
+def refresh_post_search_vectors(
+    *, session: Session, source_paths: Collection[str] | None = None
+) -> int:
+    """Recompute ``Post.search_vector`` from title, tags, excerpt and body.
+
+    With ``source_paths``, only those posts and any post still missing a
+    vector are recomputed; otherwise every post is. Only rows whose vector
+    changed are written. Returns how many were. Does NOT commit.
+    """
+    vector = _search_vector_expression()
+    statement = update(Post).where(col(Post.search_vector).is_distinct_from(vector))
+    if source_paths is not None:
+        statement = statement.where(
+            col(Post.source_path).in_(source_paths) | col(Post.search_vector).is_(None)
+        )
+    statement = statement.values(search_vector=vector).execution_options(
+        synchronize_session=False
+    )
+    return session.exec(statement).rowcount
+
+
+def _search_posts_statement(
+    *, query: str, published_only: bool, limit: int
+) -> Select[Post, str]:
+    """Rank matches by weighted relevance, then snippet only the page of hits.
+
+    ``websearch_to_tsquery`` accepts any user input (quotes, ``or``, ``-``)
+    without syntax errors. Matching and ranking read ``search_vector`` through
+    its GIN index; ``ts_headline`` re-parses the text, so it runs on at most
+    ``limit`` rows.
+    """
+    tsquery = func.websearch_to_tsquery(_regconfig(), query)
+    rank = func.ts_rank_cd(col(Post.search_vector), tsquery)
+    hits = select(col(Post.id).label("id"), rank.label("rank")).where(
+        col(Post.search_vector).op("@@")(tsquery)
+    )
+    if published_only:
+        hits = hits.where(Post.published == True)  # noqa: E712
+    top = (
+        hits.order_by(rank.desc(), post_feed_key.desc(), col(Post.id).desc())
+        .limit(limit)
+        .subquery()
+    )
+
+    snippet = func.ts_headline(
+        _regconfig(),
+        func.concat_ws(" ", Post.excerpt, Post.content_markdown),
+        tsquery,
+        _HEADLINE_OPTIONS,
+    )
+    eager = selectinload(Post.tags)  # ty: ignore[invalid-argument-type]
+    return (
+        select(Post, snippet)
+        .options(eager, *_without_body())
+        .join(top, top.c.id == col(Post.id))
+        .order_by(top.c.rank.desc(), post_feed_key.desc(), col(Post.id).desc())
+    )
 
 
 def search_posts(
@@ -106,30 +436,207 @@ def search_posts(
     query: str,
     published_only: bool = True,
     limit: int = 20,
+) -> list[tuple[Post, str]]:
+    """Full-text search; returns ``(post, snippet)`` pairs, best match first.
+
+    Matches in snippets are wrapped in ``SNIPPET_START``/``SNIPPET_END``.
+    """
+    statement = _search_posts_statement(
+        query=query, published_only=published_only, limit=limit
+    )
+    return list(session.exec(statement).all())
+
+
+def get_published_posts_for_index(
+    *, session: Session, source_paths: Collection[str] | None = None
 ) -> list[Post]:
-    eager = selectinload(Post.tags)  # type: ignore[arg-type]
-    statement = select(Post).options(eager)
-    if published_only:
-        statement = statement.where(Post.published == True)  # noqa: E712
-    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
-    pattern = f"%{escaped}%"
-    statement = statement.where(
-        (Post.title.ilike(pattern)) | (Post.excerpt.ilike(pattern))  # type: ignore[union-attr]
+    """Every published post with its tags and Markdown body, newest first.
+
+    With ``source_paths``, only the published posts among those paths. Feeds
+    the in-memory search index (``content.search_index``).
+    """
+    eager = selectinload(Post.tags)  # ty: ignore[invalid-argument-type]
+    statement = (
+        select(Post)
+        .options(
+            eager,
+            defer(Post.content_html, raiseload=True),  # ty: ignore[invalid-argument-type]
+            defer(Post.toc, raiseload=True),  # ty: ignore[invalid-argument-type]
+            _without_search_vector(),
+        )
+        .where(Post.published == True)  # noqa: E712
+        .order_by(post_feed_key.desc(), col(Post.id).desc())
     )
-    statement = statement.order_by(col(Post.published_at).desc()).limit(limit)
+    if source_paths is not None:
+        statement = statement.where(col(Post.source_path).in_(source_paths))
     return list(session.exec(statement).all())
 
 
-def get_tags_with_counts(
-    *, session: Session, published_only: bool = True
-) -> list[tuple[Tag, int]]:
+# Shorter queries contain no complete trigram, so fuzzy search only matches
+# title and tag-name prefixes for them (anchored ``LIKE`` patterns, which
+# pg_trgm still answers from its index) rather than substrings and typos.
+FUZZY_MIN_CHARS = 3
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _fuzzy_search_statement(*, query: str, limit: int) -> SelectOfScalar[Post]:
+    """Published posts whose title or a tag loosely matches ``query``.
+
+    Title and tag candidates are collected by separate branches of a UNION
+    so each is served by its trigram index (``ix_post_title_trgm``,
+    ``ix_tag_name_trgm``), then ranked by word similarity to the title.
+    """
+    escaped = _escape_like(query)
+    if len(query) < FUZZY_MIN_CHARS:
+        title_hit = col(Post.title).ilike(f"{escaped}%")
+        tag_hit = col(Tag.name).ilike(f"{escaped}%")
+    else:
+        title_hit = col(Post.title).ilike(f"%{escaped}%") | col(Post.title).op("%>")(
+            query
+        )
+        tag_hit = col(Tag.name).ilike(f"%{escaped}%") | col(Tag.name).op("%")(query)
+    candidates = union(
+        select(Post.id).where(Post.published == True, title_hit),  # noqa: E712
+        select(PostTagLink.post_id)
+        .join(Tag, col(Tag.id) == col(PostTagLink.tag_id))
+        .where(tag_hit),
+    ).subquery()
+
+    eager = selectinload(Post.tags)  # ty: ignore[invalid-argument-type]
+    return (
+        select(Post)
+        .options(eager, *_without_body())
+        .join(candidates, candidates.c.id == col(Post.id))
+        .where(Post.published == True)  # noqa: E712
+        .order_by(
+            func.word_similarity(query, Post.title).desc(),
+            post_feed_key.desc(),
+            col(Post.id).desc(),
+        )
+        .limit(limit)
+    )
+
+
+def fuzzy_search_posts(*, session: Session, query: str, limit: int = 20) -> list[Post]:
+    """Typo- and prefix-tolerant search over published titles and tags."""
+    return list(session.exec(_fuzzy_search_statement(query=query, limit=limit)).all())
+
+
+def _suggestion_statement(query: str) -> SelectOfScalar[str]:
+    # Whole-string similarity (``%``, threshold 0.3) is looser than the word
+    # similarity fuzzy search matches titles with, so a query too garbled to
+    # hit anything can still be close to one complete title or tag.
+    tags = select(
+        col(Tag.name).label("term"), func.similarity(Tag.name, query).label("score")
+    ).where(Tag.post_count > 0, col(Tag.name).op("%")(query))
+    titles = select(
+        col(Post.title).label("term"),
+        func.similarity(Post.title, query).label("score"),
+    ).where(Post.published == True, col(Post.title).op("%")(query))  # noqa: E712
+    terms = union_all(tags, titles).subquery()
+    return select(terms.c.term).order_by(terms.c.score.desc(), terms.c.term).limit(1)
+
+
+def suggest_search_term(*, session: Session, query: str) -> str | None:
+    """Return the published tag name or post title closest to ``query``.
+
+    The "did you mean" for a fuzzy search that found nothing; None when
+    nothing is similar enough (pg_trgm's similarity thresholds).
+    """
+    return session.exec(_suggestion_statement(query)).first()
+
+
+def refresh_tag_post_counts(*, session: Session) -> int:
+    """Recompute ``Tag.post_count`` from published posts.
+
+    One ``UPDATE`` that only writes tags whose count moved. Returns how many
+    changed. Does NOT commit.
+    """
+    counted = (
+        select(func.count())
+        .select_from(PostTagLink)
+        .join(Post, col(Post.id) == col(PostTagLink.post_id))
+        .where(PostTagLink.tag_id == Tag.id, Post.published == True)  # noqa: E712
+        .scalar_subquery()
+    )
     statement = (
-        select(Tag, func.count(PostTagLink.post_id).label("post_count"))
-        .join(PostTagLink, Tag.id == PostTagLink.tag_id)
-        .join(Post, Post.id == PostTagLink.post_id)
+        update(Tag)
+        .where(col(Tag.post_count) != counted)
+        .values(post_count=counted)
+        .execution_options(synchronize_session="fetch")
     )
-    if published_only:
-        statement = statement.where(Post.published == True)  # noqa: E712
-    statement = statement.group_by(Tag.id).having(func.count(PostTagLink.post_id) > 0)
-    results = session.exec(statement).all()
-    return list(results)
+    return session.exec(statement).rowcount
+
+
+def _published_tag_counts_statement() -> Select[Tag, int]:
+    return select(Tag, Tag.post_count).where(Tag.post_count > 0).order_by(col(Tag.name))
+
+
+def get_published_tag_counts(*, session: Session) -> list[tuple[Tag, int]]:
+    """Tags with published posts and their stored ``post_count``, by name."""
+    return list(session.exec(_published_tag_counts_statement()).all())
+
+
+# ---------------------------------------------------------------------------
+# Async reads — the public pages run on ``AsyncSession`` so a slow query
+# never blocks the event loop. Same statements as the sync functions above.
+# ---------------------------------------------------------------------------
+
+
+async def get_post_by_slug_async(*, session: AsyncSession, slug: str) -> Post | None:
+    return (await session.exec(_post_by_slug_statement(slug))).first()
+
+
+async def get_posts_async(
+    *,
+    session: AsyncSession,
+    tag_slug: str | None = None,
+    published_only: bool = True,
+    skip: int = 0,
+    limit: int = 20,
+    after: PostCursor | None = None,
+    with_body: bool = False,
+) -> tuple[list[Post], bool]:
+    statement = _posts_statement(
+        tag_slug=tag_slug,
+        published_only=published_only,
+        skip=skip,
+        limit=limit,
+        after=after,
+        with_body=with_body,
+    )
+    posts = list((await session.exec(statement)).all())
+    return posts[:limit], len(posts) > limit
+
+
+async def search_posts_async(
+    *,
+    session: AsyncSession,
+    query: str,
+    published_only: bool = True,
+    limit: int = 20,
+) -> list[tuple[Post, str]]:
+    statement = _search_posts_statement(
+        query=query, published_only=published_only, limit=limit
+    )
+    return list((await session.exec(statement)).all())
+
+
+async def fuzzy_search_posts_async(
+    *, session: AsyncSession, query: str, limit: int = 20
+) -> list[Post]:
+    statement = _fuzzy_search_statement(query=query, limit=limit)
+    return list((await session.exec(statement)).all())
+
+
+async def suggest_search_term_async(*, session: AsyncSession, query: str) -> str | None:
+    return (await session.exec(_suggestion_statement(query))).first()
+
+
+async def get_published_tag_counts_async(
+    *, session: AsyncSession
+) -> list[tuple[Tag, int]]:
+    return list((await session.exec(_published_tag_counts_statement())).all())
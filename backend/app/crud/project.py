@@ -1,33 +1,70 @@
+import uuid
+from collections.abc import Sequence
 from datetime import datetime
 
-from sqlmodel import Session, col, func, select
+from sqlalchemy.orm import defer
+from sqlmodel import Session, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 
+from app.crud.bulk import (
+    bulk_upsert_by_source_path,
+    delete_by_source_paths,
+    delete_source_paths_not_in,
+)
 from app.models.base import get_datetime_utc
 from app.models.project import Project
 from app.schemas.project import ProjectUpsert
 
 
+def _projects_statement(
+    *, featured_only: bool, skip: int, limit: int
+) -> SelectOfScalar[Project]:
+    """Return the page statement behind ``get_projects`` (``limit + 1`` rows).
+
+    The project list never renders a body, so those columns are not loaded.
+    """
+    statement = select(Project).options(
+        defer(Project.content_markdown, raiseload=True),  # ty: ignore[invalid-argument-type]
+        defer(Project.content_html, raiseload=True),  # ty: ignore[invalid-argument-type]
+    )
+
+    if featured_only:
+        statement = statement.where(Project.featured == True)  # noqa: E712
+
+    return (
+        statement.order_by(
+            col(Project.sort_order).asc(), col(Project.created_at).desc()
+        )
+        .offset(skip)
+        .limit(limit + 1)
+    )
+
+
 def get_projects(
     *,
     session: Session,
     featured_only: bool = False,
     skip: int = 0,
     limit: int = 20,
-) -> tuple[list[Project], int]:
-    base = select(Project)
-    count_base = select(func.count()).select_from(Project)
+) -> tuple[list[Project], bool]:
+    """Return a page of projects and whether more follow it."""
+    statement = _projects_statement(featured_only=featured_only, skip=skip, limit=limit)
+    projects = list(session.exec(statement).all())
+    return projects[:limit], len(projects) > limit
 
-    if featured_only:
-        base = base.where(Project.featured == True)  # noqa: E712
-        count_base = count_base.where(Project.featured == True)  # noqa: E712
 
-    count = session.exec(count_base).one()
-    projects = session.exec(
-        base.order_by(col(Project.sort_order).asc(), col(Project.created_at).desc())
-        .offset(skip)
-        .limit(limit)
-    ).all()
-    return list(projects), count
+async def get_projects_async(
+    *,
+    session: AsyncSession,
+    featured_only: bool = False,
+    skip: int = 0,
+    limit: int = 20,
+) -> tuple[list[Project], bool]:
+    """``get_projects`` for the async public read path."""
+    statement = _projects_statement(featured_only=featured_only, skip=skip, limit=limit)
+    projects = list((await session.exec(statement)).all())
+    return projects[:limit], len(projects) > limit
 
 
 def get_project_by_slug(*, session: Session, slug: str) -> Project | None:
@@ -35,31 +72,68 @@ def get_project_by_slug(*, session: Session, slug: str) -> Project | None:
     return session.exec(statement).first()
 
 
+def get_project_by_source_path(*, session: Session, source_path: str) -> Project | None:
+    statement = select(Project).where(Project.source_path == source_path)
+    return session.exec(statement).first()
+
+
+def get_project_source_hashes(*, session: Session) -> dict[str, str | None]:
+    """Return ``{source_path: source_hash}`` for every file-backed project."""
+    statement = select(Project.source_path, Project.source_hash).where(
+        Project.source_path.is_not(None)  # type: ignore[union-attr]
+    )
+    return dict(session.exec(statement).all())
+
+
 def upsert_project(
-    *, session: Session, source_path: str, data: ProjectUpsert
+    *,
+    session: Session,
+    source_path: str,
+    data: ProjectUpsert,
+    source_hash: str | None = None,
 ) -> Project:
-    statement = select(Project).where(Project.source_path == source_path)
-    existing = session.exec(statement).first()
+    existing = get_project_by_source_path(session=session, source_path=source_path)
     if existing:
         update_dict = data.model_dump()
         changed = any(
             getattr(existing, field) != value for field, value in update_dict.items()
         )
         if not changed:
+            if existing.source_hash != source_hash:
+                existing.source_hash = source_hash
+                session.add(existing)
+                session.flush()
             return existing
         existing.sqlmodel_update(update_dict)
+        existing.source_hash = source_hash
         existing.updated_at = get_datetime_utc()
         session.add(existing)
         session.flush()
         session.refresh(existing)
         return existing
-    project = Project(source_path=source_path, **data.model_dump())
+    project = Project(
+        source_path=source_path, source_hash=source_hash, **data.model_dump()
+    )
     session.add(project)
     session.flush()
     session.refresh(project)
     return project
 
 
+def bulk_upsert_projects(
+    *, session: Session, rows: Sequence[tuple[str, ProjectUpsert, str | None]]
+) -> tuple[dict[str, uuid.UUID], dict[str, str]]:
+    """Batched ``upsert_project`` for ``(source_path, data, source_hash)`` rows.
+
+    See ``crud.bulk.bulk_upsert_by_source_path`` for the return value.
+    """
+    return bulk_upsert_by_source_path(
+        session=session,
+        table=Project.__table__,  # ty: ignore[unresolved-attribute]
+        rows=rows,
+    )
+
+
 def update_github_metadata(
     *,
     session: Session,
@@ -81,15 +155,82 @@ def update_github_metadata(
     session.flush()
 
 
+def claim_projects_for_github_refresh(
+    *,
+    session: Session,
+    fetched_before: datetime,
+    claimed_before: datetime,
+    now: datetime,
+) -> list[Project]:
+    """Claim projects whose GitHub metadata is missing or older than ``fetched_before``.
+
+    Projects claimed since ``claimed_before`` are left to their claimant.
+    The selected rows are locked with ``SKIP LOCKED`` only until the caller
+    commits the claim, so concurrent refreshers (one per app worker) split
+    the work without holding locks while they call GitHub.
+
+    Does NOT commit — the caller owns the transaction boundary.
+    """
+    fetched_at = col(Project.github_fetched_at)
+    claimed_at = col(Project.github_refresh_claimed_at)
+    statement = (
+        select(Project)
+        .where(
+            col(Project.repo_url).is_not(None),
+            fetched_at.is_(None) | (fetched_at < fetched_before),
+            claimed_at.is_(None) | (claimed_at < claimed_before),
+        )
+        .with_for_update(skip_locked=True)
+    )
+    projects = list(session.exec(statement).all())
+    for project in projects:
+        project.github_refresh_claimed_at = now
+        session.add(project)
+    session.flush()
+    return projects
+
+
+def release_github_refresh_claims(
+    *, session: Session, projects: Sequence[Project]
+) -> None:
+    """Clear the refresh claims taken by ``claim_projects_for_github_refresh``.
+
+    Does NOT commit — the caller owns the transaction boundary.
+    """
+    for project in projects:
+        project.github_refresh_claimed_at = None
+        session.add(project)
+    session.flush()
+
+
+def update_github_cache_state(
+    *,
+    session: Session,
+    project: Project,
+    etag: str | None,
+    last_modified: str | None,
+    fetched_at: datetime,
+) -> None:
+    """Record the HTTP validators and fetch time of a GitHub metadata request.
+
+    Does NOT commit — the caller owns the transaction boundary.
+    """
+    project.github_etag = etag
+    project.github_last_modified = last_modified
+    project.github_fetched_at = fetched_at
+    session.add(project)
+    session.flush()
+
+
+def delete_projects_by_source_paths(*, session: Session, source_paths: set[str]) -> int:
+    """Delete projects with the given source paths. Returns count deleted."""
+    return delete_by_source_paths(
+        session=session, model=Project, source_paths=source_paths
+    )
+
+
 def delete_projects_not_in(*, session: Session, source_paths: set[str]) -> int:
     """Delete projects whose source_path is not in the given set. Returns count deleted."""
-    statement = select(Project).where(Project.source_path.is_not(None))  # type: ignore[union-attr]
-    all_projects = session.exec(statement).all()
-    deleted = 0
-    for project in all_projects:
-        if project.source_path not in source_paths:
-            session.delete(project)
-            deleted += 1
-    if deleted:
-        session.flush()
-    return deleted
+    return delete_source_paths_not_in(
+        session=session, model=Project, source_paths=source_paths
+    )
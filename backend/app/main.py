@@ -1,17 +1,22 @@
+import asyncio
 from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+from datetime import timedelta
+from pathlib import Path
 
 import structlog
 from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
 from fastapi.routing import APIRoute
 from fastapi.staticfiles import StaticFiles
+from sqlmodel import Session
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 
 from app.api.main import api_router
+from app.content.static_search_index import STATIC_INDEX_URL
 from app.core.config import settings
-from app.core.db import engine
+from app.core.db import async_engine, engine
 from app.core.exception_handlers import register_exception_handlers
 from app.core.logging import setup_logging
 from app.core.middleware import (
@@ -21,8 +26,21 @@ from app.core.middleware import (
     TraceIdMiddleware,
 )
 from app.core.observability import setup_observability
+from app.core.page_cache import (
+    PageCacheMiddleware,
+    bump_content_version,
+    configure_content_version,
+)
 from app.core.rate_limit import limiter
+from app.core.static import ImmutableStaticFiles
+from app.pages.deps import INLINE_SCRIPT_HASHES
 from app.pages.router import pages_router
+from app.services.content_sync import (
+    configure_renderer,
+    configure_search,
+    static_search_index_dir,
+)
+from app.services.project import refresh_github_metadata
 
 # 1. Structured logging — must be first so all subsequent logs are formatted
 setup_logging(
@@ -33,14 +51,59 @@ setup_logging(
 logger = structlog.get_logger(__name__)
 
 
+def _refresh_github_metadata() -> None:
+    with Session(engine) as session:
+        try:
+            refreshed = refresh_github_metadata(
+                session=session,
+                ttl=timedelta(seconds=settings.GITHUB_METADATA_TTL_SECONDS),
+                token=settings.GITHUB_TOKEN.get_secret_value(),
+            )
+            session.commit()
+        except Exception:
+            session.rollback()
+            logger.warning("github_refresh_failed", exc_info=True)
+            return
+    if refreshed:
+        logger.info("github_refresh_complete", refreshed=refreshed)
+        bump_content_version()  # project cards show the refreshed metadata
+
+
+async def _github_refresh_loop(interval: int) -> None:
+    """Keep project GitHub metadata fresh, off the request and sync paths.
+
+    Every worker runs this loop; projects are claimed in short transactions
+    (see ``refresh_github_metadata``), so workers split the due projects.
+    """
+    while True:
+        await asyncio.to_thread(_refresh_github_metadata)
+        await asyncio.sleep(interval)
+
+
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    # --- Startup ---
+    configure_renderer()
+    configure_search()
+    configure_content_version(
+        Path(settings.CONTENT_VERSION_PATH) if settings.CONTENT_VERSION_PATH else None
+    )
+    refresh_task = None
+    if settings.GITHUB_REFRESH_INTERVAL_SECONDS > 0:
+        refresh_task = asyncio.create_task(
+            _github_refresh_loop(settings.GITHUB_REFRESH_INTERVAL_SECONDS)
+        )
     yield
     # --- Shutdown ---
     logger.info("shutdown_started")
+    if refresh_task is not None:
+        refresh_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await refresh_task
     if settings.OTEL_ENABLED:
         _shutdown_otel()
     engine.dispose()
+    await async_engine.dispose()
     logger.info("shutdown_complete")
 
 
@@ -84,8 +147,18 @@ register_exception_handlers(app)
 app.state.limiter = limiter
 
 # 4. Middleware — last-added runs first, so add order is:
-#    Metrics → RequestLogging → TraceId → CORS → TrustedHost → SecurityHeaders
-#    Execution order: SecurityHeaders → TrustedHost → CORS → TraceId → RequestLogging → Metrics
+#    PageCache → Metrics → RequestLogging → TraceId → CORS → TrustedHost → SecurityHeaders
+#    Execution order: SecurityHeaders → TrustedHost → CORS → TraceId → RequestLogging → Metrics → PageCache
+#    PageCache runs last so cache hits are still logged and measured, and
+#    after SecurityHeaders has chosen the request's CSP nonce (CSP_MODE=nonce).
+if settings.PAGE_CACHE_MAX_MB > 0:
+    app.add_middleware(
+        PageCacheMiddleware,  # type: ignore[arg-type]
+        routes=pages_router.routes,
+        max_bytes=settings.PAGE_CACHE_MAX_MB * 1024 * 1024,
+        exclude={"/search"},
+        query_params={"tag", "after", "skip"},  # the blog index's filters
+    )
 app.add_middleware(MetricsMiddleware)  # type: ignore[arg-type]
 app.add_middleware(RequestLoggingMiddleware)  # type: ignore[arg-type]
 app.add_middleware(TraceIdMiddleware)  # type: ignore[arg-type]
@@ -102,7 +175,10 @@ if settings.ENVIRONMENT != "local":
         TrustedHostMiddleware,  # type: ignore[arg-type]
         allowed_hosts=[settings.DOMAIN, f"www.{settings.DOMAIN}", "localhost"],
     )
-app.add_middleware(SecurityHeadersMiddleware)  # type: ignore[arg-type]
+app.add_middleware(
+    SecurityHeadersMiddleware,  # type: ignore[arg-type]
+    script_hashes=INLINE_SCRIPT_HASHES,
+)
 
 # 5. OpenTelemetry (no-op if OTEL_ENABLED=false)
 setup_observability(app)
@@ -117,4 +193,9 @@ async def favicon() -> RedirectResponse:
     return RedirectResponse(url="/static/favicon.svg", status_code=301)
 
 
+app.mount(
+    STATIC_INDEX_URL,
+    ImmutableStaticFiles(directory=static_search_index_dir(), check_dir=False),
+    name="static-search",
+)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
@@ -1,7 +1,9 @@
 import uuid
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import DateTime, Text
+from sqlalchemy import DateTime, Index, Text, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.models.base import get_datetime_utc
@@ -17,9 +19,23 @@ class PostTagLink(SQLModel, table=True):
 
 
 class Tag(SQLModel, table=True):
+    __table_args__ = (
+        # Fuzzy search-as-you-type (pg_trgm): substring, typo and prefix
+        # matches on tag names.
+        Index(
+            "ix_tag_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     name: str = Field(max_length=100, unique=True)
     slug: str = Field(max_length=100, unique=True, index=True)
+    # Published posts carrying this tag, recomputed by content sync (see
+    # ``crud.post.refresh_tag_post_counts``) so the tag cloud needs no join.
+    post_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     created_at: datetime | None = Field(
         default_factory=get_datetime_utc,
         sa_type=DateTime(timezone=True),  # type: ignore[arg-type]
@@ -28,18 +44,52 @@ class Tag(SQLModel, table=True):
 
 
 class Post(SQLModel, table=True):
+    __table_args__ = (
+        # Published feed order, newest first with undated posts last. Must
+        # match ``crud.post.post_feed_key`` so keyset pages of the blog list
+        # are a single range scan of this index.
+        Index(
+            "ix_post_published_feed",
+            text("coalesce(published_at, '0001-01-01 00:00:00+00'::timestamptz) DESC"),
+            text("id DESC"),
+            postgresql_where=text("published"),
+        ),
+        Index("ix_post_search_vector", "search_vector", postgresql_using="gin"),
+        # Fuzzy search-as-you-type over published titles (pg_trgm).
+        Index(
+            "ix_post_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_where=text("published"),
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     title: str = Field(max_length=255)
     slug: str = Field(max_length=255, unique=True, index=True)
     excerpt: str | None = Field(default=None, max_length=500)
     content_markdown: str = Field(sa_type=Text)
     content_html: str = Field(sa_type=Text)
+    # Table of contents computed at sync time: [{"level", "id", "text"}, ...]
+    toc: list[dict[str, Any]] = Field(
+        default_factory=list,
+        sa_type=JSONB,  # type: ignore[arg-type]
+        sa_column_kwargs={"server_default": "[]"},
+    )
+    # Weighted full-text document (title > tags > excerpt > body), written by
+    # content sync — see ``crud.post.refresh_post_search_vectors``.
+    search_vector: str | None = Field(
+        default=None,
+        sa_type=TSVECTOR,  # type: ignore[arg-type]
+    )
     published: bool = Field(default=False)
     published_at: datetime | None = Field(
         default=None,
         sa_type=DateTime(timezone=True),  # type: ignore[arg-type]
     )
     source_path: str | None = Field(default=None, max_length=500, unique=True)
+    source_hash: str | None = Field(default=None, max_length=64)
     created_at: datetime | None = Field(
         default_factory=get_datetime_utc,
         sa_type=DateTime(timezone=True),  # type: ignore[arg-type]
@@ -19,6 +19,7 @@ class Project(SQLModel, table=True):
     featured: bool = Field(default=False)
     sort_order: int = Field(default=0)
     source_path: str | None = Field(default=None, max_length=500, unique=True)
+    source_hash: str | None = Field(default=None, max_length=64)
     created_at: datetime | None = Field(
         default_factory=get_datetime_utc,
         sa_type=DateTime(timezone=True),  # type: ignore[arg-type]
@@ -34,3 +35,15 @@ class Project(SQLModel, table=True):
         default=None,
         sa_type=DateTime(timezone=True),  # type: ignore[arg-type]
     )
+    # HTTP cache validators and time of the last successful metadata fetch
+    github_etag: str | None = Field(default=None, max_length=255)
+    github_last_modified: str | None = Field(default=None, max_length=64)
+    github_fetched_at: datetime | None = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),  # type: ignore[arg-type]
+    )
+    # Set while a refresher is fetching this project's metadata
+    github_refresh_claimed_at: datetime | None = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),  # type: ignore[arg-type]
+    )
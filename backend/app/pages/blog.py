@@ -1,7 +1,9 @@
+from urllib.parse import urlencode
+
 from fastapi import APIRouter, Request
 from fastapi.responses import Response
 
-from app.api.deps import SessionDep
+from app.api.deps import AsyncSessionDep
 from app.pages.deps import is_htmx_request, templates
 from app.services import blog as blog_service
 
@@ -9,14 +11,14 @@ router = APIRouter()
 
 
 @router.get("/")
-async def home(request: Request, session: SessionDep):
-    posts, count = blog_service.list_published_posts(session=session, limit=5)
+async def home(request: Request, session: AsyncSessionDep):
+    posts, has_more = await blog_service.list_published_posts(session=session, limit=5)
     return templates.TemplateResponse(
         request,
         "pages/home.html",
         {
             "posts": posts,
-            "has_more": count > 5,
+            "has_more": has_more,
         },
     )
 
@@ -24,21 +26,30 @@ async def home(request: Request, session: SessionDep):
 @router.get("/blog")
 async def blog_list(
     request: Request,
-    session: SessionDep,
+    session: AsyncSessionDep,
     tag: str | None = None,
+    after: str | None = None,
     skip: int = 0,
 ):
+    # ``after`` is the keyset cursor every "Load more" link carries; ``skip``
+    # is kept so old offset links still resolve.
     limit = 10
-    posts, count = blog_service.list_published_posts(
+    cursor = blog_service.decode_cursor(after) if after else None
+    if cursor is not None:
+        skip = 0
+    posts, has_more = await blog_service.list_published_posts(
         session=session,
         tag_slug=tag,
         skip=skip,
         limit=limit,
+        after=cursor,
     )
-    has_more = (skip + limit) < count
-    next_url = f"/blog?skip={skip + limit}"
-    if tag:
-        next_url += f"&tag={tag}"
+    next_url = None
+    if has_more:
+        params = {"after": blog_service.encode_cursor(posts[-1])}
+        if tag:
+            params["tag"] = tag
+        next_url = f"/blog?{urlencode(params)}"
 
     context = {
         "posts": posts,
@@ -52,15 +63,32 @@ async def blog_list(
             request, "pages/blog_list_partial.html", context
         )
 
-    tags = blog_service.list_tags(session=session)
+    tags = await blog_service.list_tags(session=session)
     context["tags"] = tags
     return templates.TemplateResponse(request, "pages/blog_list.html", context)
 
 
 @router.get("/search")
-async def search(request: Request, session: SessionDep, q: str = ""):
-    results = blog_service.search_published_posts(session=session, query=q, limit=20)
-    context = {"request": request, "posts": results, "query": q}
+async def search(
+    request: Request, session: AsyncSessionDep, q: str = "", fuzzy: bool = False
+):
+    suggestion = None
+    if fuzzy:
+        results = await blog_service.fuzzy_search_published_posts(
+            session=session, query=q, limit=20
+        )
+        if not results:
+            suggestion = await blog_service.suggest_query(session=session, query=q)
+    else:
+        results = await blog_service.search_published_posts(
+            session=session, query=q, limit=20
+        )
+    context = {
+        "request": request,
+        "results": results,
+        "query": q,
+        "suggestion": suggestion,
+    }
     if is_htmx_request(request) and not request.headers.get("HX-Boosted"):
         return templates.TemplateResponse(
             request, "pages/search_results_partial.html", context
@@ -69,16 +97,18 @@ async def search(request: Request, session: SessionDep, q: str = ""):
 
 
 @router.get("/blog/{slug}.md")
-async def blog_detail_md(slug: str, session: SessionDep):
-    post = blog_service.get_published_post(session=session, slug=slug)
+async def blog_detail_md(slug: str, session: AsyncSessionDep):
+    post = await blog_service.get_published_post(session=session, slug=slug)
     return Response(
         content=post.content_markdown, media_type="text/markdown; charset=utf-8"
     )
 
 
 @router.get("/blog/{slug}")
-async def blog_detail(request: Request, session: SessionDep, slug: str):
-    post, toc = blog_service.get_published_post_with_toc(session=session, slug=slug)
+async def blog_detail(request: Request, session: AsyncSessionDep, slug: str):
+    post, toc = await blog_service.get_published_post_with_toc(
+        session=session, slug=slug
+    )
     context = {"post": post, "toc": toc}
     if toc and len(toc) > 1:
         context["page_islands"] = ["TableOfContents"]
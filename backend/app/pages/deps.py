@@ -4,11 +4,16 @@ from pathlib import Path
 
 from fastapi import Request
 from fastapi.templating import Jinja2Templates
+from starlette.convertors import Convertor, register_url_convertor
 
+from app.content.static_search_index import static_search_index_url
 from app.core.config import settings
+from app.core.csp import inline_script_hashes
 
 _TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
 templates = Jinja2Templates(directory=str(_TEMPLATE_DIR))
+# CSP hashes of the templates' inline scripts, for SecurityHeadersMiddleware.
+INLINE_SCRIPT_HASHES = inline_script_hashes(templates.env)
 
 templates.env.globals.update(
     {
@@ -25,6 +30,7 @@ templates.env.globals.update(
         "umami_website_id": settings.UMAMI_WEBSITE_ID,
         "current_year": datetime.now(UTC).year,
         "global_islands": ["SearchDialog"],
+        "static_search_index_url": static_search_index_url,
     }
 )
 
@@ -51,3 +57,23 @@ def content_dir() -> Path:
     if not path.is_absolute():
         path = Path(__file__).resolve().parents[3] / path
     return path
+
+
+class _PageSlugConvertor(Convertor[str]):
+    """Path segment that looks like a page slug.
+
+    Lets a root-level ``/{slug:page_slug}`` route coexist with ``/robots.txt``,
+    ``/favicon.ico`` and friends: non-matching paths fall through to the
+    routes registered after it instead of failing validation.
+    """
+
+    regex = "[a-z0-9]+(?:-[a-z0-9]+)*"
+
+    def convert(self, value: str) -> str:
+        return value
+
+    def to_string(self, value: str) -> str:
+        return value
+
+
+register_url_convertor("page_slug", _PageSlugConvertor())
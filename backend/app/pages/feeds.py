@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Request
 from fastapi.responses import Response
 
-from app.api.deps import SessionDep
+from app.api.deps import AsyncSessionDep
 from app.pages.deps import templates
 from app.services import blog as blog_service
 from app.services import portfolio as portfolio_service
@@ -10,8 +10,8 @@ router = APIRouter()
 
 
 @router.get("/feed.xml")
-async def rss_feed(request: Request, session: SessionDep):
-    posts, _ = blog_service.list_published_posts(session=session, limit=50)
+async def rss_feed(request: Request, session: AsyncSessionDep):
+    posts, _ = await blog_service.list_published_posts(session=session, limit=50)
     base_url = str(request.base_url)
     return templates.TemplateResponse(
         request,
@@ -22,9 +22,9 @@ async def rss_feed(request: Request, session: SessionDep):
 
 
 @router.get("/sitemap.xml")
-async def sitemap(request: Request, session: SessionDep):
-    posts, _ = blog_service.list_published_posts(session=session, limit=1000)
-    projects, _ = portfolio_service.list_projects(session=session, limit=1000)
+async def sitemap(request: Request, session: AsyncSessionDep):
+    posts, _ = await blog_service.list_published_posts(session=session, limit=1000)
+    projects, _ = await portfolio_service.list_projects(session=session, limit=1000)
     base_url = str(request.base_url)
     return templates.TemplateResponse(
         request,
@@ -35,9 +35,9 @@ async def sitemap(request: Request, session: SessionDep):
 
 
 @router.get("/llms.txt")
-async def llms_txt(request: Request, session: SessionDep):
-    posts, _ = blog_service.list_published_posts(session=session, limit=1000)
-    projects, _ = portfolio_service.list_projects(session=session, limit=1000)
+async def llms_txt(request: Request, session: AsyncSessionDep):
+    posts, _ = await blog_service.list_published_posts(session=session, limit=1000)
+    projects, _ = await portfolio_service.list_projects(session=session, limit=1000)
     base_url = str(request.base_url)
     return templates.TemplateResponse(
         request,
@@ -48,8 +48,10 @@ async def llms_txt(request: Request, session: SessionDep):
 
 
 @router.get("/llms-full.txt")
-async def llms_full_txt(request: Request, session: SessionDep):
-    posts, _ = blog_service.list_published_posts(session=session, limit=1000)
+async def llms_full_txt(request: Request, session: AsyncSessionDep):
+    posts, _ = await blog_service.list_published_posts(
+        session=session, limit=1000, with_body=True
+    )
     base_url = str(request.base_url)
     return templates.TemplateResponse(
         request,
@@ -1,15 +1,18 @@
 from fastapi import APIRouter, Request
 
-from app.api.deps import SessionDep
+from app.api.deps import AsyncSessionDep
 from app.pages.deps import content_dir, templates
 from app.services import portfolio as portfolio_service
 
 router = APIRouter()
+# Catch-all for any other page in content/pages; included after every other
+# pages router so it never shadows a concrete route.
+page_router = APIRouter()
 
 
 @router.get("/projects")
-async def projects(request: Request, session: SessionDep):
-    project_list, count = portfolio_service.list_projects(session=session, limit=50)
+async def projects(request: Request, session: AsyncSessionDep):
+    project_list, _ = await portfolio_service.list_projects(session=session, limit=50)
     return templates.TemplateResponse(
         request,
         "pages/projects.html",
@@ -35,3 +38,13 @@ async def privacy(request: Request):
         "pages/privacy.html",
         {"page": page},
     )
+
+
+@page_router.get("/{slug:page_slug}")
+async def static_page(request: Request, slug: str):
+    page = portfolio_service.get_page(content_dir=content_dir(), slug=slug)
+    return templates.TemplateResponse(
+        request,
+        "pages/page.html",
+        {"page": page},
+    )
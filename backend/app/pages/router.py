@@ -6,3 +6,4 @@ pages_router = APIRouter(include_in_schema=False)
 pages_router.include_router(blog.router)
 pages_router.include_router(portfolio.router)
 pages_router.include_router(feeds.router)
+pages_router.include_router(portfolio.page_router)
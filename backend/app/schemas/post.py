@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime
+from typing import Any
 
 from pydantic import BaseModel, ConfigDict
 from sqlmodel import Field, SQLModel
@@ -11,6 +12,7 @@ class PostUpsert(SQLModel):
     excerpt: str | None = Field(default=None, max_length=500)
     content_markdown: str
     content_html: str
+    toc: list[dict[str, Any]] = []
     published: bool = False
     published_at: datetime | None = None
 
@@ -1,48 +1,155 @@
-from sqlmodel import Session
+import uuid
+from datetime import UTC, datetime, timedelta
 
-from app.content.renderer import TocEntry, extract_toc
-from app.core.exceptions import NotFoundError
+from markupsafe import Markup, escape
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.content.renderer import TocEntry
+from app.content.search_index import IndexedPost, get_search_index
+from app.core.exceptions import BadRequestError, NotFoundError
 from app.crud.post import (
-    get_post_by_slug,
-    get_posts,
-    get_tags_with_counts,
-    search_posts,
+    SNIPPET_END,
+    SNIPPET_START,
+    PostCursor,
+    fuzzy_search_posts_async,
+    get_post_by_slug_async,
+    get_posts_async,
+    get_published_tag_counts_async,
+    search_posts_async,
+    suggest_search_term_async,
 )
 from app.models.post import Post, Tag
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def encode_cursor(post: Post) -> str:
+    """Return the URL-safe ``after`` token for the feed position after ``post``."""
+    cursor = PostCursor.after(post)
+    return f"{(cursor.published_at - _EPOCH) // _MICROSECOND}.{cursor.id.hex}"
+
+
+def decode_cursor(token: str) -> PostCursor:
+    """Parse an ``encode_cursor`` token. Raises BadRequestError if malformed."""
+    try:
+        micros, _, post_id = token.partition(".")
+        published_at = _EPOCH + int(micros) * _MICROSECOND
+        return PostCursor(published_at, uuid.UUID(hex=post_id))
+    except (ValueError, OverflowError) as exc:
+        raise BadRequestError("Invalid pagination cursor") from exc
+
 
-def list_published_posts(
-    *, session: Session, tag_slug: str | None = None, skip: int = 0, limit: int = 20
-) -> tuple[list[Post], int]:
-    return get_posts(
-        session=session, tag_slug=tag_slug, published_only=True, skip=skip, limit=limit
+async def list_published_posts(
+    *,
+    session: AsyncSession,
+    tag_slug: str | None = None,
+    skip: int = 0,
+    limit: int = 20,
+    after: PostCursor | None = None,
+    with_body: bool = False,
+) -> tuple[list[Post], bool]:
+    """Return a page of published posts and whether more follow it.
+
+    Pages after the first should pass ``after`` (see ``encode_cursor``) rather
+    than ``skip``: each page is then an index range scan, however deep. Post
+    bodies are only loaded with ``with_body``.
+    """
+    return await get_posts_async(
+        session=session,
+        tag_slug=tag_slug,
+        published_only=True,
+        skip=skip,
+        limit=limit,
+        after=after,
+        with_body=with_body,
     )
 
 
-def get_published_post(*, session: Session, slug: str) -> Post:
-    post = get_post_by_slug(session=session, slug=slug)
+async def get_published_post(*, session: AsyncSession, slug: str) -> Post:
+    post = await get_post_by_slug_async(session=session, slug=slug)
     if not post or not post.published:
         raise NotFoundError("Post", slug)
     return post
 
 
-def get_published_post_with_toc(
-    *, session: Session, slug: str
+async def get_published_post_with_toc(
+    *, session: AsyncSession, slug: str
 ) -> tuple[Post, list[TocEntry]]:
-    post = get_published_post(session=session, slug=slug)
-    toc = extract_toc(post.content_html)
-    return post, toc
+    """Return a published post and its table of contents, stored at sync time."""
+    post = await get_published_post(session=session, slug=slug)
+    return post, [TocEntry(**entry) for entry in post.toc]
+
+
+async def list_tags(*, session: AsyncSession) -> list[tuple[Tag, int]]:
+    """Tags with published posts and their counts, as of the last content sync."""
+    return await get_published_tag_counts_async(session=session)
+
+
+def highlight_snippet(snippet: str) -> Markup:
+    """Escape a search snippet and mark its matched terms with ``<mark>``."""
+    escaped = str(escape(snippet))
+    return Markup(
+        escaped.replace(SNIPPET_START, "<mark>").replace(SNIPPET_END, "</mark>")
+    )
+
 
+def _search_index_hits(
+    *, query: str, limit: int
+) -> list[tuple[Post | IndexedPost, Markup]] | None:
+    """Hits from the in-memory search index, or None when none is published."""
+    index = get_search_index()
+    if index is None:
+        return None
+    return [
+        (hit.post, highlight_snippet(index.snippet(hit, SNIPPET_START, SNIPPET_END)))
+        for hit in index.search(query, limit=limit)
+    ]
 
-def list_tags(*, session: Session) -> list[tuple[Tag, int]]:
-    return get_tags_with_counts(session=session, published_only=True)
 
+async def search_published_posts(
+    *, session: AsyncSession, query: str, limit: int = 20
+) -> list[tuple[Post | IndexedPost, Markup]]:
+    """Return ``(post, highlighted snippet)`` pairs ranked by relevance.
 
-def search_published_posts(
-    *, session: Session, query: str, limit: int = 20
-) -> list[Post]:
+    Answered from the in-memory search index when content sync has published
+    one — without using ``session`` — and by Postgres full-text search
+    otherwise. Either way snippets come from the excerpt and body.
+    """
     if not query or not query.strip():
         return []
-    return search_posts(
+    indexed = _search_index_hits(query=query, limit=limit)
+    if indexed is not None:
+        return indexed
+    hits = await search_posts_async(
         session=session, query=query.strip(), published_only=True, limit=limit
     )
+    return [(post, highlight_snippet(snippet)) for post, snippet in hits]
+
+
+async def fuzzy_search_published_posts(
+    *, session: AsyncSession, query: str, limit: int = 20
+) -> list[tuple[Post | IndexedPost, Markup]]:
+    """Typo-tolerant title and tag matches, for search-as-you-type.
+
+    A query the in-memory search index matches (its last word as a prefix)
+    is answered from the index, so keystrokes do not reach Postgres; only
+    queries it misses, such as typos, run the trigram search. Trigram hits
+    carry no snippet, so cards fall back to the post excerpt.
+    """
+    if not query or not query.strip():
+        return []
+    indexed = _search_index_hits(query=query, limit=limit)
+    if indexed:
+        return indexed
+    posts = await fuzzy_search_posts_async(
+        session=session, query=query.strip(), limit=limit
+    )
+    return [(post, Markup()) for post in posts]
+
+
+async def suggest_query(*, session: AsyncSession, query: str) -> str | None:
+    """Closest published tag or title to a query that matched nothing."""
+    if not query or not query.strip():
+        return None
+    return await suggest_search_term_async(session=session, query=query.strip())
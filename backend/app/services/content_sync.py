@@ -1,29 +1,203 @@
 """Content sync service — orchestrates loading Markdown and persisting to DB.
 
 Owns transaction boundaries: commits per file so one failure doesn't abort
-the entire sync. Handles orphan cleanup for deleted Markdown files.
+the entire sync, or — in bulk mode — writes all changed files with batched
+upserts that report per-row failures. Files whose source fingerprint matches
+the stored one are skipped before parsing; the rest can be parsed in a
+process pool. Handles orphan cleanup for deleted Markdown files.
 """
 
+from collections.abc import Collection, Iterable
+from datetime import UTC, datetime
 from pathlib import Path
 
 import structlog
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session
 
-from app.content.loader import load_post, load_project
+from app.content.highlight_cache import HighlightCache
+from app.content.loader import (
+    ParsedPost,
+    ParsedProject,
+    SourceFile,
+    load_post_files,
+    load_project_files,
+    read_source,
+    scan_post_files,
+    scan_project_files,
+)
+from app.content.renderer import (
+    configure_highlight_cache,
+    get_highlight_cache,
+    preload_lexers,
+)
+from app.content.search_index import (
+    IndexedDocument,
+    IndexedPost,
+    IndexedTag,
+    SearchIndex,
+    analyse,
+    configure_search_index,
+    get_search_index,
+    get_search_index_file,
+)
+from app.content.static_search_index import (
+    STATIC_INDEX_DIR,
+    build_static_index,
+    configure_static_search_index,
+    get_static_search_index_dir,
+)
 from app.core.config import settings
 from app.core.exceptions import ContentSyncError
-from app.crud.post import delete_posts_not_in
-from app.crud.project import delete_projects_not_in
-from app.services.post import sync_post_from_content
+from app.core.page_cache import bump_content_version
+from app.crud.bulk import SLUG_CONFLICT
+from app.crud.post import (
+    delete_posts_by_source_paths,
+    delete_posts_not_in,
+    get_post_source_hashes,
+    get_published_posts_for_index,
+    refresh_post_search_vectors,
+    refresh_tag_post_counts,
+)
+from app.crud.project import (
+    delete_projects_by_source_paths,
+    delete_projects_not_in,
+    get_project_source_hashes,
+)
+from app.models.post import Post
+from app.services.post import sync_post_from_content, sync_posts_from_content
 from app.services.project import (
-    enrich_project_github_metadata,
     sync_project_from_content,
+    sync_projects_from_content,
 )
 
 logger = structlog.stdlib.get_logger(__name__)
 
 
+def configure_renderer() -> None:
+    """Apply renderer settings: preload lexers and attach the highlight cache."""
+    preload_lexers(settings.CONTENT_PRELOAD_LEXERS)
+    if settings.HIGHLIGHT_CACHE_DIR:
+        configure_highlight_cache(
+            HighlightCache(
+                Path(settings.HIGHLIGHT_CACHE_DIR),
+                max_bytes=settings.HIGHLIGHT_CACHE_MAX_MB * 1024 * 1024,
+            )
+        )
+
+
+def static_search_index_dir() -> Path:
+    """Directory the static search index is published to and served from."""
+    if settings.SEARCH_STATIC_INDEX_DIR:
+        return Path(settings.SEARCH_STATIC_INDEX_DIR)
+    return STATIC_INDEX_DIR
+
+
+def configure_search() -> None:
+    """Point search at the published index files and load the server's one."""
+    configure_static_search_index(
+        static_search_index_dir() if settings.SEARCH_STATIC_INDEX else None
+    )
+    if not settings.SEARCH_INDEX_PATH:
+        configure_search_index(None)
+        return
+    configure_search_index(Path(settings.SEARCH_INDEX_PATH))
+    index = get_search_index()
+    if index is None:
+        logger.info("search_index_missing", path=settings.SEARCH_INDEX_PATH)
+    else:
+        logger.info("search_index_loaded", posts=len(index))
+
+
+# Published posts as analysed for the last index publish, by source path (or
+# id, for posts without one). Kept for the life of the process so a watch
+# batch re-reads and re-analyses only the posts it touched.
+_index_documents: dict[str, IndexedDocument] | None = None
+_UNDATED = datetime.min.replace(tzinfo=UTC)
+
+
+def _index_document(post: Post) -> tuple[str, IndexedDocument]:
+    indexed = IndexedPost(
+        id=post.id,
+        slug=post.slug,
+        title=post.title,
+        excerpt=post.excerpt,
+        published_at=post.published_at,
+        tags=tuple(IndexedTag(slug=tag.slug, name=tag.name) for tag in post.tags),
+    )
+    return post.source_path or post.id.hex, analyse(indexed, post.content_markdown)
+
+
+def publish_search_index(
+    *, session: Session, source_paths: Collection[str] | None = None
+) -> int | None:
+    """Rebuild the search indexes from published posts and publish them.
+
+    Writes the server's in-memory index file and the client's static JSON
+    index, whichever are configured. With ``source_paths`` (a watch batch),
+    only the posts at those paths are read and analysed again; the rest are
+    reused from this process's previous publish, and everything is read
+    when there was none. Tag renames therefore reach untouched posts at the
+    next full sync.
+
+    Returns the number of posts indexed, or None when neither index is
+    configured or every write failed (search then falls back to Postgres,
+    and the island to ``/search``, until the next successful publish).
+    """
+    global _index_documents
+    index_file = get_search_index_file()
+    static_dir = get_static_search_index_dir()
+    if index_file is None and static_dir is None:
+        return None
+    if source_paths is None or _index_documents is None:
+        by_key = dict(
+            _index_document(post)
+            for post in get_published_posts_for_index(session=session)
+        )
+    else:
+        by_key = {
+            key: document
+            for key, document in _index_documents.items()
+            if key not in source_paths
+        }
+        by_key.update(
+            _index_document(post)
+            for post in get_published_posts_for_index(
+                session=session, source_paths=source_paths
+            )
+        )
+    _index_documents = by_key
+    # Feed order, newest first, as a full read returns them.
+    documents = sorted(
+        by_key.values(),
+        key=lambda document: (
+            document.post.published_at or _UNDATED,
+            document.post.id,
+        ),
+        reverse=True,
+    )
+    published = False
+    if index_file is not None:
+        try:
+            index_file.publish(SearchIndex.from_documents(documents))
+            published = True
+        except OSError:
+            logger.warning(
+                "search_index_publish_failed", path=str(index_file.path), exc_info=True
+            )
+    if static_dir is not None:
+        try:
+            static_dir.publish(build_static_index(documents))
+            published = True
+        except OSError:
+            logger.warning(
+                "static_search_index_publish_failed",
+                path=str(static_dir.directory),
+                exc_info=True,
+            )
+    return len(documents) if published else None
+
+
 def _md_files(directory: Path) -> list[Path]:
     """Return sorted .md files in directory, or empty list if dir doesn't exist."""
     if not directory.is_dir():
@@ -31,71 +205,233 @@ def _md_files(directory: Path) -> list[Path]:
     return sorted(directory.glob("*.md"))
 
 
-def sync_content(*, session: Session, content_dir: Path) -> None:
-    """Load all Markdown content and sync posts/projects into the DB.
-
-    Each file is loaded and committed independently so a single failure
-    doesn't abort the sync. Orphan records (source files that no longer
-    exist) are deleted.
+def _partition_by_fingerprint(
+    files: list[Path], content_dir: Path, stored_hashes: dict[str, str | None]
+) -> tuple[list[Path], list[SourceFile | None], list[str]]:
+    """Split files into files to load, their contents, and unchanged source paths.
 
-    Raises:
-        ContentSyncError: If content_dir does not exist.
+    Each file is read once: the bytes fingerprinted here are the ones the
+    loader parses, so the stored hash always describes what was synced.
     """
-    if not content_dir.is_dir():
-        raise ContentSyncError(f"Content directory does not exist: {content_dir}")
+    pending: list[Path] = []
+    sources: list[SourceFile | None] = []
+    unchanged: list[str] = []
+    for file_path in files:
+        source_path = file_path.relative_to(content_dir).as_posix()
+        try:
+            source: SourceFile | None = read_source(file_path)
+        except OSError:
+            source = None  # let the loader surface the error
+        if source is not None and stored_hashes.get(source_path) == source.fingerprint:
+            unchanged.append(source_path)
+        else:
+            pending.append(file_path)
+            sources.append(source)
+    return pending, sources, unchanged
+
+
+def _log_write_failures(kind: str, failures: dict[str, str]) -> None:
+    for source_path, reason in failures.items():
+        event = "sync_slug_conflict" if reason == SLUG_CONFLICT else "sync_failed"
+        logger.warning(
+            f"{kind}_{event}", source_path=Path(source_path).name, reason=reason
+        )
+
+
+def _sync_posts_bulk(*, session: Session, parsed_posts: list[ParsedPost]) -> int:
+    """Write all parsed posts in one transaction. Returns the number synced."""
+    try:
+        failures = sync_posts_from_content(session=session, parsed_posts=parsed_posts)
+        session.commit()
+    except Exception:
+        session.rollback()
+        logger.warning("post_bulk_sync_failed", count=len(parsed_posts), exc_info=True)
+        return 0
+    _log_write_failures("post", failures)
+    return len(parsed_posts) - len(failures)
+
 
-    synced_posts = 0
-    post_source_paths: set[str] = set()
-    for file_path in _md_files(content_dir / "posts"):
+def _sync_projects_bulk(
+    *, session: Session, parsed_projects: list[ParsedProject]
+) -> int:
+    """Write all parsed projects in one transaction. Returns the number synced."""
+    try:
+        failures = sync_projects_from_content(
+            session=session, parsed_projects=parsed_projects
+        )
+        session.commit()
+    except Exception:
+        session.rollback()
+        logger.warning(
+            "project_bulk_sync_failed", count=len(parsed_projects), exc_info=True
+        )
+        return 0
+    _log_write_failures("project", failures)
+    return len(parsed_projects) - len(failures)
+
+
+def _sync_post_files(
+    *,
+    session: Session,
+    content_dir: Path,
+    files: list[Path],
+    sources: list[SourceFile | None] | None = None,
+    workers: int = 1,
+    bulk: bool = False,
+) -> tuple[int, set[str]]:
+    """Load and upsert post files. Returns (synced count, loaded source paths)."""
+    parsed_posts = load_post_files(files, content_dir, workers=workers, sources=sources)
+    loaded_posts: list[ParsedPost] = []
+    for file_path, parsed_post in zip(files, parsed_posts, strict=True):
+        if isinstance(parsed_post, Exception):
+            logger.warning(
+                "post_sync_failed",
+                source_path=file_path.name,
+                exc_info=parsed_post,
+            )
+            continue
+        loaded_posts.append(parsed_post)
+    source_paths = {parsed.source_path for parsed in loaded_posts}
+
+    if bulk:
+        return _sync_posts_bulk(
+            session=session, parsed_posts=loaded_posts
+        ), source_paths
+    synced = 0
+    for parsed_post in loaded_posts:
+        source_name = Path(parsed_post.source_path).name
         try:
-            parsed = load_post(file_path, content_dir)
-            post_source_paths.add(parsed.source_path)
-            sync_post_from_content(session=session, parsed=parsed)
+            sync_post_from_content(session=session, parsed=parsed_post)
             session.commit()
-            synced_posts += 1
+            synced += 1
         except IntegrityError:
             session.rollback()
             logger.warning(
                 "post_sync_slug_conflict",
-                source_path=file_path.name,
+                source_path=source_name,
             )
         except Exception:
             session.rollback()
             logger.warning(
                 "post_sync_failed",
-                source_path=file_path.name,
+                source_path=source_name,
                 exc_info=True,
             )
+    return synced, source_paths
+
 
-    synced_projects = 0
-    enriched_projects = 0
-    project_source_paths: set[str] = set()
-    for file_path in _md_files(content_dir / "projects"):
+def _sync_project_files(
+    *,
+    session: Session,
+    content_dir: Path,
+    files: list[Path],
+    sources: list[SourceFile | None] | None = None,
+    workers: int = 1,
+    bulk: bool = False,
+) -> tuple[int, set[str]]:
+    """Load and upsert project files. Returns (synced count, loaded source paths)."""
+    parsed_projects = load_project_files(
+        files, content_dir, workers=workers, sources=sources
+    )
+    loaded_projects: list[ParsedProject] = []
+    for file_path, parsed_project in zip(files, parsed_projects, strict=True):
+        if isinstance(parsed_project, Exception):
+            logger.warning(
+                "project_sync_failed",
+                source_path=file_path.name,
+                exc_info=parsed_project,
+            )
+            continue
+        loaded_projects.append(parsed_project)
+    source_paths = {parsed.source_path for parsed in loaded_projects}
+
+    if bulk:
+        synced = _sync_projects_bulk(session=session, parsed_projects=loaded_projects)
+        return synced, source_paths
+    synced = 0
+    for parsed_project in loaded_projects:
+        source_name = Path(parsed_project.source_path).name
         try:
-            parsed = load_project(file_path, content_dir)
-            project_source_paths.add(parsed.source_path)
-            project = sync_project_from_content(session=session, parsed=parsed)
-            if enrich_project_github_metadata(
-                session=session,
-                project=project,
-                token=settings.GITHUB_TOKEN.get_secret_value(),
-            ):
-                enriched_projects += 1
+            sync_project_from_content(session=session, parsed=parsed_project)
             session.commit()
-            synced_projects += 1
+            synced += 1
         except IntegrityError:
             session.rollback()
             logger.warning(
                 "project_sync_slug_conflict",
-                source_path=file_path.name,
+                source_path=source_name,
             )
         except Exception:
             session.rollback()
             logger.warning(
                 "project_sync_failed",
-                source_path=file_path.name,
+                source_path=source_name,
                 exc_info=True,
             )
+    return synced, source_paths
+
+
+def sync_content(
+    *, session: Session, content_dir: Path, workers: int = 1, bulk: bool = False
+) -> None:
+    """Load all Markdown content and sync posts/projects into the DB.
+
+    Each file is loaded and committed independently so a single failure
+    doesn't abort the sync. With ``bulk``, changed posts and projects are
+    instead written with batched upserts in one transaction per kind; a row
+    that fails (e.g. a slug conflict) is logged and skipped without
+    affecting the others. Files whose fingerprint (see
+    ``read_source``) matches the stored ``source_hash`` are not
+    re-parsed or re-rendered. The remaining files are parsed across
+    ``workers`` processes; DB writes stay in this process. Orphan records
+    (source files that no longer exist) are deleted, then ``Tag.post_count``
+    and the search vectors of re-parsed posts are recomputed and the
+    search indexes are rebuilt (see ``publish_search_index``); finally the
+    content version is bumped so every worker drops its page cache. GitHub
+    metadata is not fetched here — see
+    ``services.project.refresh_github_metadata``.
+
+    Raises:
+        ContentSyncError: If content_dir does not exist.
+    """
+    if not content_dir.is_dir():
+        raise ContentSyncError(f"Content directory does not exist: {content_dir}")
+
+    cache = get_highlight_cache()
+    cache_hits, cache_misses = (cache.hits, cache.misses) if cache else (0, 0)
+
+    pending_posts, post_sources, unchanged_post_paths = _partition_by_fingerprint(
+        _md_files(content_dir / "posts"),
+        content_dir,
+        get_post_source_hashes(session=session),
+    )
+    synced_posts, post_source_paths = _sync_post_files(
+        session=session,
+        content_dir=content_dir,
+        files=pending_posts,
+        sources=post_sources,
+        workers=workers,
+        bulk=bulk,
+    )
+    reparsed_post_paths = set(post_source_paths)
+    post_source_paths.update(unchanged_post_paths)
+
+    pending_projects, project_sources, unchanged_project_paths = (
+        _partition_by_fingerprint(
+            _md_files(content_dir / "projects"),
+            content_dir,
+            get_project_source_hashes(session=session),
+        )
+    )
+    synced_projects, project_source_paths = _sync_project_files(
+        session=session,
+        content_dir=content_dir,
+        files=pending_projects,
+        sources=project_sources,
+        workers=workers,
+        bulk=bulk,
+    )
+    project_source_paths.update(unchanged_project_paths)
 
     # Orphan cleanup — remove DB records for deleted Markdown files.
     # Only run when the subdirectory exists; a missing subdir likely means
@@ -120,19 +456,134 @@ def sync_content(*, session: Session, content_dir: Path) -> None:
     else:
         logger.warning("orphan_cleanup_skipped", directory=str(projects_dir))
 
-    if deleted_posts or deleted_projects:
-        session.commit()
+    # Derived data last, once every post write and delete has landed.
+    retagged = refresh_tag_post_counts(session=session)
+    reindexed = refresh_post_search_vectors(
+        session=session, source_paths=reparsed_post_paths
+    )
+    session.commit()
+    indexed = publish_search_index(session=session)
+    bump_content_version()
 
     if deleted_posts:
         logger.info("orphan_posts_deleted", count=deleted_posts)
     if deleted_projects:
         logger.info("orphan_projects_deleted", count=deleted_projects)
 
+    evicted = 0
+    if cache is not None:
+        cache_hits, cache_misses = cache.hits - cache_hits, cache.misses - cache_misses
+        evicted = cache.prune()
+
     page_files = _md_files(content_dir / "pages")
     logger.info(
         "content_sync_complete",
         posts=synced_posts,
+        posts_unchanged=len(unchanged_post_paths),
         projects=synced_projects,
-        projects_enriched=enriched_projects,
+        projects_unchanged=len(unchanged_project_paths),
         pages=len(page_files),
+        highlight_cache_hits=cache_hits,
+        highlight_cache_misses=cache_misses,
+        highlight_cache_evicted=evicted,
+        tag_counts_changed=retagged,
+        search_vectors_changed=reindexed,
+        search_index_posts=indexed,
+    )
+
+
+def check_content(*, content_dir: Path) -> list[str]:
+    """Validate posts and projects from their frontmatter alone.
+
+    Reports files that would fail to load (missing title, bad YAML or dates)
+    and slugs claimed by more than one file of the same kind — the failures
+    ``sync_content`` would otherwise only discover while writing. Bodies are
+    never read or rendered, and no DB access is needed.
+
+    Returns:
+        One human-readable problem per line; empty when the content is valid.
+    """
+    problems: list[str] = []
+    for kind, scan in (("posts", scan_post_files), ("projects", scan_project_files)):
+        files = _md_files(content_dir / kind)
+        slug_owners: dict[str, str] = {}
+        for file_path, result in zip(files, scan(files, content_dir), strict=True):
+            source_path = file_path.relative_to(content_dir).as_posix()
+            if isinstance(result, Exception):
+                problems.append(f"{source_path}: {result}")
+                continue
+            owner = slug_owners.setdefault(result.slug, source_path)
+            if owner != source_path:
+                problems.append(
+                    f"{source_path}: slug '{result.slug}' already used by {owner}"
+                )
+    return problems
+
+
+def _group_by_subdir(content_dir: Path, paths: Iterable[Path]) -> dict[str, list[Path]]:
+    groups: dict[str, list[Path]] = {}
+    for path in sorted(paths):
+        if path.suffix != ".md" or path.parent.parent != content_dir:
+            continue
+        groups.setdefault(path.parent.name, []).append(path)
+    return groups
+
+
+def sync_changed_files(
+    *,
+    session: Session,
+    content_dir: Path,
+    changed: Iterable[Path],
+    deleted: Iterable[Path],
+) -> None:
+    """Sync one batch of changed and deleted Markdown files (watch mode).
+
+    Deleted files are removed by source path — no full orphan scan — before
+    changed posts and projects are re-parsed and upserted with the same
+    per-file isolation as ``sync_content``; tag counts and search vectors
+    are refreshed, the search indexes are republished with only the batch's
+    posts re-read, and the content version is bumped.
+    Pages are read from disk when requested and need no DB work.
+    """
+    content_dir = content_dir.resolve()
+    changed_by_dir = _group_by_subdir(content_dir, (p.resolve() for p in changed))
+    deleted_by_dir = _group_by_subdir(content_dir, (p.resolve() for p in deleted))
+
+    def _source_paths(paths: list[Path]) -> set[str]:
+        return {path.relative_to(content_dir).as_posix() for path in paths}
+
+    deleted_posts = delete_posts_by_source_paths(
+        session=session, source_paths=_source_paths(deleted_by_dir.get("posts", []))
+    )
+    deleted_projects = delete_projects_by_source_paths(
+        session=session,
+        source_paths=_source_paths(deleted_by_dir.get("projects", [])),
+    )
+    session.commit()
+
+    synced_posts, reparsed_post_paths = _sync_post_files(
+        session=session, content_dir=content_dir, files=changed_by_dir.get("posts", [])
+    )
+    synced_projects, _ = _sync_project_files(
+        session=session,
+        content_dir=content_dir,
+        files=changed_by_dir.get("projects", []),
+    )
+    refresh_tag_post_counts(session=session)
+    refresh_post_search_vectors(session=session, source_paths=reparsed_post_paths)
+    session.commit()
+    publish_search_index(
+        session=session,
+        source_paths=_source_paths(changed_by_dir.get("posts", []))
+        | _source_paths(deleted_by_dir.get("posts", [])),
+    )
+    bump_content_version()
+    logger.info(
+        "content_watch_synced",
+        posts=synced_posts,
+        posts_deleted=deleted_posts,
+        projects=synced_projects,
+        projects_deleted=deleted_projects,
+        pages=len(changed_by_dir.get("pages", []))
+        + len(deleted_by_dir.get("pages", [])),
     )
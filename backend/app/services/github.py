@@ -1,14 +1,24 @@
 """GitHub service — fetch repository metadata from the GitHub API."""
 
 import re
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from functools import partial
+from typing import Any
 
 import httpx
 import structlog
 
+from app.core.config import settings
+
 logger = structlog.stdlib.get_logger(__name__)
 
+# Repositories per GraphQL request; well under GitHub's node limits.
+_GRAPHQL_BATCH_SIZE = 50
+_GRAPHQL_REPO_FIELDS = "stargazerCount forkCount pushedAt primaryLanguage { name }"
+
 _GITHUB_REPO_RE = re.compile(
     r"^https?://github\.com/(?P<owner>[^/]+)/(?P<repo>[^/]+?)(?:\.git)?/?$"
 )
@@ -41,24 +51,67 @@ class GitHubRepoMeta:
     last_pushed_at: datetime | None
 
 
-def fetch_repo_metadata(repo_url: str, *, token: str = "") -> GitHubRepoMeta | None:
-    """Fetch repository metadata from the GitHub API.
+@dataclass
+class RepoValidators:
+    """HTTP cache validators stored from a previous response."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+
 
-    Returns None if the URL is not a GitHub repo URL, or on any failure
-    (non-200 status, timeout, network error). Logs warnings on failures.
+@dataclass
+class RepoFetch:
+    """Outcome of a (possibly conditional) metadata request for one repository.
+
+    ``meta`` is None when the repository was not modified or the request
+    failed; ``not_modified`` tells the two apart.
     """
-    parsed = parse_github_url(repo_url)
-    if not parsed:
-        return None
 
-    owner, repo = parsed
-    api_url = f"https://api.github.com/repos/{owner}/{repo}"
+    meta: GitHubRepoMeta | None = None
+    not_modified: bool = False
+    validators: RepoValidators | None = None
+
+
+def _api_headers(token: str) -> dict[str, str]:
     headers = {"Accept": "application/vnd.github.v3+json"}
     if token:
         headers["Authorization"] = f"Bearer {token}"
+    return headers
 
+
+def _parse_timestamp(raw: str | None) -> datetime | None:
+    if not raw:
+        return None
     try:
-        response = httpx.get(api_url, headers=headers, timeout=10.0)
+        return datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return None
+
+
+def github_client(*, token: str = "", max_connections: int = 8) -> httpx.Client:
+    """Return a pooled client for ``settings.GITHUB_API_URL``. The caller closes it."""
+    return httpx.Client(
+        base_url=settings.GITHUB_API_URL,
+        headers=_api_headers(token),
+        timeout=10.0,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+    )
+
+
+def _get_repo(
+    repo_url: str, get: Callable[[str], httpx.Response]
+) -> httpx.Response | None:
+    """GET ``/repos/{owner}/{repo}``; None for non-GitHub URLs and network errors."""
+    parsed = parse_github_url(repo_url)
+    if not parsed:
+        return None
+
+    owner, repo = parsed
+    try:
+        return get(f"/repos/{owner}/{repo}")
     except httpx.TimeoutException:
         logger.warning("github_api_timeout", repo_url=repo_url)
         return None
@@ -66,30 +119,204 @@ def fetch_repo_metadata(repo_url: str, *, token: str = "") -> GitHubRepoMeta | N
         logger.warning("github_api_request_error", repo_url=repo_url, error=str(exc))
         return None
 
+
+def _rest_meta(data: dict[str, Any]) -> GitHubRepoMeta:
+    return GitHubRepoMeta(
+        stars=data.get("stargazers_count", 0),
+        language=data.get("language"),
+        forks=data.get("forks_count", 0),
+        last_pushed_at=_parse_timestamp(data.get("pushed_at")),
+    )
+
+
+def fetch_repo_conditional(
+    repo_url: str, *, client: httpx.Client, validators: RepoValidators | None = None
+) -> RepoFetch:
+    """Fetch metadata with ``If-None-Match``/``If-Modified-Since`` from ``validators``.
+
+    A 304 comes back as ``not_modified`` and, for authenticated requests,
+    doesn't count against the rate limit. Returns an empty ``RepoFetch`` for
+    non-GitHub URLs and on any failure (non-200 status, invalid JSON,
+    timeout, network error), logging a warning for failures.
+    """
+    headers: dict[str, str] = {}
+    if validators and validators.etag:
+        headers["If-None-Match"] = validators.etag
+    if validators and validators.last_modified:
+        headers["If-Modified-Since"] = validators.last_modified
+
+    response = _get_repo(repo_url, partial(client.get, headers=headers))
+    if response is None:
+        return RepoFetch()
+
+    if response.status_code == 304:
+        previous = validators or RepoValidators()
+        return RepoFetch(
+            not_modified=True,
+            validators=RepoValidators(
+                etag=response.headers.get("ETag", previous.etag),
+                last_modified=response.headers.get(
+                    "Last-Modified", previous.last_modified
+                ),
+            ),
+        )
     if response.status_code != 200:
         logger.warning(
             "github_api_non_200",
             repo_url=repo_url,
             status_code=response.status_code,
         )
+        return RepoFetch()
+    try:
+        data = response.json()
+    except ValueError:
+        logger.warning("github_api_invalid_json", repo_url=repo_url)
+        return RepoFetch()
+    return RepoFetch(meta=_rest_meta(data), validators=_response_validators(response))
+
+
+def _response_validators(response: httpx.Response) -> RepoValidators:
+    return RepoValidators(
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+
+
+def _fetch_validators(repo_url: str, *, client: httpx.Client) -> RepoValidators | None:
+    """HEAD the REST endpoint for the validators a later fetch can revalidate.
+
+    Used after a GraphQL fetch, which returns no ETag/Last-Modified of its
+    own. Failures are logged and return None.
+    """
+    response = _get_repo(repo_url, client.head)
+    if response is None:
         return None
+    if response.status_code != 200:
+        logger.warning(
+            "github_api_non_200",
+            repo_url=repo_url,
+            status_code=response.status_code,
+        )
+        return None
+    return _response_validators(response)
+
+
+def _fetch_graphql_batch(
+    client: httpx.Client, repos: list[tuple[str, tuple[str, str]]]
+) -> dict[str, GitHubRepoMeta | None]:
+    """Fetch ``[(repo_url, (owner, repo)), ...]`` in one GraphQL query."""
+    results: dict[str, GitHubRepoMeta | None] = {url: None for url, _ in repos}
+    params = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(len(repos)))
+    fields = " ".join(
+        f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ {_GRAPHQL_REPO_FIELDS} }}"
+        for i in range(len(repos))
+    )
+    variables: dict[str, str] = {}
+    for i, (_, (owner, repo)) in enumerate(repos):
+        variables[f"o{i}"] = owner
+        variables[f"n{i}"] = repo
 
-    data = response.json()
+    try:
+        response = client.post(
+            "/graphql",
+            json={"query": f"query({params}) {{ {fields} }}", "variables": variables},
+        )
+    except httpx.TimeoutException:
+        for url in results:
+            logger.warning("github_api_timeout", repo_url=url)
+        return results
+    except httpx.RequestError as exc:
+        for url in results:
+            logger.warning("github_api_request_error", repo_url=url, error=str(exc))
+        return results
 
-    pushed_at_raw: str | None = data.get("pushed_at")
-    if pushed_at_raw:
-        try:
-            last_pushed_at: datetime | None = datetime.fromisoformat(
-                pushed_at_raw.replace("Z", "+00:00")
+    if response.status_code != 200:
+        for url in results:
+            logger.warning(
+                "github_api_non_200",
+                repo_url=url,
+                status_code=response.status_code,
             )
-        except (ValueError, AttributeError):
-            last_pushed_at = None
-    else:
-        last_pushed_at = None
+        return results
 
-    return GitHubRepoMeta(
-        stars=data.get("stargazers_count", 0),
-        language=data.get("language"),
-        forks=data.get("forks_count", 0),
-        last_pushed_at=last_pushed_at,
-    )
+    try:
+        body: dict[str, Any] = response.json()
+    except ValueError:
+        for url in results:
+            logger.warning("github_api_invalid_json", repo_url=url)
+        return results
+    data = body.get("data") or {}
+    errors = {
+        error["path"][0]: error.get("message")
+        for error in body.get("errors") or []
+        if error.get("path")
+    }
+    for i, (url, _) in enumerate(repos):
+        node = data.get(f"r{i}")
+        if node is None:
+            logger.warning(
+                "github_api_repo_unavailable", repo_url=url, error=errors.get(f"r{i}")
+            )
+            continue
+        results[url] = GitHubRepoMeta(
+            stars=node.get("stargazerCount", 0),
+            language=(node.get("primaryLanguage") or {}).get("name"),
+            forks=node.get("forkCount", 0),
+            last_pushed_at=_parse_timestamp(node.get("pushedAt")),
+        )
+    return results
+
+
+def fetch_repos(
+    repos: Mapping[str, RepoValidators | None],
+    *,
+    token: str = "",
+    max_concurrency: int = 8,
+) -> dict[str, RepoFetch]:
+    """Fetch metadata for many repositories over one pooled client.
+
+    ``repos`` maps repository URLs to the validators stored from their last
+    fetch. Repositories with validators get conditional REST requests on up
+    to ``max_concurrency`` threads. The rest are fetched with batched
+    GraphQL queries when a token is set (GraphQL requires auth) and over
+    REST otherwise. GraphQL returns no validators, so each repository it
+    fetched is followed by a REST ``HEAD`` for its ETag/Last-Modified, which
+    lets its next refresh be conditional. Non-GitHub URLs and failures map
+    to an empty ``RepoFetch``; failures are logged per repository as in
+    ``fetch_repo_conditional``.
+    """
+    results = {url: RepoFetch() for url in repos}
+    conditional: dict[str, RepoValidators | None] = {}
+    batched: list[tuple[str, tuple[str, str]]] = []
+    for url, validators in repos.items():
+        parsed = parse_github_url(url)
+        if not parsed:
+            continue
+        if token and not (validators and (validators.etag or validators.last_modified)):
+            batched.append((url, parsed))
+        else:
+            conditional[url] = validators
+    if not conditional and not batched:
+        return results
+
+    with github_client(token=token, max_connections=max_concurrency) as client:
+        batches = [
+            batched[start : start + _GRAPHQL_BATCH_SIZE]
+            for start in range(0, len(batched), _GRAPHQL_BATCH_SIZE)
+        ]
+        workers = min(max_concurrency, max(len(batched), len(conditional)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            rest = pool.map(
+                lambda url: fetch_repo_conditional(
+                    url, client=client, validators=conditional[url]
+                ),
+                conditional,
+            )
+            graphql: dict[str, GitHubRepoMeta] = {}
+            for batch in pool.map(partial(_fetch_graphql_batch, client), batches):
+                graphql.update({url: meta for url, meta in batch.items() if meta})
+            validators = pool.map(partial(_fetch_validators, client=client), graphql)
+            for (url, meta), found in zip(graphql.items(), validators, strict=True):
+                results[url] = RepoFetch(meta=meta, validators=found)
+            results.update(zip(conditional, rest, strict=True))
+    return results
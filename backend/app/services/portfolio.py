@@ -1,32 +1,52 @@
+from functools import lru_cache
 from pathlib import Path
 
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.content.loader import ParsedPage, load_page
+from app.content.loader import ParsedPage
+from app.content.page_registry import PageRegistry
 from app.core.exceptions import NotFoundError
-from app.crud.project import get_projects
+from app.crud.project import get_projects_async
 from app.models.project import Project
 
 
-def list_projects(
-    *, session: Session, featured_only: bool = False, skip: int = 0, limit: int = 50
-) -> tuple[list[Project], int]:
-    return get_projects(
+async def list_projects(
+    *,
+    session: AsyncSession,
+    featured_only: bool = False,
+    skip: int = 0,
+    limit: int = 50,
+) -> tuple[list[Project], bool]:
+    """Return a page of projects and whether more follow it."""
+    return await get_projects_async(
         session=session, featured_only=featured_only, skip=skip, limit=limit
     )
 
 
+@lru_cache(maxsize=8)
+def _page_registry(content_dir: Path) -> PageRegistry:
+    return PageRegistry(content_dir)
+
+
+def get_page(*, content_dir: Path, slug: str) -> ParsedPage:
+    """Return a static page from the in-memory registry (re-rendered on change)."""
+    page = _page_registry(content_dir).get(slug)
+    if page is None:
+        raise NotFoundError("Page", slug)
+    return page
+
+
+def _get_page_file(*, content_dir: Path, name: str) -> ParsedPage:
+    """Return the page from ``pages/<name>.md``, whatever slug it declares."""
+    page = _page_registry(content_dir).get_file(f"{name}.md")
+    if page is None:
+        raise NotFoundError("Page", name)
+    return page
+
+
 def get_about_page(*, content_dir: Path) -> ParsedPage:
-    file_path = content_dir / "pages" / "about.md"
-    try:
-        return load_page(file_path, content_dir)
-    except (FileNotFoundError, ValueError) as exc:
-        raise NotFoundError("Page", "about") from exc
+    return _get_page_file(content_dir=content_dir, name="about")
 
 
 def get_privacy_page(*, content_dir: Path) -> ParsedPage:
-    file_path = content_dir / "pages" / "privacy.md"
-    try:
-        return load_page(file_path, content_dir)
-    except (FileNotFoundError, ValueError) as exc:
-        raise NotFoundError("Page", "privacy") from exc
+    return _get_page_file(content_dir=content_dir, name="privacy")
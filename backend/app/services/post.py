@@ -1,30 +1,103 @@
 """Post service — business logic for post sync and tag management."""
 
+from collections.abc import Sequence
+from dataclasses import asdict
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session
 
 from app.content import slugify
 from app.content.loader import ParsedPost
-from app.crud.post import reconcile_post_tags, upsert_post
+from app.crud.bulk import INVALID, WRITE_FAILED
+from app.crud.post import (
+    bulk_upsert_posts,
+    clear_post_source_hashes,
+    reconcile_post_tags,
+    reconcile_tags_for_posts,
+    upsert_post,
+)
 from app.schemas.post import PostUpsert, TagCreate
 
 
-def sync_post_from_content(*, session: Session, parsed: ParsedPost) -> None:
-    """Upsert a post from parsed Markdown content and reconcile its tags.
-
-    Does NOT commit — the caller owns the transaction boundary.
-    """
-    upsert_data = PostUpsert(
+def _post_upsert(parsed: ParsedPost) -> PostUpsert:
+    return PostUpsert(
         title=parsed.title,
         slug=parsed.slug,
         excerpt=parsed.excerpt,
         content_markdown=parsed.content_markdown,
         content_html=parsed.content_html,
+        toc=[asdict(entry) for entry in parsed.toc],
         published=parsed.published,
         published_at=parsed.published_at,
     )
+
+
+def _tag_creates(parsed: ParsedPost) -> list[TagCreate]:
+    return [TagCreate(name=name, slug=slugify(name)) for name in parsed.tags]
+
+
+def sync_post_from_content(*, session: Session, parsed: ParsedPost) -> None:
+    """Upsert a post from parsed Markdown content and reconcile its tags.
+
+    Does NOT commit — the caller owns the transaction boundary.
+    """
     post = upsert_post(
-        session=session, source_path=parsed.source_path, data=upsert_data
+        session=session,
+        source_path=parsed.source_path,
+        data=_post_upsert(parsed),
+        source_hash=parsed.source_hash,
     )
+    reconcile_post_tags(session=session, post=post, tag_creates=_tag_creates(parsed))
+
+
+def sync_posts_from_content(
+    *, session: Session, parsed_posts: Sequence[ParsedPost]
+) -> dict[str, str]:
+    """Batched ``sync_post_from_content`` for many posts.
+
+    Returns ``{source_path: reason}`` for posts that were not written (see
+    ``crud.bulk``); every other post is upserted with its tags reconciled.
+    Tags are reconciled for all posts in one savepoint; if that fails, each
+    post is retried in its own, and a post whose tags still can't be written
+    is reported as ``WRITE_FAILED`` with its ``source_hash`` cleared so the
+    next sync retries it. Does NOT commit — the caller owns the transaction
+    boundary.
+    """
+    failures: dict[str, str] = {}
+    rows = []
+    tag_creates: dict[str, list[TagCreate]] = {}
+    for parsed in parsed_posts:
+        try:
+            row = (parsed.source_path, _post_upsert(parsed), parsed.source_hash)
+            tag_creates[parsed.source_path] = _tag_creates(parsed)
+        except ValidationError:
+            failures[parsed.source_path] = INVALID
+            continue
+        rows.append(row)
+
+    ids, write_failures = bulk_upsert_posts(session=session, rows=rows)
+    failures.update(write_failures)
 
-    tag_creates = [TagCreate(name=name, slug=slugify(name)) for name in parsed.tags]
-    reconcile_post_tags(session=session, post=post, tag_creates=tag_creates)
+    post_tags = {
+        ids[path]: datas
+        for path, datas in tag_creates.items()
+        if path in ids and path not in failures
+    }
+    try:
+        with session.begin_nested():
+            reconcile_tags_for_posts(session=session, post_tags=post_tags)
+    except SQLAlchemyError:
+        paths = {post_id: path for path, post_id in ids.items()}
+        untagged = []
+        for post_id, datas in post_tags.items():
+            try:
+                with session.begin_nested():
+                    reconcile_tags_for_posts(
+                        session=session, post_tags={post_id: datas}
+                    )
+            except SQLAlchemyError:
+                failures[paths[post_id]] = WRITE_FAILED
+                untagged.append(post_id)
+        clear_post_source_hashes(session=session, ids=untagged)
+    return failures
@@ -1,20 +1,34 @@
 """Project service — business logic for project sync."""
 
+from collections.abc import Sequence
+from datetime import timedelta
+
+from pydantic import ValidationError
 from sqlmodel import Session
 
 from app.content.loader import ParsedProject
-from app.crud.project import update_github_metadata, upsert_project
+from app.core.config import settings
+from app.crud.bulk import INVALID
+from app.crud.project import (
+    bulk_upsert_projects,
+    claim_projects_for_github_refresh,
+    release_github_refresh_claims,
+    update_github_cache_state,
+    update_github_metadata,
+    upsert_project,
+)
+from app.models.base import get_datetime_utc
 from app.models.project import Project
 from app.schemas.project import ProjectUpsert
-from app.services.github import fetch_repo_metadata
+from app.services.github import RepoValidators, fetch_repos, parse_github_url
 
+# A claim older than this is assumed abandoned (e.g. its worker died
+# mid-refresh) and the project can be claimed again.
+GITHUB_REFRESH_CLAIM_TIMEOUT = timedelta(minutes=10)
 
-def sync_project_from_content(*, session: Session, parsed: ParsedProject) -> Project:
-    """Upsert a project from parsed Markdown content.
 
-    Does NOT commit — the caller owns the transaction boundary.
-    """
-    upsert_data = ProjectUpsert(
+def _project_upsert(parsed: ParsedProject) -> ProjectUpsert:
+    return ProjectUpsert(
         title=parsed.title,
         slug=parsed.slug,
         description=parsed.description,
@@ -25,30 +39,110 @@ def sync_project_from_content(*, session: Session, parsed: ParsedProject) -> Pro
         featured=parsed.featured,
         sort_order=parsed.sort_order,
     )
+
+
+def sync_project_from_content(*, session: Session, parsed: ParsedProject) -> Project:
+    """Upsert a project from parsed Markdown content.
+
+    Does NOT commit — the caller owns the transaction boundary.
+    """
     return upsert_project(
-        session=session, source_path=parsed.source_path, data=upsert_data
+        session=session,
+        source_path=parsed.source_path,
+        data=_project_upsert(parsed),
+        source_hash=parsed.source_hash,
     )
 
 
-def enrich_project_github_metadata(
-    *, session: Session, project: Project, token: str = ""
-) -> bool:
-    """Fetch GitHub metadata for a project and persist it.
+def sync_projects_from_content(
+    *, session: Session, parsed_projects: Sequence[ParsedProject]
+) -> dict[str, str]:
+    """Batched ``sync_project_from_content`` for many projects.
 
-    Returns True if metadata was successfully fetched and stored, False otherwise.
+    Returns ``{source_path: reason}`` for projects that were not written
+    (see ``crud.bulk``).
     Does NOT commit — the caller owns the transaction boundary.
     """
-    if not project.repo_url:
-        return False
-    meta = fetch_repo_metadata(project.repo_url, token=token)
-    if not meta:
-        return False
-    update_github_metadata(
+    failures: dict[str, str] = {}
+    rows = []
+    for parsed in parsed_projects:
+        try:
+            rows.append(
+                (parsed.source_path, _project_upsert(parsed), parsed.source_hash)
+            )
+        except ValidationError:
+            failures[parsed.source_path] = INVALID
+
+    _, write_failures = bulk_upsert_projects(session=session, rows=rows)
+    failures.update(write_failures)
+    return failures
+
+
+def refresh_github_metadata(
+    *, session: Session, ttl: timedelta, token: str = ""
+) -> int:
+    """Refresh GitHub metadata for projects not fetched within ``ttl``.
+
+    Due projects are claimed and the claim committed before any request is
+    made, so no transaction or row lock is held while GitHub answers.
+    Requests are conditional on the stored ETag/Last-Modified, so a 304
+    only bumps ``github_fetched_at``. A repository that fails to fetch is
+    left as is and retried on the next run. A ``repo_url`` that isn't a
+    GitHub repository is only stamped as fetched, so it waits out ``ttl``
+    like any other project. Returns the number of projects refreshed
+    (updated or confirmed unchanged).
+    Commits the claim; the caller commits the results.
+    """
+    now = get_datetime_utc()
+    projects = claim_projects_for_github_refresh(
         session=session,
-        project=project,
-        stars=meta.stars,
-        language=meta.language,
-        forks=meta.forks,
-        last_pushed_at=meta.last_pushed_at,
+        fetched_before=now - ttl,
+        claimed_before=now - GITHUB_REFRESH_CLAIM_TIMEOUT,
+        now=now,
     )
-    return True
+    if not projects:
+        return 0
+    repos: dict[str, RepoValidators | None] = {}
+    for project in projects:
+        if project.repo_url and parse_github_url(project.repo_url):
+            repos[project.repo_url] = RepoValidators(
+                etag=project.github_etag, last_modified=project.github_last_modified
+            )
+        else:
+            update_github_cache_state(
+                session=session,
+                project=project,
+                etag=None,
+                last_modified=None,
+                fetched_at=now,
+            )
+    session.commit()
+    fetched = fetch_repos(
+        repos, token=token, max_concurrency=settings.GITHUB_MAX_CONCURRENCY
+    )
+
+    refreshed = 0
+    for project in projects:
+        result = fetched.get(project.repo_url or "")
+        if result is None or not (result.meta or result.not_modified):
+            continue
+        if result.meta:
+            update_github_metadata(
+                session=session,
+                project=project,
+                stars=result.meta.stars,
+                language=result.meta.language,
+                forks=result.meta.forks,
+                last_pushed_at=result.meta.last_pushed_at,
+            )
+        validators = result.validators or RepoValidators()
+        update_github_cache_state(
+            session=session,
+            project=project,
+            etag=validators.etag,
+            last_modified=validators.last_modified,
+            fetched_at=now,
+        )
+        refreshed += 1
+    release_github_refresh_claims(session=session, projects=projects)
+    return refreshed
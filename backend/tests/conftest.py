@@ -1,14 +1,21 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import Connection
+from sqlalchemy import Connection, text
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.deps import get_db
+from app.api.deps import get_async_db, get_db
+from app.content.renderer import configure_highlight_cache
+from app.content.search_index import configure_search_index
+from app.content.static_search_index import configure_static_search_index
 from app.core.config import settings
 from app.core.db import engine, init_db
+from app.core.page_cache import configure_content_version
 from app.main import app
+from app.services import content_sync
 from tests.utils.user import authentication_token_from_email
 from tests.utils.utils import get_superuser_token_headers
 
@@ -26,6 +33,57 @@ def _db_connection() -> Generator[Connection]:
     connection.close()
 
 
+@pytest.fixture(autouse=True, scope="session")
+def _no_github_refresh() -> Generator[None]:
+    """Keep app startup from refreshing GitHub metadata against the real API."""
+    with patch.object(settings, "GITHUB_REFRESH_INTERVAL_SECONDS", 0):
+        yield
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _no_search_index_file() -> Generator[None]:
+    """Keep app startup and sync away from the real published search indexes."""
+    with (
+        patch.object(settings, "SEARCH_INDEX_PATH", ""),
+        patch.object(settings, "SEARCH_STATIC_INDEX", False),
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _no_search_index(monkeypatch: pytest.MonkeyPatch) -> Generator[None]:
+    """Search Postgres unless a test configures an index file itself."""
+    # Posts analysed by an earlier test's publish belong to its rolled-back data.
+    monkeypatch.setattr(content_sync, "_index_documents", None)
+    configure_search_index(None)
+    configure_static_search_index(None)
+    yield
+    configure_search_index(None)
+    configure_static_search_index(None)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _no_content_version_file() -> Generator[None]:
+    """Keep app startup from enabling the page cache; tests opt in."""
+    with patch.object(settings, "CONTENT_VERSION_PATH", ""):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _no_page_cache() -> Generator[None]:
+    configure_content_version(None)
+    yield
+    configure_content_version(None)
+
+
+@pytest.fixture(autouse=True)
+def _no_highlight_cache() -> Generator[None]:
+    """Drop the on-disk highlight cache that app startup installs globally."""
+    configure_highlight_cache(None)
+    yield
+    configure_highlight_cache(None)
+
+
 @pytest.fixture()
 def db(_db_connection: Connection) -> Generator[Session]:
     """Function-scoped session on a savepoint. Rolls back after each test."""
@@ -36,6 +94,41 @@ def db(_db_connection: Connection) -> Generator[Session]:
     nested.rollback()
 
 
+def _async_view(db: Session) -> AsyncSession:
+    # The AsyncSession proxies to ``db`` itself, so async code runs on the
+    # test's connection and savepoint (statements execute inside
+    # greenlet_spawn on the sync driver). Never closed here — ``db`` owns it.
+    return AsyncSession(sync_session_class=lambda **_: db)  # type: ignore[arg-type]
+
+
+@pytest.fixture()
+def pg_trgm(db: Session) -> None:
+    """Fail unless the database is migrated with pg_trgm and its trigram indexes.
+
+    Fuzzy search relies on both, so a test database without them is a setup
+    error rather than a reason to skip.
+    """
+    installed = db.execute(
+        text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    ).first()
+    indexes = db.execute(
+        text(
+            "SELECT to_regclass('ix_post_title_trgm'), to_regclass('ix_tag_name_trgm')"
+        )
+    ).one()
+    if installed is None or None in indexes:
+        pytest.fail(
+            "pg_trgm or its trigram indexes are missing; "
+            "run `alembic upgrade head` against the test database"
+        )
+
+
+@pytest.fixture()
+def async_db(db: Session) -> AsyncSession:
+    """``AsyncSession`` over the test's ``db`` session, for async read paths."""
+    return _async_view(db)
+
+
 @pytest.fixture()
 def client(db: Session) -> Generator[TestClient]:
     """Function-scoped TestClient sharing the test's DB session."""
@@ -43,7 +136,11 @@ def client(db: Session) -> Generator[TestClient]:
     def _override_get_db() -> Generator[Session]:
         yield db
 
+    async def _override_get_async_db() -> AsyncGenerator[AsyncSession]:
+        yield _async_view(db)
+
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_async_db] = _override_get_async_db
     app.state.limiter.enabled = False
     with TestClient(app) as c:
         yield c
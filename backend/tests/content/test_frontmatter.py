@@ -1,8 +1,14 @@
 """Unit tests for app.content.frontmatter.parse_frontmatter."""
 
+import importlib
+from collections.abc import Generator
+from pathlib import Path
+
 import pytest
+import yaml
 
-from app.content.frontmatter import parse_frontmatter
+from app.content import frontmatter
+from app.content.frontmatter import parse_frontmatter, read_frontmatter
 
 
 def test_valid_frontmatter_with_body() -> None:
@@ -103,3 +109,62 @@ def test_frontmatter_date_field_parsed() -> None:
 
     assert meta["date"] == datetime.date(2024, 6, 15)
     assert body.strip() == "Content"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "---\ntitle: Hello\ntags: [a, b]\n---\nBody",
+        "---  \ntitle: Hello\n---\n---\nBody with a rule",
+        "---\n---\nBody",
+        "# No front matter\n---\ntitle: x\n---\n",
+        "---\ntitle: Unterminated\n",
+        "",
+    ],
+)
+def test_read_frontmatter_matches_parse_frontmatter(tmp_path: Path, text: str) -> None:
+    path = tmp_path / "post.md"
+    path.write_text(text, encoding="utf-8")
+    assert read_frontmatter(path) == parse_frontmatter(text)[0]
+
+
+def test_read_frontmatter_stops_before_body(tmp_path: Path) -> None:
+    path = tmp_path / "post.md"
+    # Invalid UTF-8 in the body would fail a full read.
+    path.write_bytes(b"---\ntitle: Hello\n---\n\xff\xfe body")
+    assert read_frontmatter(path) == {"title": "Hello"}
+
+
+def test_read_frontmatter_invalid_yaml_raises_value_error(tmp_path: Path) -> None:
+    path = tmp_path / "post.md"
+    path.write_text("---\ntitle: [unclosed\n---\nBody", encoding="utf-8")
+    with pytest.raises(ValueError, match="Invalid YAML front matter"):
+        read_frontmatter(path)
+
+
+@pytest.fixture()
+def without_libyaml(monkeypatch: pytest.MonkeyPatch) -> Generator[None]:
+    """Reload ``frontmatter`` as if PyYAML had been built without libyaml."""
+    monkeypatch.delattr(yaml, "CSafeLoader", raising=False)
+    importlib.reload(frontmatter)
+    yield
+    monkeypatch.undo()
+    importlib.reload(frontmatter)
+
+
+@pytest.mark.usefixtures("without_libyaml")
+def test_pure_python_loader_used_without_libyaml() -> None:
+    assert frontmatter._SafeLoader is yaml.SafeLoader
+    meta, body = frontmatter.parse_frontmatter(
+        "---\ntitle: Hello\ndate: 2024-06-15\ntags: [a, b]\n---\nBody"
+    )
+    import datetime
+
+    assert meta == {
+        "title": "Hello",
+        "date": datetime.date(2024, 6, 15),
+        "tags": ["a", "b"],
+    }
+    assert body == "Body"
+    with pytest.raises(ValueError, match="Invalid YAML front matter"):
+        frontmatter.parse_frontmatter("---\ntitle: [unclosed\n---\nBody")
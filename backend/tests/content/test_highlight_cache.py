@@ -0,0 +1,54 @@
+"""Unit tests for app.content.highlight_cache — uses tmp_path, no DB access."""
+
+import os
+from pathlib import Path
+
+from app.content.highlight_cache import HighlightCache
+
+
+def test_get_missing_key_counts_miss(tmp_path: Path) -> None:
+    cache = HighlightCache(tmp_path, max_bytes=1024)
+    assert cache.get("ab" * 32) is None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_put_then_get_counts_hit(tmp_path: Path) -> None:
+    cache = HighlightCache(tmp_path, max_bytes=1024)
+    key = "cd" * 32
+    cache.put(key, "<pre>x</pre>")
+    assert cache.get(key) == "<pre>x</pre>"
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_entries_shared_between_instances(tmp_path: Path) -> None:
+    key = "ef" * 32
+    HighlightCache(tmp_path, max_bytes=1024).put(key, "<pre>shared</pre>")
+    assert HighlightCache(tmp_path, max_bytes=1024).get(key) == "<pre>shared</pre>"
+
+
+def test_put_leaves_no_temp_files(tmp_path: Path) -> None:
+    cache = HighlightCache(tmp_path, max_bytes=1024)
+    cache.put("01" * 32, "<pre>x</pre>")
+    assert list(tmp_path.glob("*/*.tmp")) == []
+
+
+def test_prune_under_limit_keeps_everything(tmp_path: Path) -> None:
+    cache = HighlightCache(tmp_path, max_bytes=1024)
+    cache.put("02" * 32, "x" * 100)
+    assert cache.prune() == 0
+    assert cache.get("02" * 32) is not None
+
+
+def test_prune_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = HighlightCache(tmp_path, max_bytes=250)
+    keys = ["a1" * 32, "b2" * 32, "c3" * 32]
+    for age, key in zip((300, 200, 100), keys, strict=True):
+        cache.put(key, "x" * 100)
+        path = tmp_path / key[:2] / f"{key}.html"
+        old = path.stat().st_mtime - age
+        os.utime(path, (old, old))
+
+    assert cache.prune() == 1
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) is not None
+    assert cache.get(keys[2]) is not None
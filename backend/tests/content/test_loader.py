@@ -2,6 +2,7 @@
 
 from datetime import UTC, datetime
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -9,12 +10,20 @@ from app.content.loader import (
     ParsedPage,
     ParsedPost,
     ParsedProject,
+    PostMeta,
+    ProjectMeta,
     load_page,
     load_pages,
     load_post,
+    load_post_files,
     load_posts,
     load_project,
     load_projects,
+    read_source,
+    scan_post,
+    scan_post_files,
+    scan_project,
+    source_fingerprint,
 )
 from app.content.renderer import TocEntry
 
@@ -235,6 +244,19 @@ def test_load_post_includes_toc(tmp_path: Path) -> None:
     assert post.toc[2] == TocEntry(level=2, id="second-section", text="Second Section")
 
 
+def test_load_post_includes_derived_metadata(tmp_path: Path) -> None:
+    path = _write_md(
+        tmp_path / "posts",
+        "2024-01-01-derived.md",
+        "---\ntitle: Derived\n---\nRead [the docs](https://example.com).\n\n"
+        "![chart](/img/chart.png)",
+    )
+    post = load_post(path, tmp_path)
+    assert post.word_count == 3
+    assert post.links == ["https://example.com"]
+    assert post.images == ["/img/chart.png"]
+
+
 def test_load_post_no_headings_empty_toc(tmp_path: Path) -> None:
     posts_dir = tmp_path / "posts"
     path = _write_md(
@@ -246,6 +268,48 @@ def test_load_post_no_headings_empty_toc(tmp_path: Path) -> None:
     assert post.toc == []
 
 
+def test_load_post_source_hash_matches_fingerprint(tmp_path: Path) -> None:
+    posts_dir = tmp_path / "posts"
+    path = _write_md(
+        posts_dir,
+        "2024-01-01-hashed.md",
+        "---\ntitle: Hashed\n---\nContent.",
+    )
+    post = load_post(path, tmp_path)
+    assert post.source_hash == source_fingerprint(path.read_bytes())
+    assert len(post.source_hash) == 64
+
+
+def test_source_fingerprint_changes_with_content() -> None:
+    first = source_fingerprint(b"---\ntitle: A\n---\nOne.")
+    assert source_fingerprint(b"---\ntitle: A\n---\nOne.") == first
+    assert source_fingerprint(b"---\ntitle: A\n---\nTwo.") != first
+
+
+def test_load_post_parses_the_source_it_was_given(tmp_path: Path) -> None:
+    path = _write_md(
+        tmp_path / "posts", "2024-01-01-read-once.md", "---\ntitle: Old\n---\nOld."
+    )
+    source = read_source(path)
+    path.write_text("---\ntitle: New\n---\nNew.", encoding="utf-8")
+
+    post = load_post(path, tmp_path, source)
+
+    assert post.title == "Old"
+    assert post.source_hash == source.fingerprint
+
+
+def test_load_post_translates_newlines_like_read_text(tmp_path: Path) -> None:
+    path = tmp_path / "posts" / "2024-01-01-crlf.md"
+    path.parent.mkdir()
+    path.write_bytes(b"---\r\ntitle: CRLF\r\n---\r\nLine one.\r\nLine two.")
+
+    post = load_post(path, tmp_path)
+
+    assert post.title == "CRLF"
+    assert post.content_markdown == "Line one.\nLine two."
+
+
 # ---------------------------------------------------------------------------
 # load_project
 # ---------------------------------------------------------------------------
@@ -489,6 +553,96 @@ def test_load_projects_returns_parsed_project_instances(tmp_path: Path) -> None:
     assert all(isinstance(p, ParsedProject) for p in projects)
 
 
+# ---------------------------------------------------------------------------
+# load_post_files (process pool)
+# ---------------------------------------------------------------------------
+
+
+def test_load_posts_parallel_matches_serial(tmp_path: Path) -> None:
+    posts_dir = tmp_path / "posts"
+    for day in range(1, 6):
+        _write_md(
+            posts_dir,
+            f"2024-01-0{day}-post-{day}.md",
+            f"---\ntitle: Post {day}\n---\n## Section {day}\n\n```python\nx = {day}\n```",
+        )
+    assert load_posts(tmp_path, workers=2) == load_posts(tmp_path)
+
+
+def test_load_post_files_returns_errors_in_place(tmp_path: Path) -> None:
+    posts_dir = tmp_path / "posts"
+    good = _write_md(posts_dir, "2024-01-01-good.md", "---\ntitle: Good\n---\nOk.")
+    bad = _write_md(posts_dir, "2024-01-02-bad.md", "---\nslug: bad\n---\nNo title.")
+    also_good = _write_md(posts_dir, "2024-01-03-also.md", "---\ntitle: Also\n---\nOk.")
+
+    results = load_post_files([good, bad, also_good], tmp_path, workers=2)
+
+    assert isinstance(results[0], ParsedPost)
+    assert results[0].slug == "good"
+    assert isinstance(results[1], ValueError)
+    assert isinstance(results[2], ParsedPost)
+    assert results[2].slug == "also"
+
+
+# ---------------------------------------------------------------------------
+# scan_post / scan_project (frontmatter only)
+# ---------------------------------------------------------------------------
+
+
+def test_scan_post_matches_load_post(tmp_path: Path) -> None:
+    path = _write_md(
+        tmp_path / "posts",
+        "2024-03-15-scanned.md",
+        "---\ntitle: Scanned\npublished: true\ntags: python, web\n---\n## Body",
+    )
+    meta = scan_post(path, tmp_path)
+    post = load_post(path, tmp_path)
+    assert meta == PostMeta(
+        source_path=post.source_path,
+        title=post.title,
+        slug=post.slug,
+        published=post.published,
+        published_at=post.published_at,
+        tags=post.tags,
+    )
+    assert meta.published_at == datetime(2024, 3, 15, tzinfo=UTC)
+
+
+def test_scan_post_does_not_render(tmp_path: Path) -> None:
+    path = _write_md(
+        tmp_path / "posts", "2024-01-01-x.md", "---\ntitle: X\n---\n```python\nx\n```"
+    )
+    with patch("app.content.loader.render_markdown") as render:
+        scan_post(path, tmp_path)
+    render.assert_not_called()
+
+
+def test_scan_project_basic(tmp_path: Path) -> None:
+    path = _write_md(
+        tmp_path / "projects",
+        "My Tool.md",
+        "---\ntitle: My Tool\nfeatured: true\nsort_order: 3\n---\nBody.",
+    )
+    assert scan_project(path, tmp_path) == ProjectMeta(
+        source_path="projects/My Tool.md",
+        title="My Tool",
+        slug="my-tool",
+        featured=True,
+        sort_order=3,
+    )
+
+
+def test_scan_post_files_returns_errors_in_place(tmp_path: Path) -> None:
+    posts_dir = tmp_path / "posts"
+    good = _write_md(posts_dir, "2024-01-01-good.md", "---\ntitle: Good\n---\nOk.")
+    bad = _write_md(posts_dir, "2024-01-02-bad.md", "---\nslug: bad\n---\nNo title.")
+
+    results = scan_post_files([good, bad], tmp_path)
+
+    assert isinstance(results[0], PostMeta)
+    assert isinstance(results[1], ValueError)
+
+
 # ---------------------------------------------------------------------------
 # load_pages (directory scanner)
 # ---------------------------------------------------------------------------
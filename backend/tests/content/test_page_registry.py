@@ -0,0 +1,96 @@
+"""Unit tests for app.content.page_registry — uses tmp_path, no DB access."""
+
+import os
+from pathlib import Path
+
+from app.content.page_registry import PageRegistry
+
+
+def _write_page(content_dir: Path, filename: str, content: str) -> Path:
+    pages_dir = content_dir / "pages"
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    path = pages_dir / filename
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def _bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_get_renders_once_and_serves_from_memory(tmp_path: Path) -> None:
+    _write_page(tmp_path, "about.md", "---\ntitle: About\n---\nHello.")
+    registry = PageRegistry(tmp_path)
+
+    first = registry.get("about")
+    second = registry.get("about")
+
+    assert first is not None
+    assert first.title == "About"
+    assert second is first
+    assert registry.loads == 1
+
+
+def test_changed_file_is_rerendered(tmp_path: Path) -> None:
+    path = _write_page(tmp_path, "about.md", "---\ntitle: About\n---\nOld.")
+    _write_page(tmp_path, "privacy.md", "---\ntitle: Privacy\n---\nText.")
+    registry = PageRegistry(tmp_path)
+    assert registry.get("about") is not None
+
+    path.write_text("---\ntitle: About\n---\nNew.", encoding="utf-8")
+    _bump_mtime(path)
+    page = registry.get("about")
+
+    assert page is not None
+    assert "New." in page.content_html
+    assert registry.loads == 3  # privacy.md was not re-rendered
+
+
+def test_page_served_at_frontmatter_slug(tmp_path: Path) -> None:
+    _write_page(tmp_path, "Uses Page.md", "---\ntitle: Uses\n---\nTools.")
+    _write_page(tmp_path, "colophon.md", "---\ntitle: C\nslug: built-with\n---\n.")
+    registry = PageRegistry(tmp_path)
+
+    assert registry.get("uses-page") is not None
+    assert registry.get("built-with") is not None
+    assert registry.get("colophon") is None
+    assert [p.slug for p in registry.pages()] == ["uses-page", "built-with"]
+
+
+def test_deleted_file_is_dropped(tmp_path: Path) -> None:
+    path = _write_page(tmp_path, "about.md", "---\ntitle: About\n---\nHello.")
+    registry = PageRegistry(tmp_path)
+    assert registry.get("about") is not None
+
+    path.unlink()
+
+    assert registry.get("about") is None
+
+
+def test_invalid_page_is_missing_until_fixed(tmp_path: Path) -> None:
+    path = _write_page(tmp_path, "about.md", "---\nslug: about\n---\nNo title.")
+    registry = PageRegistry(tmp_path)
+
+    assert registry.get("about") is None
+    assert registry.get("about") is None
+    assert registry.loads == 1
+
+    path.write_text("---\ntitle: About\n---\nFixed.", encoding="utf-8")
+    _bump_mtime(path)
+    assert registry.get("about") is not None
+
+
+def test_missing_pages_directory(tmp_path: Path) -> None:
+    assert PageRegistry(tmp_path).get("about") is None
+
+
+def test_get_file_ignores_frontmatter_slug(tmp_path: Path) -> None:
+    _write_page(tmp_path, "about.md", "---\ntitle: About\nslug: me\n---\n.")
+    registry = PageRegistry(tmp_path)
+
+    page = registry.get_file("about.md")
+
+    assert page is not None
+    assert page is registry.get("me")
+    assert registry.get_file("missing.md") is None
@@ -1,6 +1,20 @@
 """Unit tests for app.content.renderer.render_markdown."""
 
-from app.content.renderer import TocEntry, extract_toc, render_markdown
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from pygments.lexers import TextLexer  # type: ignore[attr-defined]
+
+from app.content.highlight_cache import HighlightCache
+from app.content.renderer import (
+    TocEntry,
+    _get_lexer,
+    configure_highlight_cache,
+    preload_lexers,
+    render_document,
+    render_markdown,
+)
 
 
 def test_plain_text_renders_to_paragraph() -> None:
@@ -94,40 +108,136 @@ def test_returns_string_type() -> None:
 
 
 # ---------------------------------------------------------------------------
-# extract_toc
+# render_document
 # ---------------------------------------------------------------------------
 
 
-def test_extract_toc_from_html() -> None:
-    html = render_markdown("## Introduction\n\n### Details\n\n## Conclusion")
-    toc = extract_toc(html)
+def test_document_toc() -> None:
+    toc = render_document("## Introduction\n\n### Details\n\n## Conclusion").toc
     assert len(toc) == 3
     assert toc[0] == TocEntry(level=2, id="introduction", text="Introduction")
     assert toc[1] == TocEntry(level=3, id="details", text="Details")
     assert toc[2] == TocEntry(level=2, id="conclusion", text="Conclusion")
 
 
-def test_extract_toc_empty_html() -> None:
-    toc = extract_toc("")
-    assert toc == []
+def test_document_toc_empty() -> None:
+    assert render_document("").toc == []
 
 
-def test_extract_toc_no_headings() -> None:
-    html = render_markdown("Just a paragraph.\n\nAnother paragraph.")
-    toc = extract_toc(html)
+def test_document_toc_no_headings() -> None:
+    toc = render_document("Just a paragraph.\n\nAnother paragraph.").toc
     assert toc == []
 
 
-def test_extract_toc_skips_h1() -> None:
-    html = render_markdown("# Title\n\n## Section")
-    toc = extract_toc(html)
+def test_document_toc_skips_h1() -> None:
+    toc = render_document("# Title\n\n## Section").toc
     assert len(toc) == 1
     assert toc[0].level == 2
     assert toc[0].text == "Section"
 
 
-def test_extract_toc_strips_inline_html() -> None:
-    html = render_markdown("## Hello **World**")
-    toc = extract_toc(html)
+def test_document_toc_strips_inline_markup() -> None:
+    toc = render_document("## Hello **World** `code`").toc
     assert len(toc) == 1
-    assert toc[0].text == "Hello World"
+    assert toc[0].text == "Hello World code"
+
+
+def test_document_toc_text_is_unescaped_and_anchor_matches_html() -> None:
+    doc = render_document("## Q & A")
+    assert doc.toc == [TocEntry(level=2, id="q-amp-a", text="Q & A")]
+    assert '<h2 id="q-amp-a">Q &amp; A</h2>' in doc.html
+
+
+def test_document_html_matches_render_markdown() -> None:
+    source = "## Intro\n\nSome *text*.\n\n```python\nx = 1\n```"
+    assert render_document(source).html == render_markdown(source)
+
+
+def test_document_word_count_excludes_code_blocks() -> None:
+    source = (
+        "## Two words\n\nThree **more** words.\nAnd `four` here.\n\n"
+        "- list item\n\n```python\nnot counted at all\n```"
+    )
+    assert render_document(source).word_count == 2 + 3 + 3 + 2
+
+
+def test_document_collects_images_and_links() -> None:
+    source = (
+        "See [docs](https://example.com/docs) and ![diagram](/img/a.png).\n\n"
+        "Again [docs](https://example.com/docs), <https://example.org>.\n\n"
+        "## Heading with ![icon](/img/i.svg)"
+    )
+    doc = render_document(source)
+    assert doc.links == ["https://example.com/docs", "https://example.org"]
+    assert doc.images == ["/img/a.png", "/img/i.svg"]
+    assert doc.toc[0].text == "Heading with"
+    assert doc.word_count == 9
+
+
+# ---------------------------------------------------------------------------
+# Lexer cache
+# ---------------------------------------------------------------------------
+
+
+def test_lexer_instance_reused_across_blocks() -> None:
+    assert _get_lexer("python") is _get_lexer("python")
+
+
+def test_unknown_language_falls_back_to_cached_text_lexer() -> None:
+    lexer = _get_lexer("unknownlang999")
+    assert isinstance(lexer, TextLexer)
+    assert _get_lexer("unknownlang999") is lexer
+
+
+def test_language_alias_is_case_insensitive() -> None:
+    result = render_markdown("```Python\nx = 1\n```")
+    assert '<span class="n">x</span>' in result
+
+
+def test_preload_lexers_populates_cache() -> None:
+    _get_lexer.cache_clear()
+    preload_lexers(["python", " YAML "])
+    assert _get_lexer.cache_info().currsize == 2
+    hits = _get_lexer.cache_info().hits
+    render_markdown("```yaml\nkey: value\n```")
+    assert _get_lexer.cache_info().hits == hits + 1
+
+
+# ---------------------------------------------------------------------------
+# Highlight cache
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def highlight_cache(tmp_path: Path) -> Generator[HighlightCache]:
+    cache = HighlightCache(tmp_path, max_bytes=1024 * 1024)
+    configure_highlight_cache(cache)
+    yield cache
+    configure_highlight_cache(None)
+
+
+def test_repeated_code_block_served_from_cache(
+    highlight_cache: HighlightCache,
+) -> None:
+    source = "```bash\npip install blog\n```"
+    first = render_markdown(source)
+    second = render_markdown(source)
+    assert first == second
+    assert highlight_cache.misses == 1
+    assert highlight_cache.hits == 1
+
+
+def test_cache_key_includes_language(highlight_cache: HighlightCache) -> None:
+    render_markdown("```python\nx = 1\n```")
+    render_markdown("```text\nx = 1\n```")
+    assert highlight_cache.misses == 2
+    assert highlight_cache.hits == 0
+
+
+def test_cached_output_matches_uncached(highlight_cache: HighlightCache) -> None:
+    source = "```yaml\nkey: value\n```"
+    render_markdown(source)
+    cached = render_markdown(source)
+    assert highlight_cache.hits == 1
+    configure_highlight_cache(None)
+    assert render_markdown(source) == cached
@@ -0,0 +1,201 @@
+"""Unit tests for app.content.search_index — in-memory, no DB access."""
+
+import os
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from app.content.search_index import (
+    SNIPPET_WORDS,
+    IndexedPost,
+    IndexedTag,
+    SearchIndex,
+    SearchIndexFile,
+    mark_terms,
+    stem,
+    tokenize,
+)
+
+
+def _post(
+    title: str,
+    *,
+    excerpt: str | None = None,
+    tags: tuple[str, ...] = (),
+    published_at: datetime | None = None,
+) -> IndexedPost:
+    return IndexedPost(
+        id=uuid.uuid4(),
+        slug=title.lower().replace(" ", "-"),
+        title=title,
+        excerpt=excerpt,
+        published_at=published_at,
+        tags=tuple(IndexedTag(slug=tag.lower(), name=tag) for tag in tags),
+    )
+
+
+def _slugs(index: SearchIndex, query: str) -> list[str]:
+    return [hit.post.slug for hit in index.search(query)]
+
+
+@pytest.mark.parametrize(
+    ("word", "expected"),
+    [
+        ("indexes", "index"),
+        ("indexing", "index"),
+        ("tables", "tabl"),
+        ("table", "tabl"),
+        ("ponies", "poni"),
+        ("relational", "relat"),
+        ("hopping", "hop"),
+        ("generalizations", "gener"),
+    ],
+)
+def test_stem(word: str, expected: str) -> None:
+    assert stem(word) == expected
+
+
+def test_tokenize_drops_stop_words_and_punctuation() -> None:
+    assert tokenize("The Indexes, of sql_tables!") == ["index", "sql", "tabl"]
+
+
+def test_title_matches_outrank_body_matches() -> None:
+    index = SearchIndex.build(
+        [
+            (_post("Notes"), "A long body that mentions postgres once."),
+            (_post("Postgres tuning"), "Unrelated body."),
+            (_post("Tagged", tags=("Postgres",)), "Unrelated body."),
+        ]
+    )
+
+    assert _slugs(index, "postgres") == ["postgres-tuning", "tagged", "notes"]
+
+
+def test_every_query_term_must_match() -> None:
+    index = SearchIndex.build(
+        [
+            (_post("Postgres indexes"), ""),
+            (_post("Postgres replication"), ""),
+        ]
+    )
+
+    assert _slugs(index, "postgres indexing") == ["postgres-indexes"]
+    assert _slugs(index, "postgres zqmissing ") == []
+
+
+def test_last_word_matches_as_prefix_until_followed_by_space() -> None:
+    index = SearchIndex.build([(_post("Replication lag"), "")])
+
+    assert _slugs(index, "repl") == ["replication-lag"]
+    assert _slugs(index, "repl ") == []
+    assert _slugs(index, "lag repl") == ["replication-lag"]
+
+
+@pytest.mark.parametrize("word", ["connections", "running", "pooling"])
+def test_every_typed_prefix_finds_the_post(word: str) -> None:
+    # "connecti", "runn" and "pooli" are prefixes of the words but not of
+    # their stems ("connect", "run", "pool").
+    index = SearchIndex.build(
+        [
+            (_post("Database connections"), "Running a connection pooling proxy."),
+            (_post("Unrelated"), "Nothing to see."),
+        ]
+    )
+    loaded = SearchIndex.from_bytes(index.to_bytes())
+
+    for end in range(1, len(word) + 1):
+        assert _slugs(index, word[:end]) == ["database-connections"], word[:end]
+        assert _slugs(loaded, word[:end]) == ["database-connections"], word[:end]
+
+
+def test_ties_go_to_newer_posts() -> None:
+    older = _post("Older", published_at=datetime(2023, 1, 1, tzinfo=UTC))
+    newer = _post("Newer", published_at=datetime(2024, 1, 1, tzinfo=UTC))
+    undated = _post("Undated")
+    index = SearchIndex.build(
+        [(older, "same text"), (undated, "same text"), (newer, "same text")]
+    )
+
+    assert _slugs(index, "same text") == ["newer", "older", "undated"]
+
+
+def test_round_trips_through_bytes() -> None:
+    post = _post(
+        "Café notes",
+        excerpt="About caching",
+        tags=("Python",),
+        published_at=datetime(2024, 5, 1, 12, tzinfo=UTC),
+    )
+    index = SearchIndex.build([(post, "Body about caches.")])
+
+    loaded = SearchIndex.from_bytes(index.to_bytes())
+
+    assert loaded.posts == [post]
+    assert [hit.post for hit in loaded.search("cache")] == [post]
+    assert loaded.search("cache")[0].score == index.search("cache")[0].score
+
+
+def test_from_bytes_rejects_garbage() -> None:
+    with pytest.raises(ValueError):
+        SearchIndex.from_bytes(b"not an index")
+
+
+def test_mark_terms_wraps_matching_words() -> None:
+    marked = mark_terms("Caching & indexes.", {"index"}, "[", "]")
+
+    assert marked == "Caching & [indexes]."
+    assert mark_terms("Nothing here", {"index"}, "[", "]") == ""
+
+
+def test_snippet_comes_from_the_body() -> None:
+    body = (
+        " ".join(f"w{n}" for n in range(100))
+        + " Pooled connections. "
+        + (" ".join(f"v{n}" for n in range(100)))
+    )
+    index = SearchIndex.build([(_post("Notes", excerpt="Short excerpt."), body)])
+    loaded = SearchIndex.from_bytes(index.to_bytes())
+
+    [hit] = loaded.search("connection")
+    snippet = loaded.snippet(hit, "[", "]")
+
+    assert snippet.startswith("… w95 w96 w97 w98 w99 Pooled [connections]. v0 ")
+    assert snippet.endswith(" v22 …")
+    assert len(snippet.split()) == 2 + SNIPPET_WORDS
+
+
+def test_snippet_is_empty_for_title_only_matches() -> None:
+    index = SearchIndex.build([(_post("Connection pools", excerpt="Short."), "Body.")])
+
+    [hit] = index.search("pool")
+
+    assert index.snippet(hit, "[", "]") == ""
+
+
+def test_index_file_reloads_only_when_replaced(tmp_path: Path) -> None:
+    path = tmp_path / "search-index.json.gz"
+    index_file = SearchIndexFile(path)
+    assert index_file.get() is None
+
+    index_file.publish(SearchIndex.build([(_post("First"), "")]))
+    first = index_file.get()
+    assert first is not None
+    assert index_file.get() is first
+    assert index_file.loads == 1
+
+    index_file.publish(SearchIndex.build([(_post("Second"), "")]))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = index_file.get()
+    assert second is not None
+    assert _slugs(second, "second") == ["second"]
+    assert index_file.loads == 2
+
+
+def test_index_file_treats_broken_file_as_missing(tmp_path: Path) -> None:
+    path = tmp_path / "search-index.json.gz"
+    path.write_bytes(b"truncated")
+
+    assert SearchIndexFile(path).get() is None
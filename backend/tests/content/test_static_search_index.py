@@ -0,0 +1,87 @@
+"""Unit tests for app.content.static_search_index — uses tmp_path, no DB access."""
+
+import json
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+
+from app.content.search_index import IndexedPost, IndexedTag, analyse
+from app.content.static_search_index import (
+    KEEP_PREVIOUS,
+    MAX_BODY_TERMS,
+    StaticSearchIndexDir,
+    build_static_index,
+)
+
+
+def _post(title: str) -> IndexedPost:
+    return IndexedPost(
+        id=uuid.uuid4(),
+        slug=title.lower().replace(" ", "-"),
+        title=title,
+        excerpt="An excerpt",
+        published_at=datetime(2024, 1, 2, tzinfo=UTC),
+        tags=(IndexedTag(slug="python", name="Python"),),
+    )
+
+
+def test_build_static_index_holds_card_fields_and_unstemmed_postings() -> None:
+    payload = json.loads(
+        build_static_index([analyse(_post("Indexes"), "Indexing indexes.")])
+    )
+
+    assert payload["posts"] == [
+        [
+            "indexes",
+            "Indexes",
+            "An excerpt",
+            "2024-01-02T00:00:00+00:00",
+            [["python", "Python"]],
+        ]
+    ]
+    # Title (3) + body (1) for "indexes"; "indexing" only in the body.
+    assert payload["terms"]["indexes"] == [0, 4.0]
+    assert payload["terms"]["indexing"] == [0, 1.0]
+    assert "the" in payload["stopWords"]
+
+
+def test_build_static_index_caps_body_terms_per_post() -> None:
+    body = " ".join(
+        f"word{n} " * (MAX_BODY_TERMS + 10 - n) for n in range(MAX_BODY_TERMS + 5)
+    )
+    payload = json.loads(build_static_index([analyse(_post("Capped"), body)]))
+
+    body_terms = [term for term in payload["terms"] if term.startswith("word")]
+    assert len(body_terms) == MAX_BODY_TERMS
+    assert "word0" in body_terms
+    assert f"word{MAX_BODY_TERMS}" not in body_terms
+    assert {"capped", "python", "excerpt"} <= payload["terms"].keys()
+    # Document length still counts every body word.
+    assert payload["lengths"][0] > sum(
+        tf for postings in payload["terms"].values() for tf in postings[1::2]
+    )
+
+
+def test_publish_fingerprints_and_prunes_old_files(tmp_path: Path) -> None:
+    index_dir = StaticSearchIndexDir(tmp_path / "search", "/static/search/")
+    assert index_dir.url() is None
+
+    urls = [index_dir.publish(f'{{"n":{n}}}'.encode()) for n in range(3)]
+
+    assert len(set(urls)) == 3
+    assert all(url.startswith("/static/search/index.") for url in urls)
+    assert index_dir.url() == urls[-1]
+    files = sorted(path.name for path in (tmp_path / "search").iterdir())
+    assert len(files) == 1 + KEEP_PREVIOUS
+    assert urls[0].rsplit("/", 1)[1] not in files
+
+
+def test_publishing_same_content_keeps_url(tmp_path: Path) -> None:
+    index_dir = StaticSearchIndexDir(tmp_path, "/static/search")
+
+    first = index_dir.publish(b"{}")
+    index_dir.publish(b"[]")
+    again = index_dir.publish(b"{}")
+
+    assert again == first
+    assert index_dir.url() == first
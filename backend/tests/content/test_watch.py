@@ -0,0 +1,118 @@
+"""Unit tests for app.content.watch — uses tmp_path, no DB access."""
+
+import os
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from app.content.sync import watch
+from app.content.watch import (
+    ContentChanges,
+    diff_snapshots,
+    snapshot,
+    watch_changes,
+)
+
+
+def _touch(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_snapshot_lists_markdown_files_only(tmp_path: Path) -> None:
+    post = _touch(tmp_path / "posts" / "a.md", "a")
+    _touch(tmp_path / "posts" / "notes.txt", "x")
+
+    snap = snapshot([tmp_path / "posts", tmp_path / "missing"])
+
+    assert set(snap) == {post}
+
+
+def test_diff_snapshots_detects_changes_and_deletions(tmp_path: Path) -> None:
+    kept = _touch(tmp_path / "kept.md", "same")
+    edited = _touch(tmp_path / "edited.md", "v1")
+    removed = _touch(tmp_path / "removed.md", "bye")
+    before = snapshot([tmp_path])
+
+    _touch(edited, "version two")
+    removed.unlink()
+    added = _touch(tmp_path / "added.md", "new")
+    changes = diff_snapshots(before, snapshot([tmp_path]))
+
+    assert changes.changed == {edited, added}
+    assert changes.deleted == {removed}
+    assert kept not in changes.changed
+
+
+def test_diff_snapshots_detects_same_size_edit(tmp_path: Path) -> None:
+    path = _touch(tmp_path / "post.md", "aaaa")
+    before = snapshot([tmp_path])
+    _touch(path, "bbbb")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert diff_snapshots(before, snapshot([tmp_path])).changed == {path}
+
+
+def test_merge_keeps_latest_state_per_file() -> None:
+    a, b = Path("a.md"), Path("b.md")
+    changes = ContentChanges(changed={a}, deleted={b})
+    changes.merge(ContentChanges(changed={b}, deleted={a}))
+
+    assert changes.changed == {b}
+    assert changes.deleted == {a}
+
+
+def _next_batch(watcher: Iterator[ContentChanges]) -> ContentChanges:
+    result: list[ContentChanges] = []
+    thread = threading.Thread(target=lambda: result.append(next(watcher)))
+    thread.start()
+    thread.join(timeout=5)
+    assert result, "watcher did not yield"
+    return result[0]
+
+
+def test_watch_changes_yields_debounced_batch(tmp_path: Path) -> None:
+    posts = tmp_path / "posts"
+    doomed = _touch(posts / "doomed.md", "x")
+    stop = threading.Event()
+    watcher = watch_changes([posts], poll_interval=0.02, debounce=0.15, stop=stop)
+
+    def _burst() -> None:
+        stop.wait(0.1)
+        _touch(posts / "one.md", "1")
+        doomed.unlink()
+        stop.wait(0.02)
+        _touch(posts / "two.md", "2")
+
+    writer = threading.Thread(target=_burst)
+    writer.start()
+    batch = _next_batch(watcher)
+    writer.join()
+    stop.set()
+
+    assert batch.changed == {posts / "one.md", posts / "two.md"}
+    assert batch.deleted == {doomed}
+
+
+def test_watch_keeps_polling_after_a_failed_batch(tmp_path: Path) -> None:
+    batches = [
+        ContentChanges(changed={tmp_path / "posts" / "a.md"}),
+        ContentChanges(changed={tmp_path / "posts" / "b.md"}),
+    ]
+    session = MagicMock()
+    sync = MagicMock(side_effect=[RuntimeError("db down"), None])
+
+    with (
+        patch("app.content.sync.watch_changes", return_value=iter(batches)),
+        patch("app.content.sync.Session") as session_cls,
+        patch("app.content.sync.sync_changed_files", sync),
+    ):
+        session_cls.return_value.__enter__.return_value = session
+        watch(tmp_path)
+
+    assert sync.call_count == 2
+    assert sync.call_args.kwargs["changed"] == batches[1].changed
+    session.rollback.assert_called_once()
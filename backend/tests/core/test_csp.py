@@ -0,0 +1,39 @@
+"""Unit tests for app.core.csp — hashes of inline template scripts."""
+
+import base64
+import hashlib
+
+import pytest
+from jinja2 import DictLoader, Environment
+
+from app.core.csp import inline_script_hashes, script_hash
+
+
+def _hashes(**templates: str) -> list[str]:
+    return inline_script_hashes(Environment(loader=DictLoader(templates)))
+
+
+def test_script_hash_is_base64_sha256() -> None:
+    digest = base64.b64encode(hashlib.sha256(b"alert(1)").digest()).decode()
+    assert script_hash("alert(1)") == f"'sha256-{digest}'"
+
+
+def test_hashes_only_executable_inline_scripts() -> None:
+    hashes = _hashes(
+        **{
+            "a.html": (
+                "<script>one()</script>"
+                '<script type="module">two()</script>'
+                '<script src="/x.js"></script>'
+                '<script type="application/ld+json">{{ data }}</script>'
+            ),
+            "b.html": "<SCRIPT>one()</SCRIPT>",
+        }
+    )
+
+    assert hashes == sorted([script_hash("one()"), script_hash("two()")])
+
+
+def test_rejects_templated_inline_script() -> None:
+    with pytest.raises(ValueError, match="page.html"):
+        _hashes(**{"page.html": "<script>var x = {{ value }};</script>"})
@@ -5,9 +5,19 @@ from unittest.mock import MagicMock, patch
 
 from fastapi.testclient import TestClient
 from httpx import Response
-
-from app.core.middleware import _extract_otel_trace_id, anonymize_ip
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.config import settings
+from app.core.middleware import (
+    SecurityHeadersMiddleware,
+    _extract_otel_trace_id,
+    anonymize_ip,
+)
 from app.main import app
+from app.pages.deps import INLINE_SCRIPT_HASHES
 
 # ---------------------------------------------------------------------------
 # anonymize_ip — pure unit tests, no fixtures needed
@@ -176,23 +186,43 @@ def _get_csp(response: Response) -> str:
     )
 
 
-def test_csp_header_contains_nonce(client: TestClient) -> None:
-    """CSP header includes a nonce in script-src."""
-    response = client.get("/api/v1/utils/health-check/")
-    csp = _get_csp(response)
-    assert "nonce-" in csp
-    assert "script-src 'self' 'nonce-" in csp
+def test_csp_header_lists_inline_script_hashes(client: TestClient) -> None:
+    """Default hash mode allows inline scripts by hash, without a nonce."""
+    csp = _get_csp(client.get("/api/v1/utils/health-check/"))
+    assert INLINE_SCRIPT_HASHES
+    assert f"script-src 'self' {' '.join(INLINE_SCRIPT_HASHES)}" in csp
+    assert "nonce-" not in csp
 
 
-def test_csp_nonce_unique_per_request(client: TestClient) -> None:
-    """Each request gets a different nonce."""
+def test_csp_header_is_identical_across_requests(client: TestClient) -> None:
+    """Hash mode has no per-request data in the policy."""
     r1 = client.get("/api/v1/utils/health-check/")
     r2 = client.get("/api/v1/utils/health-check/")
+    assert _get_csp(r1) == _get_csp(r2)
+
+
+def _nonce_app() -> Starlette:
+    async def echo_nonce(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(request.state.csp_nonce)
+
+    nonce_app = Starlette(routes=[Route("/", echo_nonce)])
+    nonce_app.add_middleware(SecurityHeadersMiddleware, script_hashes=["'sha256-abc='"])
+    return nonce_app
+
+
+def test_csp_nonce_mode_unique_per_request() -> None:
+    """Nonce mode gives each request a different nonce, shared with templates."""
+    with patch.object(settings, "CSP_MODE", "nonce"):
+        with TestClient(_nonce_app()) as nonce_client:
+            r1 = nonce_client.get("/")
+            r2 = nonce_client.get("/")
     csp1 = _get_csp(r1)
     csp2 = _get_csp(r2)
     nonces = [re.search(r"nonce-([A-Za-z0-9_-]+)", csp) for csp in [csp1, csp2]]
     assert nonces[0] and nonces[1]
     assert nonces[0].group(1) != nonces[1].group(1)
+    assert nonces[0].group(1) == r1.text
+    assert f"script-src 'self' 'nonce-{r1.text}' 'sha256-abc='" in csp1
 
 
 def test_no_hsts_in_local(client: TestClient) -> None:
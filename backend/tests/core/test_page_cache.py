@@ -0,0 +1,161 @@
+"""Tests for the page cache middleware and content version file."""
+
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.page_cache import (
+    CachedPage,
+    PageCache,
+    PageCacheMiddleware,
+    bump_content_version,
+    configure_content_version,
+)
+
+calls: list[str] = []
+
+
+async def _page(request: Request) -> Response:
+    calls.append(request.url.path)
+    nonce = request.scope.get("state", {}).get("csp_nonce", "")
+    body = f"{request.url.path} {len(calls)} nonce={nonce}"
+    if request.headers.get("HX-Request") == "true":
+        body += " partial"
+    status = 404 if request.url.path == "/missing" else 200
+    response = PlainTextResponse(body, status_code=status)
+    if request.url.path == "/cookie":
+        response.set_cookie("seen", "1")
+    return response
+
+
+async def _set_nonce(request: Request, call_next):  # type: ignore[no-untyped-def]
+    request.state.csp_nonce = request.headers.get("X-Nonce", "")
+    return await call_next(request)
+
+
+routes = [
+    Route(path, _page) for path in ("/", "/blog", "/search", "/missing", "/cookie")
+]
+
+
+@pytest.fixture()
+def client(tmp_path: Path) -> Generator[TestClient]:
+    configure_content_version(tmp_path / "content-version")
+    app = Starlette(routes=routes)
+    app.add_middleware(
+        PageCacheMiddleware,
+        routes=routes,
+        max_bytes=1024,
+        exclude={"/search"},
+        query_params={"tag", "after"},
+    )
+    app.add_middleware(BaseHTTPMiddleware, dispatch=_set_nonce)
+    calls.clear()
+    with TestClient(app) as c:
+        yield c
+
+
+def test_repeat_requests_are_served_from_cache(client: TestClient) -> None:
+    first = client.get("/blog")
+    second = client.get("/blog")
+
+    assert second.text == first.text
+    assert calls == ["/blog"]
+
+
+def test_query_order_is_normalized(client: TestClient) -> None:
+    client.get("/blog?tag=python&after=abc")
+    client.get("/blog?after=abc&tag=python")
+    client.get("/blog?tag=rust")
+
+    assert calls == ["/blog", "/blog"]
+
+
+def test_unknown_query_params_bypass_the_cache(client: TestClient) -> None:
+    client.get("/blog?x=1")
+    client.get("/blog?x=1")
+    client.get("/blog?tag=python&x=2")
+
+    assert calls == ["/blog", "/blog", "/blog"]
+    assert client.get("/blog").text.endswith(" 4 nonce=")
+
+
+def test_htmx_requests_are_cached_separately(client: TestClient) -> None:
+    full = client.get("/blog")
+    partial = client.get("/blog", headers={"HX-Request": "true"})
+    boosted = client.get("/blog", headers={"HX-Request": "true", "HX-Boosted": "true"})
+
+    assert "partial" not in full.text
+    assert "partial" in partial.text
+    assert len(calls) == 3
+    assert client.get("/blog", headers={"HX-Request": "true"}).text == partial.text
+    assert boosted.status_code == 200
+    assert len(calls) == 3
+
+
+def test_hosts_and_schemes_are_cached_separately(client: TestClient) -> None:
+    client.get("http://example.com/blog")
+    client.get("http://example.org/blog")
+    client.get("https://example.com/blog")
+    client.get("http://example.com/blog")
+
+    assert calls == ["/blog", "/blog", "/blog"]
+
+
+def test_excluded_errors_and_cookies_are_not_cached(client: TestClient) -> None:
+    for path in ("/search", "/missing", "/cookie"):
+        client.get(path)
+        client.get(path)
+
+    assert calls == ["/search", "/search", "/missing", "/missing", "/cookie", "/cookie"]
+
+
+def test_content_version_bump_clears_cache(client: TestClient) -> None:
+    client.get("/")
+    bump_content_version()
+    client.get("/")
+    client.get("/")
+
+    assert calls == ["/", "/"]
+
+
+def test_nonce_is_replaced_on_replay(client: TestClient) -> None:
+    first = client.get("/", headers={"X-Nonce": "aaaaaaaaaaaaaaaa"})
+    second = client.get("/", headers={"X-Nonce": "bbbbbbbbbbbbbbbb"})
+
+    assert first.text.endswith("nonce=aaaaaaaaaaaaaaaa")
+    assert second.text.endswith("nonce=bbbbbbbbbbbbbbbb")
+    assert second.headers["content-length"] == str(len(second.content))
+    assert calls == ["/"]
+
+
+def test_no_caching_without_content_version(client: TestClient) -> None:
+    configure_content_version(None)
+
+    client.get("/")
+    client.get("/")
+
+    assert calls == ["/", "/"]
+
+
+def test_page_cache_evicts_least_recently_used() -> None:
+    cache = PageCache(max_bytes=10)
+    page = CachedPage(200, [], b"xxxx")
+    cache.put(("a",), page)
+    cache.put(("b",), page)
+    assert cache.get(("a",)) is page  # "b" is now least recently used
+
+    cache.put(("c",), page)
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) is page
+    assert cache.size == 8
+    cache.put(("big",), CachedPage(200, [], b"x" * 11))
+    assert cache.get(("big",)) is None
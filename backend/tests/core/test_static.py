@@ -0,0 +1,22 @@
+"""Tests for serving fingerprinted static files."""
+
+from pathlib import Path
+
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from app.core.static import IMMUTABLE_CACHE_CONTROL, ImmutableStaticFiles
+
+
+def test_immutable_static_files_set_cache_control(tmp_path: Path) -> None:
+    (tmp_path / "index.abc.json").write_text("{}")
+    app = Starlette(routes=[Mount("/s", ImmutableStaticFiles(directory=tmp_path))])
+
+    with TestClient(app) as client:
+        response = client.get("/s/index.abc.json")
+        missing = client.get("/s/index.def.json")
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert missing.status_code == 404
@@ -1,17 +1,39 @@
-from datetime import datetime
+import asyncio
+from datetime import UTC, datetime
+from typing import Any
 
 import pytest
 from pydantic import ValidationError
-from sqlmodel import Session
+from sqlalchemy import event, inspect, update
+from sqlalchemy.exc import InvalidRequestError
+from sqlmodel import Session, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.crud.bulk import SLUG_CONFLICT
 from app.crud.post import (
+    FUZZY_MIN_CHARS,
+    SNIPPET_END,
+    SNIPPET_START,
+    PostCursor,
+    bulk_upsert_posts,
+    delete_posts_not_in,
+    fuzzy_search_posts,
     get_or_create_tag,
+    get_or_create_tags,
     get_post_by_slug,
+    get_post_by_slug_async,
     get_posts,
-    get_tags_with_counts,
+    get_posts_async,
+    get_published_tag_counts,
+    reconcile_post_tags,
+    reconcile_tags_for_posts,
+    refresh_post_search_vectors,
+    refresh_tag_post_counts,
     search_posts,
+    suggest_search_term,
     upsert_post,
 )
+from app.models.post import Post, PostTagLink
 from app.schemas.post import PostUpsert, TagCreate
 from tests.utils.utils import random_lower_string
 
@@ -81,6 +103,30 @@ def test_get_post_by_slug_not_found(db: Session) -> None:
     assert found is None
 
 
+def test_async_reads_match_sync_reads(db: Session, async_db: AsyncSession) -> None:
+    tag = get_or_create_tag(
+        session=db, data=TagCreate(name="Async", slug=f"async-{random_lower_string()}")
+    )
+    post = upsert_post(
+        session=db,
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(published=True),
+    )
+    post.tags.append(tag)
+    db.commit()
+
+    async def _read() -> tuple[Post | None, list[Post], int]:
+        found = await get_post_by_slug_async(session=async_db, slug=post.slug)
+        posts, has_more = await get_posts_async(session=async_db, tag_slug=tag.slug)
+        return found, posts, has_more
+
+    found, posts, has_more = asyncio.run(_read())
+
+    assert found is not None
+    assert [t.slug for t in found.tags] == [tag.slug]  # eager-loaded, no lazy IO
+    assert (posts, has_more) == get_posts(session=db, tag_slug=tag.slug)
+
+
 def test_get_posts_published_only(db: Session) -> None:
     slug_pub = f"pub-{random_lower_string()}"
     slug_draft = f"draft-{random_lower_string()}"
@@ -96,12 +142,108 @@ def test_get_posts_published_only(db: Session) -> None:
     )
     db.commit()
 
-    posts, count = get_posts(session=db, published_only=True)
+    posts, _ = get_posts(session=db, published_only=True)
     slugs = [p.slug for p in posts]
     assert slug_pub in slugs
     assert slug_draft not in slugs
 
 
+def test_get_posts_keyset_pages_match_offset_order(db: Session) -> None:
+    tag = get_or_create_tag(
+        session=db,
+        data=TagCreate(name="Keyset", slug=f"keyset-{random_lower_string()}"),
+    )
+    same_day = datetime(2024, 3, 1, tzinfo=UTC)
+    for published_at in (
+        datetime(2024, 5, 1, tzinfo=UTC),
+        same_day,
+        same_day,
+        same_day,
+        None,
+        datetime(2023, 1, 1, tzinfo=UTC),
+    ):
+        post = upsert_post(
+            session=db,
+            source_path=f"posts/{random_lower_string()}.md",
+            data=_post_data(published=True, published_at=published_at),
+        )
+        post.tags.append(tag)
+    db.commit()
+
+    everything, has_more = get_posts(session=db, tag_slug=tag.slug)
+    assert len(everything) == 6
+    assert not has_more
+    assert everything[-1].published_at is None  # undated posts sort last
+
+    walked: list[Post] = []
+    cursor: PostCursor | None = None
+    while True:
+        page, has_more = get_posts(session=db, tag_slug=tag.slug, limit=2, after=cursor)
+        walked += page
+        if not has_more:
+            break
+        cursor = PostCursor.after(page[-1])
+
+    assert [p.id for p in walked] == [p.id for p in everything]
+
+
+def test_get_posts_detects_more_without_count_query(db: Session) -> None:
+    tag = get_or_create_tag(
+        session=db, data=TagCreate(name="More", slug=f"more-{random_lower_string()}")
+    )
+    for _ in range(3):
+        post = upsert_post(
+            session=db,
+            source_path=f"posts/{random_lower_string()}.md",
+            data=_post_data(published=True),
+        )
+        post.tags.append(tag)
+    db.commit()
+
+    statements: list[str] = []
+
+    def _record(_conn: Any, _cursor: Any, statement: str, *_args: Any) -> None:
+        statements.append(statement)
+
+    bind = db.connection()
+    event.listen(bind, "before_cursor_execute", _record)
+    try:
+        first, first_more = get_posts(session=db, tag_slug=tag.slug, limit=2)
+        rest, rest_more = get_posts(session=db, tag_slug=tag.slug, skip=2, limit=2)
+    finally:
+        event.remove(bind, "before_cursor_execute", _record)
+
+    assert (len(first), first_more) == (2, True)
+    assert (len(rest), rest_more) == (1, False)
+    assert not any("count(" in s.lower() for s in statements)
+
+
+def test_list_reads_defer_post_bodies(db: Session) -> None:
+    tag = get_or_create_tag(
+        session=db, data=TagCreate(name="Slim", slug=f"slim-{random_lower_string()}")
+    )
+    post = upsert_post(
+        session=db,
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(published=True, content_html="<p>body</p>"),
+    )
+    post.tags.append(tag)
+    db.commit()
+    tag_slug = tag.slug
+    db.expunge_all()
+
+    [listed], _ = get_posts(session=db, tag_slug=tag_slug)
+    unloaded = inspect(listed).unloaded
+    assert {"content_markdown", "content_html", "toc"} <= unloaded
+    assert "title" not in unloaded
+    with pytest.raises(InvalidRequestError):
+        _ = listed.content_html
+
+    db.expunge_all()
+    [full], _ = get_posts(session=db, tag_slug=tag_slug, with_body=True)
+    assert full.content_html == "<p>body</p>"
+
+
 def test_get_or_create_tag_creates(db: Session) -> None:
     name = f"Tag {random_lower_string()}"
     slug = f"tag-{random_lower_string()}"
@@ -122,7 +264,84 @@ def test_get_or_create_tag_returns_existing(db: Session) -> None:
     assert tag1.id == tag2.id
 
 
-def test_get_tags_with_counts(db: Session) -> None:
+def test_get_or_create_tags_creates_missing_and_reuses_existing(db: Session) -> None:
+    existing_slug = f"tag-{random_lower_string()}"
+    existing = get_or_create_tag(
+        session=db, data=TagCreate(name=f"Tag {existing_slug}", slug=existing_slug)
+    )
+    new_slug = f"tag-{random_lower_string()}"
+
+    tag_ids = get_or_create_tags(
+        session=db,
+        tag_creates=[
+            TagCreate(name=f"Tag {existing_slug}", slug=existing_slug),
+            TagCreate(name=f"Tag {new_slug}", slug=new_slug),
+            TagCreate(name=f"Other {new_slug}", slug=new_slug),
+        ],
+    )
+    db.commit()
+
+    assert tag_ids[existing_slug] == existing.id
+    created = get_or_create_tag(
+        session=db, data=TagCreate(name="ignored", slug=new_slug)
+    )
+    assert created.id == tag_ids[new_slug]
+    assert created.name == f"Tag {new_slug}"
+
+
+def _tag(slug: str) -> TagCreate:
+    return TagCreate(name=f"Tag {slug}", slug=slug)
+
+
+def test_reconcile_post_tags_applies_difference(db: Session) -> None:
+    keep, drop, add = (f"tag-{random_lower_string()}" for _ in range(3))
+    post = upsert_post(
+        session=db, source_path=f"posts/{random_lower_string()}.md", data=_post_data()
+    )
+    reconcile_post_tags(session=db, post=post, tag_creates=[_tag(keep), _tag(drop)])
+    db.commit()
+    assert sorted(t.slug for t in post.tags) == sorted([keep, drop])
+
+    reconcile_post_tags(session=db, post=post, tag_creates=[_tag(keep), _tag(add)])
+    db.commit()
+    assert sorted(t.slug for t in post.tags) == sorted([keep, add])
+
+
+def test_reconcile_tags_unchanged_writes_nothing(db: Session) -> None:
+    slugs = [f"tag-{random_lower_string()}" for _ in range(3)]
+    posts = [
+        upsert_post(
+            session=db,
+            source_path=f"posts/{random_lower_string()}.md",
+            data=_post_data(),
+        )
+        for _ in range(2)
+    ]
+    post_tags = {post.id: [_tag(slug) for slug in slugs] for post in posts}
+    reconcile_tags_for_posts(session=db, post_tags=post_tags)
+    db.commit()
+
+    statements: list[str] = []
+
+    def _record(_conn: Any, _cursor: Any, statement: str, *_args: Any) -> None:
+        statements.append(statement)
+
+    bind = db.connection()
+    event.listen(bind, "before_cursor_execute", _record)
+    try:
+        reconcile_tags_for_posts(session=db, post_tags=post_tags)
+    finally:
+        event.remove(bind, "before_cursor_execute", _record)
+
+    assert all(s.lstrip().upper().startswith("SELECT") for s in statements)
+    assert len(statements) == 2
+    links = db.exec(
+        select(PostTagLink).where(PostTagLink.post_id.in_(post_tags))  # type: ignore[attr-defined]
+    ).all()
+    assert len(links) == 6
+
+
+def test_get_published_tag_counts(db: Session) -> None:
     tag_slug = f"tag-{random_lower_string()}"
     tag = get_or_create_tag(
         session=db, data=TagCreate(name=f"Tag {tag_slug}", slug=tag_slug)
@@ -138,13 +357,42 @@ def test_get_tags_with_counts(db: Session) -> None:
     post.tags.append(tag)
     db.add(post)
     db.commit()
+    refresh_tag_post_counts(session=db)
+    db.commit()
 
-    results = get_tags_with_counts(session=db, published_only=True)
+    results = get_published_tag_counts(session=db)
     tag_map = {t.slug: c for t, c in results}
     assert tag_slug in tag_map
     assert tag_map[tag_slug] == 1
 
 
+def test_refresh_tag_post_counts_writes_only_changed_tags(db: Session) -> None:
+    tag = get_or_create_tag(
+        session=db,
+        data=TagCreate(name="Counted", slug=f"counted-{random_lower_string()}"),
+    )
+    post = upsert_post(
+        session=db,
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(published=True),
+    )
+    post.tags.append(tag)
+    db.commit()
+    refresh_tag_post_counts(session=db)
+    db.commit()
+
+    counts = {t.slug: count for t, count in get_published_tag_counts(session=db)}
+    assert counts[tag.slug] == 1
+    assert refresh_tag_post_counts(session=db) == 0
+
+    post.published = False
+    db.add(post)
+    db.commit()
+    assert refresh_tag_post_counts(session=db) >= 1
+    assert tag.post_count == 0
+    assert tag.slug not in {t.slug for t, _ in get_published_tag_counts(session=db)}
+
+
 def test_post_upsert_rejects_long_title() -> None:
     with pytest.raises(ValidationError):
         PostUpsert(
@@ -224,60 +472,295 @@ def test_get_posts_filtered_by_tag(db: Session) -> None:
     )
     db.commit()
 
-    posts, count = get_posts(session=db, tag_slug=tag_slug, published_only=True)
+    posts, has_more = get_posts(session=db, tag_slug=tag_slug, published_only=True)
     slugs = [p.slug for p in posts]
     assert tagged_slug in slugs
     assert untagged_slug not in slugs
-    assert count == 1
+    assert not has_more
 
 
-def test_search_escapes_percent(db: Session) -> None:
-    upsert_post(
+def test_search_ranks_by_weighted_fields_with_snippets(db: Session) -> None:
+    word = f"zq{random_lower_string()[:8]}"
+    tag = get_or_create_tag(session=db, data=TagCreate(name=word, slug=word))
+    in_body = upsert_post(
         session=db,
-        source_path="posts/percent.md",
+        source_path=f"posts/{random_lower_string()}.md",
         data=_post_data(
-            title="100% Complete",
-            slug=f"percent-{random_lower_string()}",
             published=True,
+            content_markdown=f"Some text before {word} and some after.",
+        ),
+    )
+    in_title = upsert_post(
+        session=db,
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(title=f"All about {word}", published=True),
+    )
+    tagged = upsert_post(
+        session=db,
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(published=True),
+    )
+    tagged.tags.append(tag)
+    draft = upsert_post(
+        session=db,
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(title=f"Draft {word}", published=False),
+    )
+    db.commit()
+    refresh_post_search_vectors(session=db)
+
+    results = search_posts(session=db, query=word)
+
+    assert [post.id for post, _ in results] == [in_title.id, tagged.id, in_body.id]
+    assert draft.id not in {post.id for post, _ in results}
+    body_snippet = results[-1][1]
+    assert f"{SNIPPET_START}{word}{SNIPPET_END}" in body_snippet
+
+
+def test_search_stems_terms(db: Session) -> None:
+    post = upsert_post(
+        session=db,
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(
+            published=True, content_markdown="Notes on indexing zqstemmed tables."
         ),
     )
+    db.commit()
+    refresh_post_search_vectors(session=db)
+
+    results = search_posts(session=db, query="indexes zqstemmed")
+
+    assert [hit.id for hit, _ in results] == [post.id]
+
+
+@pytest.mark.parametrize("query", ["%", "_", "\\", "a & | ! (", '"unclosed'])
+def test_search_treats_operators_as_plain_text(db: Session, query: str) -> None:
     upsert_post(
         session=db,
-        source_path=f"posts/other-{random_lower_string()}.md",
-        data=_post_data(title=f"Other Post {random_lower_string()}", published=True),
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(title="100% my_var C:\\Users", published=True),
     )
     db.commit()
+    refresh_post_search_vectors(session=db)
 
-    results = search_posts(session=db, query="%")
-    titles = [p.title for p in results]
-    assert "100% Complete" in titles
-    assert all("%" in t for t in titles)
+    assert search_posts(session=db, query=query) == []
 
 
-def test_search_escapes_underscore(db: Session) -> None:
-    slug = f"myvar-{random_lower_string()}"
+def test_refresh_post_search_vectors_limits_to_source_paths(db: Session) -> None:
+    paths = [f"posts/{random_lower_string()}.md" for _ in range(2)]
+    for path in paths:
+        upsert_post(session=db, source_path=path, data=_post_data(published=True))
+    db.commit()
+    refresh_post_search_vectors(session=db)
+    assert refresh_post_search_vectors(session=db) == 0
+
+    db.execute(
+        update(Post).where(col(Post.source_path).in_(paths)).values(title="zqrenamed")
+    )
+
+    assert refresh_post_search_vectors(session=db, source_paths=paths[:1]) == 1
+    [(hit, _)] = search_posts(session=db, query="zqrenamed")
+    assert hit.source_path == paths[0]
+
+
+@pytest.mark.usefixtures("pg_trgm")
+def test_fuzzy_search_matches_prefixes_typos_and_tags(db: Session) -> None:
+    word = f"zq{random_lower_string()[:8]}"
+    titled = upsert_post(
+        session=db,
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(title=f"Tuning {word} indexes", published=True),
+    )
+    tagged = upsert_post(
+        session=db,
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(published=True),
+    )
+    tagged.tags.append(
+        get_or_create_tag(session=db, data=TagCreate(name=word, slug=word))
+    )
     upsert_post(
         session=db,
-        source_path=f"posts/{slug}.md",
-        data=_post_data(title="my_var guide", slug=slug, published=True),
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(title=f"Draft {word}", published=False),
     )
     db.commit()
 
-    results = search_posts(session=db, query="_")
-    titles = [p.title for p in results]
-    assert "my_var guide" in titles
-    assert all("_" in t for t in titles)
+    typo = word[:-1] + ("x" if word[-1] != "x" else "y")
+    assert [p.id for p in fuzzy_search_posts(session=db, query=word)] == [
+        titled.id,
+        tagged.id,
+    ]
+    assert {p.id for p in fuzzy_search_posts(session=db, query=typo)} == {
+        titled.id,
+        tagged.id,
+    }
+    assert titled.id in {p.id for p in fuzzy_search_posts(session=db, query="tu")}
+
+
+@pytest.mark.usefixtures("pg_trgm")
+def test_fuzzy_search_short_query_matches_only_prefixes(db: Session) -> None:
+    word = f"zq{random_lower_string()[:8]}"
+    leading = upsert_post(
+        session=db,
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(title=f"{word} first", published=True),
+    )
+    inner = upsert_post(
+        session=db,
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(title=f"Later {word}", published=True),
+    )
+    tagged = upsert_post(
+        session=db,
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(published=True),
+    )
+    tagged.tags.append(
+        get_or_create_tag(session=db, data=TagCreate(name=word, slug=word))
+    )
+    db.commit()
+
+    found = {p.id for p in fuzzy_search_posts(session=db, query=word[:2])}
+
+    assert len(word[:2]) < FUZZY_MIN_CHARS
+    assert {leading.id, tagged.id} <= found
+    assert inner.id not in found
 
 
-def test_search_escapes_backslash(db: Session) -> None:
-    slug = f"cpath-{random_lower_string()}"
+@pytest.mark.usefixtures("pg_trgm")
+@pytest.mark.parametrize("query", ["%", "_", "\\"])
+def test_fuzzy_search_escapes_like_wildcards(db: Session, query: str) -> None:
     upsert_post(
         session=db,
-        source_path=f"posts/{slug}.md",
-        data=_post_data(title="C:\\Users Path", slug=slug, published=True),
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(title="zqplain title", published=True),
     )
     db.commit()
 
-    results = search_posts(session=db, query="\\")
-    titles = [p.title for p in results]
-    assert "C:\\Users Path" in titles
+    assert fuzzy_search_posts(session=db, query=query) == []
+
+
+@pytest.mark.usefixtures("pg_trgm")
+def test_suggest_search_term_prefers_closest_published_term(db: Session) -> None:
+    word = f"zq{random_lower_string()[:8]}"
+    upsert_post(
+        session=db,
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(title=f"Draft {word}plural", published=False),
+    )
+    upsert_post(
+        session=db,
+        source_path=f"posts/{random_lower_string()}.md",
+        data=_post_data(title=f"About {word}", published=True),
+    )
+    db.commit()
+
+    assert suggest_search_term(session=db, query=word[:-1]) == f"About {word}"
+    assert suggest_search_term(session=db, query="qqqqqqqqqq") is None
+
+
+def test_bulk_upsert_posts_inserts_updates_and_skips_unchanged(db: Session) -> None:
+    unchanged_source = f"posts/{random_lower_string()}.md"
+    updated_source = f"posts/{random_lower_string()}.md"
+    new_source = f"posts/{random_lower_string()}.md"
+    unchanged_data = _post_data()
+    unchanged = upsert_post(
+        session=db, source_path=unchanged_source, data=unchanged_data, source_hash="a"
+    )
+    updated = upsert_post(session=db, source_path=updated_source, data=_post_data())
+    db.commit()
+
+    new_data = _post_data()
+    ids, failures = bulk_upsert_posts(
+        session=db,
+        rows=[
+            (unchanged_source, unchanged_data, "a"),
+            (updated_source, _post_data(title="Bulk Updated"), "b"),
+            (new_source, new_data, "c"),
+        ],
+    )
+    db.commit()
+
+    assert failures == {}
+    assert ids[unchanged_source] == unchanged.id
+    assert ids[updated_source] == updated.id
+    posts = {
+        post.source_path: post
+        for post in (
+            db.get(Post, post_id, populate_existing=True) for post_id in ids.values()
+        )
+        if post
+    }
+    assert posts[unchanged_source].updated_at is None
+    assert posts[updated_source].title == "Bulk Updated"
+    assert posts[updated_source].source_hash == "b"
+    assert posts[updated_source].updated_at is not None
+    assert posts[new_source].slug == new_data.slug
+    assert posts[new_source].created_at is not None
+    assert posts[new_source].updated_at is None
+
+
+def test_bulk_upsert_posts_hash_only_change_keeps_updated_at(db: Session) -> None:
+    source = f"posts/{random_lower_string()}.md"
+    data = _post_data()
+    upsert_post(session=db, source_path=source, data=data, source_hash="old")
+    db.commit()
+
+    ids, _ = bulk_upsert_posts(session=db, rows=[(source, data, "new")])
+    db.commit()
+
+    post = db.get(Post, ids[source], populate_existing=True)
+    assert post
+    assert post.source_hash == "new"
+    assert post.updated_at is None
+
+
+def test_bulk_upsert_posts_reports_slug_conflict(db: Session) -> None:
+    slug = f"post-{random_lower_string()}"
+    holder = f"posts/{random_lower_string()}.md"
+    upsert_post(session=db, source_path=holder, data=_post_data(slug=slug))
+    db.commit()
+
+    conflicting = f"posts/{random_lower_string()}.md"
+    duplicate = f"posts/{random_lower_string()}.md"
+    other_slug = f"post-{random_lower_string()}"
+    ok = f"posts/{random_lower_string()}.md"
+    ids, failures = bulk_upsert_posts(
+        session=db,
+        rows=[
+            (conflicting, _post_data(slug=slug), None),
+            (ok, _post_data(slug=other_slug), None),
+            (duplicate, _post_data(slug=other_slug), None),
+        ],
+    )
+    db.commit()
+
+    assert failures == {conflicting: SLUG_CONFLICT, duplicate: SLUG_CONFLICT}
+    assert set(ids) == {ok}
+    assert get_post_by_slug(session=db, slug=other_slug) is not None
+
+
+def test_delete_posts_not_in_removes_only_orphans(db: Session) -> None:
+    keep = f"posts/{random_lower_string()}.md"
+    orphan = f"posts/{random_lower_string()}.md"
+    kept = upsert_post(session=db, source_path=keep, data=_post_data())
+    removed = upsert_post(session=db, source_path=orphan, data=_post_data())
+    reconcile_post_tags(
+        session=db, post=removed, tag_creates=[_tag(f"tag-{random_lower_string()}")]
+    )
+    db.commit()
+    removed_id = removed.id
+    existing = db.exec(
+        select(Post.source_path).where(Post.source_path.is_not(None))
+    ).all()  # type: ignore[union-attr]
+    survivors = {path for path in existing if path != orphan}
+
+    deleted = delete_posts_not_in(session=db, source_paths=survivors)
+    db.commit()
+
+    assert deleted == 1
+    assert get_post_by_slug(session=db, slug=kept.slug) is not None
+    assert db.get(Post, removed_id) is None
+    links = db.exec(select(PostTagLink).where(PostTagLink.post_id == removed_id)).all()
+    assert links == []
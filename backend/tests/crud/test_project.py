@@ -2,14 +2,17 @@ from datetime import UTC, datetime
 
 import pytest
 from pydantic import ValidationError
-from sqlmodel import Session
+from sqlmodel import Session, select
 
 from app.crud.project import (
+    bulk_upsert_projects,
+    delete_projects_not_in,
     get_project_by_slug,
     get_projects,
     update_github_metadata,
     upsert_project,
 )
+from app.models.project import Project
 from app.schemas.project import ProjectUpsert
 from tests.utils.utils import random_lower_string
 
@@ -78,8 +81,7 @@ def test_get_projects(db: Session) -> None:
     upsert_project(session=db, source_path=source, data=data)
     db.commit()
 
-    projects, count = get_projects(session=db)
-    assert count >= 1
+    projects, _ = get_projects(session=db)
     slugs = [p.slug for p in projects]
     assert data.slug in slugs
 
@@ -100,15 +102,13 @@ def test_get_projects_featured_only(db: Session) -> None:
     )
     db.commit()
 
-    projects, _count = get_projects(session=db, featured_only=True)
+    projects, _ = get_projects(session=db, featured_only=True)
     slugs = [p.slug for p in projects]
     assert featured_slug in slugs
     assert normal_slug not in slugs
 
 
 def test_get_projects_pagination(db: Session) -> None:
-    _, count_before = get_projects(session=db)
-
     slugs = []
     for i in range(3):
         slug = f"page-{random_lower_string()}"
@@ -120,13 +120,18 @@ def test_get_projects_pagination(db: Session) -> None:
         )
     db.commit()
 
-    projects, count = get_projects(session=db, skip=0, limit=2)
+    everything, has_more = get_projects(session=db, limit=1000)
+    assert not has_more
+    total = len(everything)
+    assert total >= 3
+
+    projects, has_more = get_projects(session=db, skip=0, limit=2)
     assert len(projects) == 2
-    assert count == count_before + 3
+    assert has_more
 
-    projects2, count2 = get_projects(session=db, skip=count - 1, limit=2)
+    projects2, has_more2 = get_projects(session=db, skip=total - 1, limit=2)
     assert len(projects2) == 1
-    assert count2 == count
+    assert not has_more2
 
 
 def test_get_project_by_slug(db: Session) -> None:
@@ -186,3 +191,61 @@ def test_update_github_metadata(db: Session) -> None:
     assert project.github_language == "Python"
     assert project.github_forks == 5
     assert project.github_last_pushed_at is not None
+
+
+def test_bulk_upsert_projects(db: Session) -> None:
+    existing_source = f"projects/{random_lower_string()}.md"
+    existing = upsert_project(
+        session=db, source_path=existing_source, data=_project_data()
+    )
+    db.commit()
+
+    new_source = f"projects/{random_lower_string()}.md"
+    ids, failures = bulk_upsert_projects(
+        session=db,
+        rows=[
+            (existing_source, _project_data(title="Renamed", sort_order=3), "h1"),
+            (new_source, _project_data(featured=True), "h2"),
+        ],
+    )
+    db.commit()
+
+    assert failures == {}
+    assert ids[existing_source] == existing.id
+    projects = {
+        project.source_path: project
+        for project in (
+            db.get(Project, project_id, populate_existing=True)
+            for project_id in ids.values()
+        )
+        if project
+    }
+    assert projects[existing_source].title == "Renamed"
+    assert projects[existing_source].sort_order == 3
+    assert projects[existing_source].updated_at is not None
+    assert projects[new_source].featured is True
+    assert projects[new_source].source_hash == "h2"
+
+
+def test_delete_projects_not_in_keeps_listed_and_manual_rows(db: Session) -> None:
+    keep = f"projects/{random_lower_string()}.md"
+    orphan = f"projects/{random_lower_string()}.md"
+    upsert_project(session=db, source_path=keep, data=_project_data())
+    upsert_project(session=db, source_path=orphan, data=_project_data())
+    manual = Project(title="Manual", slug=f"manual-{random_lower_string()}")
+    db.add(manual)
+    db.commit()
+    existing = db.exec(
+        select(Project.source_path).where(Project.source_path.is_not(None))  # type: ignore[union-attr]
+    ).all()
+
+    deleted = delete_projects_not_in(
+        session=db, source_paths={path for path in existing if path != orphan}
+    )
+    db.commit()
+
+    assert deleted == 1
+    remaining = set(db.exec(select(Project.source_path)).all())
+    assert keep in remaining
+    assert orphan not in remaining
+    assert get_project_by_slug(session=db, slug=manual.slug) is not None
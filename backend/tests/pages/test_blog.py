@@ -1,8 +1,23 @@
+import html
+import re
+from pathlib import Path
+from typing import Any
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
-from app.crud.post import get_or_create_tag, upsert_post
+from app.content.static_search_index import (
+    configure_static_search_index,
+    get_static_search_index_dir,
+)
+from app.core.csp import script_hash
+from app.core.page_cache import bump_content_version, configure_content_version
+from app.crud.post import (
+    get_or_create_tag,
+    refresh_post_search_vectors,
+    upsert_post,
+)
 from app.models.post import Post
 from app.schemas.post import PostUpsert, TagCreate
 from tests.utils.utils import random_lower_string
@@ -19,6 +34,7 @@ def _make_post(
     slug: str | None = None,
     title: str | None = None,
     content_html: str = "<h1>Hello</h1>",
+    toc: list[dict[str, Any]] | None = None,
 ) -> Post:
     slug = slug or f"test-{random_lower_string()}"
     title = title or f"Post {random_lower_string()}"
@@ -27,6 +43,7 @@ def _make_post(
         slug=slug,
         content_markdown="# Hello",
         content_html=content_html,
+        toc=toc or [],
         published=published,
     )
     post = upsert_post(session=db, source_path=f"posts/{slug}.md", data=data)
@@ -60,7 +77,14 @@ def seed_posts(db: Session) -> None:
             '<h3 id="details">Details</h3><p>More text</p>'
             '<h2 id="conclusion">Conclusion</h2><p>End</p>'
         ),
+        toc=[
+            {"level": 2, "id": "intro", "text": "Introduction"},
+            {"level": 3, "id": "details", "text": "Details"},
+            {"level": 2, "id": "conclusion", "text": "Conclusion"},
+        ],
     )
+    refresh_post_search_vectors(session=db)
+    db.commit()
 
 
 # ---------------------------------------------------------------------------
@@ -138,6 +162,36 @@ def test_blog_htmx_partial(client: TestClient) -> None:
     assert "Published Post" in response.text
 
 
+def test_blog_list_load_more_uses_cursor(client: TestClient, db: Session) -> None:
+    tag = get_or_create_tag(
+        session=db, data=TagCreate(name="Paged", slug=f"paged-{random_lower_string()}")
+    )
+    for i in range(12):
+        post = _make_post(db, slug=f"paged-{i:02d}-{random_lower_string()}")
+        post.tags.append(tag)
+    db.commit()
+
+    first = client.get(f"/blog?tag={tag.slug}", headers={"HX-Request": "true"})
+    load_more = re.search(r'hx-get="(/blog\?after=[^"]+)"', first.text)
+    assert load_more is not None
+    next_path = html.unescape(load_more.group(1))
+    assert "skip=" not in next_path
+
+    second = client.get(next_path, headers={"HX-Request": "true"})
+    assert second.status_code == 200
+    assert second.text.count('class="post-card') == 2
+    assert "Load more" not in second.text
+
+    legacy = client.get(f"/blog?tag={tag.slug}&skip=10", headers={"HX-Request": "true"})
+    assert legacy.status_code == 200
+    assert legacy.text.count('class="post-card') == 2
+
+
+def test_blog_list_invalid_cursor_returns_400(client: TestClient) -> None:
+    response = client.get("/blog?after=not-a-cursor")
+    assert response.status_code == 400
+
+
 @pytest.mark.usefixtures("seed_posts")
 def test_search_page(client: TestClient) -> None:
     response = client.get("/search?q=Published")
@@ -154,6 +208,14 @@ def test_search_htmx_partial(client: TestClient) -> None:
     assert "Published Post" in response.text
 
 
+@pytest.mark.usefixtures("seed_posts")
+def test_search_results_highlight_body_matches(client: TestClient) -> None:
+    response = client.get("/search?q=hello", headers={"HX-Request": "true"})
+    assert response.status_code == 200
+    assert '<p class="post-snippet">' in response.text
+    assert "<mark>Hello</mark>" in response.text
+
+
 @pytest.mark.usefixtures("seed_posts")
 def test_search_no_results(client: TestClient) -> None:
     response = client.get("/search?q=xyznonexistent")
@@ -174,6 +236,69 @@ def test_search_excludes_drafts(client: TestClient) -> None:
     assert "Draft Post" not in response.text
 
 
+@pytest.mark.usefixtures("seed_posts", "pg_trgm")
+def test_fuzzy_search_matches_prefix(client: TestClient) -> None:
+    response = client.get("/search?q=Publ&fuzzy=true", headers={"HX-Request": "true"})
+    assert response.status_code == 200
+    assert "Published Post" in response.text
+    assert "Draft Post" not in response.text
+
+
+@pytest.mark.usefixtures("seed_posts", "pg_trgm")
+def test_fuzzy_search_suggests_when_nothing_matches(client: TestClient) -> None:
+    response = client.get(
+        "/search?q=Publishing+Postmortem&fuzzy=true", headers={"HX-Request": "true"}
+    )
+    assert response.status_code == 200
+    assert "No results" in response.text
+    assert "Did you mean" in response.text
+    assert "Published Post" in response.text
+
+
+def test_search_island_points_at_static_index(
+    client: TestClient, tmp_path: Path
+) -> None:
+    assert "data-index" not in client.get("/search").text
+
+    configure_static_search_index(tmp_path)
+    url = get_static_search_index_dir().publish(b"{}")  # type: ignore[union-attr]
+
+    assert f'data-index="{url}"' in client.get("/search").text
+
+
+def test_pages_are_cached_until_content_version_bump(
+    client: TestClient, db: Session, tmp_path: Path
+) -> None:
+    configure_content_version(tmp_path / "content-version")
+    _make_post(db, slug="cached-first", title="Cached First")
+    first = client.get("/")
+    _make_post(db, slug="cached-second", title="Cached Second")
+    second = client.get("/")
+
+    assert "Cached First" in second.text
+    assert "Cached Second" not in second.text
+    assert second.content == first.content
+    assert (
+        second.headers["content-security-policy"]
+        == first.headers["content-security-policy"]
+    )
+
+    bump_content_version()
+
+    assert "Cached Second" in client.get("/").text
+
+
+def test_inline_scripts_match_csp_hashes(client: TestClient) -> None:
+    response = client.get("/")
+    csp = response.headers["content-security-policy"]
+    scripts = re.findall(r"<script>(.*?)</script>", response.text, re.DOTALL)
+
+    assert scripts
+    for script in scripts:
+        assert script_hash(script) in csp
+    assert "nonce" not in response.text
+
+
 @pytest.mark.usefixtures("seed_posts")
 def test_blog_detail_has_jsonld(client: TestClient) -> None:
     response = client.get("/blog/published-post")
@@ -139,3 +139,26 @@ def test_sitemap_contains_static_pages(client: TestClient) -> None:
         and loc.rstrip("/").endswith("/privacy")
         for loc in locs
     )
+
+
+def test_list_views_render_without_post_bodies(client: TestClient, db: Session) -> None:
+    _seed_published_posts(db)
+    # Start from an empty identity map, as a real request does, so the list
+    # queries' deferred body columns are actually unloaded.
+    db.expunge_all()
+
+    for path in (
+        "/",
+        "/blog",
+        "/search?q=Post",
+        "/feed.xml",
+        "/sitemap.xml",
+        "/llms.txt",
+        "/projects",
+    ):
+        assert client.get(path).status_code == 200, path
+
+    db.expunge_all()
+    response = client.get("/llms-full.txt")
+    assert response.status_code == 200
+    assert "# Hello" in response.text
@@ -1,9 +1,11 @@
 from datetime import UTC, datetime
+from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
+from app.core.config import settings
 from app.crud.project import upsert_project
 from app.models.project import Project
 from app.schemas.project import ProjectUpsert
@@ -104,6 +106,30 @@ def test_privacy_has_canonical(client: TestClient) -> None:
     assert "/privacy" in response.text
 
 
+def test_other_page_served_at_its_slug(
+    client: TestClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pages_dir = tmp_path / "pages"
+    pages_dir.mkdir()
+    (pages_dir / "uses.md").write_text(
+        "---\ntitle: Uses\n---\nMy **tools**.", encoding="utf-8"
+    )
+    monkeypatch.setattr("app.pages.portfolio.content_dir", lambda: tmp_path)
+
+    response = client.get("/uses")
+    assert response.status_code == 200
+    assert "<strong>tools</strong>" in response.text
+    assert f"{settings.SITE_URL}/uses" in response.text
+
+    assert client.get("/no-such-page").status_code == 404
+
+
+def test_page_route_does_not_shadow_root_files(client: TestClient) -> None:
+    assert client.get("/robots.txt").status_code == 200
+    response = client.get("/favicon.ico", follow_redirects=False)
+    assert response.status_code == 301
+
+
 def test_project_card_renders_github_metadata(client: TestClient, db: Session) -> None:
     project = _make_project(db)
     project.github_stars = 42
@@ -1,11 +1,27 @@
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock
+
 import pytest
 from sqlmodel import Session
-
-from app.core.exceptions import NotFoundError
-from app.crud.post import get_or_create_tag, upsert_post
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.content.renderer import TocEntry
+from app.content.search_index import configure_search_index
+from app.core.exceptions import BadRequestError, NotFoundError
+from app.crud.post import (
+    SNIPPET_END,
+    SNIPPET_START,
+    PostCursor,
+    get_or_create_tag,
+    refresh_post_search_vectors,
+    refresh_tag_post_counts,
+    upsert_post,
+)
 from app.models.post import Post
 from app.schemas.post import PostUpsert, TagCreate
 from app.services import blog as blog_service
+from app.services.content_sync import publish_search_index
 from tests.utils.utils import random_lower_string
 
 # ---------------------------------------------------------------------------
@@ -39,12 +55,12 @@ def _make_post(
 # ---------------------------------------------------------------------------
 
 
-def test_list_published_posts(db: Session) -> None:
+def test_list_published_posts(db: Session, async_db: AsyncSession) -> None:
     _make_post(db, published=True, slug="pub-a", title="Published A")
     _make_post(db, published=True, slug="pub-b", title="Published B")
     _make_post(db, published=False, slug="draft-c", title="Draft C")
 
-    posts, count = blog_service.list_published_posts(session=db)
+    posts, _ = asyncio.run(blog_service.list_published_posts(session=async_db))
 
     slugs = [p.slug for p in posts]
     assert "pub-a" in slugs
@@ -52,41 +68,68 @@ def test_list_published_posts(db: Session) -> None:
     assert "draft-c" not in slugs
 
 
-def test_list_published_posts_pagination(db: Session) -> None:
-    _, baseline = blog_service.list_published_posts(session=db)
-
+def test_list_published_posts_pagination(db: Session, async_db: AsyncSession) -> None:
     for i in range(5):
         _make_post(db, published=True, slug=f"page-post-{i}", title=f"Page Post {i}")
 
-    posts, count = blog_service.list_published_posts(session=db, skip=0, limit=3)
+    posts, has_more = asyncio.run(
+        blog_service.list_published_posts(session=async_db, skip=0, limit=3)
+    )
     assert len(posts) == 3
-    assert count == baseline + 5
+    assert has_more
 
 
-def test_get_published_post_found(db: Session) -> None:
+def test_get_published_post_found(db: Session, async_db: AsyncSession) -> None:
     slug = f"found-{random_lower_string()}"
     _make_post(db, published=True, slug=slug, title="Found Post")
 
-    post = blog_service.get_published_post(session=db, slug=slug)
+    post = asyncio.run(blog_service.get_published_post(session=async_db, slug=slug))
 
     assert post.slug == slug
     assert post.title == "Found Post"
 
 
-def test_get_published_post_not_found(db: Session) -> None:
+def test_get_published_post_with_toc_reads_stored_toc(
+    db: Session, async_db: AsyncSession
+) -> None:
+    slug = f"toc-{random_lower_string()}"
+    data = PostUpsert(
+        title="ToC Post",
+        slug=slug,
+        content_markdown="## Intro",
+        content_html="<p>No headings left in the HTML.</p>",
+        toc=[{"level": 2, "id": "intro", "text": "Intro"}],
+        published=True,
+    )
+    upsert_post(session=db, source_path=f"posts/{slug}.md", data=data)
+    db.commit()
+
+    post, toc = asyncio.run(
+        blog_service.get_published_post_with_toc(session=async_db, slug=slug)
+    )
+
+    assert post.slug == slug
+    assert toc == [TocEntry(level=2, id="intro", text="Intro")]
+
+
+def test_get_published_post_not_found(async_db: AsyncSession) -> None:
     with pytest.raises(NotFoundError):
-        blog_service.get_published_post(session=db, slug="this-slug-does-not-exist")
+        asyncio.run(
+            blog_service.get_published_post(
+                session=async_db, slug="this-slug-does-not-exist"
+            )
+        )
 
 
-def test_get_published_post_unpublished(db: Session) -> None:
+def test_get_published_post_unpublished(db: Session, async_db: AsyncSession) -> None:
     slug = f"unpub-{random_lower_string()}"
     _make_post(db, published=False, slug=slug, title="Unpublished Post")
 
     with pytest.raises(NotFoundError):
-        blog_service.get_published_post(session=db, slug=slug)
+        asyncio.run(blog_service.get_published_post(session=async_db, slug=slug))
 
 
-def test_list_tags(db: Session) -> None:
+def test_list_tags(db: Session, async_db: AsyncSession) -> None:
     tag_slug = f"tag-{random_lower_string()}"
     tag = get_or_create_tag(
         session=db,
@@ -97,16 +140,19 @@ def test_list_tags(db: Session) -> None:
     post = _make_post(db, published=True)
     post.tags.append(tag)
     db.add(post)
+    refresh_tag_post_counts(session=db)
     db.commit()
 
-    results = blog_service.list_tags(session=db)
+    results = asyncio.run(blog_service.list_tags(session=async_db))
 
     tag_map = {t.slug: count for t, count in results}
     assert tag_slug in tag_map
     assert tag_map[tag_slug] == 1
 
 
-def test_list_tags_excludes_unpublished_posts(db: Session) -> None:
+def test_list_tags_excludes_unpublished_posts(
+    db: Session, async_db: AsyncSession
+) -> None:
     tag_slug = f"unpub-tag-{random_lower_string()}"
     tag = get_or_create_tag(
         session=db,
@@ -117,30 +163,95 @@ def test_list_tags_excludes_unpublished_posts(db: Session) -> None:
     post = _make_post(db, published=False)
     post.tags.append(tag)
     db.add(post)
+    refresh_tag_post_counts(session=db)
     db.commit()
 
-    results = blog_service.list_tags(session=db)
+    results = asyncio.run(blog_service.list_tags(session=async_db))
 
     tag_map = {t.slug: count for t, count in results}
     assert tag_slug not in tag_map
 
 
-def test_search_published_posts(db: Session) -> None:
+def test_search_published_posts(db: Session, async_db: AsyncSession) -> None:
     _make_post(db, published=True, slug="search-hello", title="Hello World Post")
     _make_post(db, published=True, slug="search-goodbye", title="Goodbye World Post")
     _make_post(db, published=False, slug="search-draft", title="Hello Draft")
+    refresh_post_search_vectors(session=db)
 
-    results = blog_service.search_published_posts(session=db, query="Hello")
-    slugs = [p.slug for p in results]
+    results = asyncio.run(
+        blog_service.search_published_posts(session=async_db, query="Hello")
+    )
+    slugs = [p.slug for p, _ in results]
     assert "search-hello" in slugs
     assert "search-draft" not in slugs  # unpublished
 
 
-def test_search_empty_query(db: Session) -> None:
-    results = blog_service.search_published_posts(session=db, query="")
+def test_search_published_posts_uses_index_without_db(
+    db: Session, tmp_path: Path
+) -> None:
+    post = _make_post(db, published=True, title="Indexed zqpost")
+    post.excerpt = "Excerpt about zqpost."
+    index_file = tmp_path / "search-index.json.gz"
+    configure_search_index(index_file)
+    publish_search_index(session=db)
+    session = AsyncMock(spec=AsyncSession)
+
+    [(hit, snippet)] = asyncio.run(
+        blog_service.search_published_posts(session=session, query="zqpost")
+    )
+
+    assert hit.slug == post.slug
+    assert snippet == "Excerpt about <mark>zqpost</mark>. # Hello"
+    assert not session.mock_calls
+
+
+def test_fuzzy_search_answers_typed_prefixes_from_index(
+    db: Session, tmp_path: Path
+) -> None:
+    post = _make_post(db, published=True, title="Indexed zqprefix")
+    configure_search_index(tmp_path / "search-index.json.gz")
+    publish_search_index(session=db)
+    session = AsyncMock(spec=AsyncSession)
+
+    [(hit, _snippet)] = asyncio.run(
+        blog_service.fuzzy_search_published_posts(session=session, query="zqpre")
+    )
+
+    assert hit.slug == post.slug
+    assert not session.mock_calls
+
+
+def test_highlight_snippet_escapes_text_and_marks_matches() -> None:
+    snippet = f"<b>{SNIPPET_START}fast{SNIPPET_END}</b> & safe"
+
+    assert blog_service.highlight_snippet(snippet) == (
+        "&lt;b&gt;<mark>fast</mark>&lt;/b&gt; &amp; safe"
+    )
+
+
+def test_search_empty_query(async_db: AsyncSession) -> None:
+    results = asyncio.run(
+        blog_service.search_published_posts(session=async_db, query="")
+    )
     assert results == []
 
 
-def test_search_whitespace_query(db: Session) -> None:
-    results = blog_service.search_published_posts(session=db, query="   ")
+def test_search_whitespace_query(async_db: AsyncSession) -> None:
+    results = asyncio.run(
+        blog_service.search_published_posts(session=async_db, query="   ")
+    )
     assert results == []
+
+
+def test_cursor_round_trip(db: Session) -> None:
+    post = _make_post(db, published=True)
+
+    cursor = blog_service.decode_cursor(blog_service.encode_cursor(post))
+
+    assert cursor == PostCursor.after(post)
+
+
+@pytest.mark.parametrize("token", ["", "abc", "12.not-a-uuid", "x." + "0" * 32])
+def test_decode_cursor_rejects_malformed_tokens(token: str) -> None:
+    with pytest.raises(BadRequestError):
+        blog_service.decode_cursor(token)
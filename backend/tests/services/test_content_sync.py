@@ -1,17 +1,37 @@
 """Integration tests for services.content_sync — uses tmp_path + real DB session."""
 
-from datetime import UTC, datetime
+import json
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
+from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session, select
 
+from app.content.highlight_cache import HighlightCache
+from app.content.renderer import configure_highlight_cache
+from app.content.search_index import configure_search_index, get_search_index
+from app.content.static_search_index import (
+    configure_static_search_index,
+    get_static_search_index_dir,
+    static_search_index_url,
+)
+from app.core.config import settings
 from app.core.exceptions import ContentSyncError
+from app.crud.post import (
+    get_published_posts_for_index,
+    get_published_tag_counts,
+    search_posts,
+)
 from app.models.post import Post
 from app.models.project import Project
-from app.services.content_sync import sync_content
-from app.services.github import GitHubRepoMeta
+from app.services import post as post_service
+from app.services.content_sync import (
+    check_content,
+    configure_search,
+    sync_changed_files,
+    sync_content,
+)
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -60,6 +80,10 @@ def _get_project(session: Session, slug: str) -> Project | None:
     return session.exec(select(Project).where(Project.slug == slug)).first()
 
 
+def _tag_counts(session: Session) -> dict[str, int]:
+    return {tag.slug: count for tag, count in get_published_tag_counts(session=session)}
+
+
 # ---------------------------------------------------------------------------
 # Tests
 # ---------------------------------------------------------------------------
@@ -109,6 +133,41 @@ def test_content_updates_propagate(db: Session, tmp_path: Path) -> None:
     assert post.title == "Updated"
 
 
+def test_unchanged_files_are_not_reparsed(db: Session, tmp_path: Path) -> None:
+    _setup_post(tmp_path, "2024-01-01-cached.md", title="Cached")
+    _setup_project(tmp_path, "cached-proj.md", title="Cached Proj")
+    sync_content(session=db, content_dir=tmp_path)
+
+    with (
+        patch("app.content.loader.load_post") as mock_load_post,
+        patch("app.content.loader.load_project") as mock_load_project,
+    ):
+        sync_content(session=db, content_dir=tmp_path)
+
+    mock_load_post.assert_not_called()
+    mock_load_project.assert_not_called()
+    assert _get_post(db, "cached") is not None
+    assert _get_project(db, "cached-proj") is not None
+
+
+def test_renderer_version_change_forces_rerender(db: Session, tmp_path: Path) -> None:
+    _setup_post(tmp_path, "2024-01-01-rerender.md", title="Rerender")
+    sync_content(session=db, content_dir=tmp_path)
+    post = _get_post(db, "rerender")
+    assert post is not None
+    first_hash = post.source_hash
+    assert first_hash is not None
+
+    with patch("app.content.loader.RENDERER_VERSION", "test-bump"):
+        sync_content(session=db, content_dir=tmp_path)
+
+    db.expire_all()
+    post = _get_post(db, "rerender")
+    assert post is not None
+    assert post.source_hash != first_hash
+    assert post.updated_at is None
+
+
 def test_tags_created_and_associated(db: Session, tmp_path: Path) -> None:
     _setup_post(
         tmp_path,
@@ -125,6 +184,158 @@ def test_tags_created_and_associated(db: Session, tmp_path: Path) -> None:
     assert tag_names == ["fastapi", "python"]
 
 
+def test_sync_refreshes_tag_counts(db: Session, tmp_path: Path) -> None:
+    _setup_post(
+        tmp_path,
+        "2024-01-01-counted.md",
+        title="Counted",
+        published="true",
+        tags=["count-shared", "count-solo"],
+    )
+    _setup_post(
+        tmp_path,
+        "2024-01-02-counted-too.md",
+        title="Counted Too",
+        published="true",
+        tags=["count-shared"],
+    )
+    _setup_post(
+        tmp_path,
+        "2024-01-03-draft.md",
+        title="Draft",
+        tags=["count-shared", "count-draft"],
+    )
+
+    sync_content(session=db, content_dir=tmp_path)
+
+    counts = _tag_counts(db)
+    assert counts["count-shared"] == 2
+    assert counts["count-solo"] == 1
+    assert "count-draft" not in counts
+
+    (tmp_path / "posts" / "2024-01-01-counted.md").unlink()
+    sync_content(session=db, content_dir=tmp_path)
+
+    counts = _tag_counts(db)
+    assert counts["count-shared"] == 1
+    assert "count-solo" not in counts
+
+
+def test_sync_indexes_posts_for_search(db: Session, tmp_path: Path) -> None:
+    post_file = _write_md(
+        tmp_path / "posts",
+        "2024-01-01-findable.md",
+        "---\ntitle: Findable\npublished: true\n---\nMentions zqoriginal here.",
+    )
+    sync_content(session=db, content_dir=tmp_path)
+
+    [(post, _)] = search_posts(session=db, query="zqoriginal")
+    assert post.slug == "findable"
+
+    post_file.write_text(
+        "---\ntitle: Findable\npublished: true\n---\nNow says zqedited.",
+        encoding="utf-8",
+    )
+    sync_content(session=db, content_dir=tmp_path)
+
+    assert search_posts(session=db, query="zqoriginal") == []
+    assert [p.slug for p, _ in search_posts(session=db, query="zqedited")] == [
+        "findable"
+    ]
+
+
+def test_sync_publishes_search_index(db: Session, tmp_path: Path) -> None:
+    content_dir = tmp_path / "content"
+    configure_search_index(tmp_path / "search-index.json.gz")
+    _setup_post(
+        content_dir, "2024-01-01-kept.md", title="Kept zqindexed", published=True
+    )
+    _setup_post(content_dir, "2024-01-02-draft.md", title="Draft zqindexed")
+    sync_content(session=db, content_dir=content_dir)
+
+    index = get_search_index()
+    assert index is not None
+    assert [hit.post.slug for hit in index.search("zqindexed")] == ["kept"]
+
+    changed = _setup_post(
+        content_dir, "2024-01-03-new.md", title="New zqindexed", published=True
+    )
+    sync_changed_files(
+        session=db, content_dir=content_dir, changed=[changed], deleted=[]
+    )
+
+    index = get_search_index()
+    assert index is not None
+    assert {hit.post.slug for hit in index.search("zqindexed")} == {"kept", "new"}
+
+
+def test_sync_changed_files_rereads_only_the_batch_for_the_index(
+    db: Session, tmp_path: Path
+) -> None:
+    content_dir = tmp_path / "content"
+    configure_search_index(tmp_path / "search-index.json.gz")
+    edited = _setup_post(
+        content_dir, "2024-01-01-edit.md", title="Edit zqbatch", published=True
+    )
+    removed = _setup_post(
+        content_dir, "2024-01-02-gone.md", title="Gone zqbatch", published=True
+    )
+    _setup_post(content_dir, "2024-01-03-same.md", title="Same zqbatch", published=True)
+    sync_content(session=db, content_dir=content_dir)
+
+    _setup_post(
+        content_dir, "2024-01-01-edit.md", title="Edited zqrenamed", published=True
+    )
+    removed.unlink()
+    with patch(
+        "app.services.content_sync.get_published_posts_for_index",
+        wraps=get_published_posts_for_index,
+    ) as read_posts:
+        sync_changed_files(
+            session=db, content_dir=content_dir, changed=[edited], deleted=[removed]
+        )
+
+    [call] = read_posts.call_args_list
+    assert call.kwargs["source_paths"] == {
+        "posts/2024-01-01-edit.md",
+        "posts/2024-01-02-gone.md",
+    }
+    index = get_search_index()
+    assert index is not None
+    assert [hit.post.slug for hit in index.search("zqbatch")] == ["same"]
+    assert [hit.post.slug for hit in index.search("zqrenamed")] == ["edit"]
+    slugs = [post.slug for post in index.posts]
+    assert slugs.index("same") < slugs.index("edit")  # still newest first
+
+
+def test_sync_publishes_static_search_index(db: Session, tmp_path: Path) -> None:
+    content_dir = tmp_path / "content"
+    index_dir = tmp_path / "static-search"
+    configure_static_search_index(index_dir)
+    _setup_post(
+        content_dir, "2024-01-01-kept.md", title="Kept zqstatic", published=True
+    )
+    sync_content(session=db, content_dir=content_dir)
+
+    url = static_search_index_url()
+    assert url is not None
+    payload = json.loads((index_dir / url.rsplit("/", 1)[1]).read_bytes())
+    assert [post[0] for post in payload["posts"]] == ["kept"]
+    assert "zqstatic" in payload["terms"]
+
+
+def test_configure_search_uses_static_index_dir_setting(tmp_path: Path) -> None:
+    with (
+        patch.object(settings, "SEARCH_STATIC_INDEX", True),
+        patch.object(settings, "SEARCH_STATIC_INDEX_DIR", str(tmp_path)),
+    ):
+        configure_search()
+
+    index_dir = get_static_search_index_dir()
+    assert index_dir is not None
+    assert index_dir.directory == tmp_path
+
+
 def test_orphan_cleanup(db: Session, tmp_path: Path) -> None:
     _setup_post(tmp_path, "2024-01-01-keep.md", title="Keep")
     _setup_post(tmp_path, "2024-01-01-remove.md", title="Remove")
@@ -176,6 +387,166 @@ def test_partial_failure_does_not_abort_sync(db: Session, tmp_path: Path) -> Non
     assert _get_project(db, "good-proj") is not None
 
 
+def test_parallel_sync_isolates_failures(db: Session, tmp_path: Path) -> None:
+    _setup_post(tmp_path, "2024-01-01-par-one.md", title="Par One")
+    _setup_post(tmp_path, "2024-01-02-par-two.md", title="Par Two")
+    _write_md(
+        tmp_path / "posts", "2024-01-03-par-bad.md", "---\nslug: x\n---\nNo title."
+    )
+    _setup_project(tmp_path, "par-proj.md", title="Par Proj")
+    _setup_project(tmp_path, "par-proj-two.md", title="Par Proj Two")
+
+    sync_content(session=db, content_dir=tmp_path, workers=2)
+
+    assert _get_post(db, "par-one") is not None
+    assert _get_post(db, "par-two") is not None
+    assert _get_project(db, "par-proj") is not None
+    assert _get_project(db, "par-proj-two") is not None
+
+
+def test_parallel_sync_reports_worker_cache_stats(db: Session, tmp_path: Path) -> None:
+    body = "---\ntitle: {title}\n---\n```bash\nmake test\n```"
+    _write_md(tmp_path / "posts", "2024-01-01-c1.md", body.format(title="C1"))
+    _write_md(tmp_path / "posts", "2024-01-02-c2.md", body.format(title="C2"))
+    cache = HighlightCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    configure_highlight_cache(cache)
+    try:
+        sync_content(session=db, content_dir=tmp_path, workers=2)
+    finally:
+        configure_highlight_cache(None)
+
+    assert cache.hits + cache.misses == 2
+    assert cache.misses >= 1
+
+
+def test_bulk_sync_creates_and_updates(db: Session, tmp_path: Path) -> None:
+    _setup_post(tmp_path, "2024-01-01-bulk-one.md", title="Bulk One", tags=["a"])
+    _setup_post(tmp_path, "2024-01-02-bulk-two.md", title="Bulk Two")
+    _setup_project(tmp_path, "bulk-proj.md", title="Bulk Proj")
+
+    sync_content(session=db, content_dir=tmp_path, bulk=True)
+
+    post = _get_post(db, "bulk-one")
+    assert post is not None
+    assert [t.name for t in post.tags] == ["a"]
+    assert _get_post(db, "bulk-two") is not None
+    assert _get_project(db, "bulk-proj") is not None
+
+    _setup_post(
+        tmp_path, "2024-01-01-bulk-one.md", title="Bulk One Edited", tags=["b", "c"]
+    )
+    sync_content(session=db, content_dir=tmp_path, bulk=True)
+
+    db.expire_all()
+    post = _get_post(db, "bulk-one")
+    assert post is not None
+    assert post.title == "Bulk One Edited"
+    assert post.updated_at is not None
+    assert sorted(t.name for t in post.tags) == ["b", "c"]
+    two = _get_post(db, "bulk-two")
+    assert two is not None
+    assert two.updated_at is None
+
+
+def test_bulk_sync_isolates_slug_conflict(db: Session, tmp_path: Path) -> None:
+    _setup_post(tmp_path, "2024-01-01-bulk-a.md", title="A", slug="bulk-same")
+    _setup_post(tmp_path, "2024-01-02-bulk-b.md", title="B", slug="bulk-same")
+    _setup_post(tmp_path, "2024-01-03-bulk-ok.md", title="Bulk OK")
+    _write_md(tmp_path / "posts", "2024-01-04-bulk-bad.md", "---\nslug: x\n---\n")
+
+    with patch("app.services.content_sync.logger") as mock_logger:
+        sync_content(session=db, content_dir=tmp_path, bulk=True)
+
+    posts = db.exec(select(Post).where(Post.slug == "bulk-same")).all()
+    assert len(posts) == 1
+    assert _get_post(db, "bulk-ok") is not None
+    events = [c.args[0] for c in mock_logger.warning.call_args_list]
+    assert events.count("post_sync_slug_conflict") == 1
+    assert events.count("post_sync_failed") == 1
+
+
+def test_bulk_sync_isolates_invalid_tag(db: Session, tmp_path: Path) -> None:
+    _setup_post(tmp_path, "2024-01-01-bulk-long-tag.md", title="Long", tags=["x" * 101])
+    _setup_post(tmp_path, "2024-01-02-bulk-tagged.md", title="Tagged", tags=["ok"])
+
+    with patch("app.services.content_sync.logger") as mock_logger:
+        sync_content(session=db, content_dir=tmp_path, bulk=True)
+
+    assert _get_post(db, "bulk-long-tag") is None
+    post = _get_post(db, "bulk-tagged")
+    assert post is not None
+    assert [t.name for t in post.tags] == ["ok"]
+    events = [c.args[0] for c in mock_logger.warning.call_args_list]
+    assert events.count("post_sync_failed") == 1
+
+
+def test_bulk_sync_isolates_tag_write_failure(db: Session, tmp_path: Path) -> None:
+    _setup_post(tmp_path, "2024-01-01-bulk-boom.md", title="Boom", tags=["boom"])
+    _setup_post(tmp_path, "2024-01-02-bulk-fine.md", title="Fine", tags=["fine"])
+    reconcile = post_service.reconcile_tags_for_posts
+
+    def failing_reconcile(*, session: Session, post_tags: dict) -> None:  # type: ignore[type-arg]
+        if any(data.slug == "boom" for datas in post_tags.values() for data in datas):
+            raise SQLAlchemyError("tag write failed")
+        reconcile(session=session, post_tags=post_tags)
+
+    with patch.object(post_service, "reconcile_tags_for_posts", failing_reconcile):
+        sync_content(session=db, content_dir=tmp_path, bulk=True)
+
+    fine = _get_post(db, "bulk-fine")
+    assert fine is not None
+    assert [t.name for t in fine.tags] == ["fine"]
+    boom = _get_post(db, "bulk-boom")
+    assert boom is not None
+    assert boom.source_hash is None  # retried by the next sync
+
+
+def test_sync_changed_files_applies_only_the_batch(db: Session, tmp_path: Path) -> None:
+    edited = _setup_post(tmp_path, "2024-01-01-watch-edit.md", title="Watch Edit")
+    removed = _setup_post(tmp_path, "2024-01-02-watch-gone.md", title="Watch Gone")
+    untouched = _setup_post(tmp_path, "2024-01-03-watch-same.md", title="Watch Same")
+    project = _setup_project(tmp_path, "watch-proj.md", title="Watch Proj")
+    sync_content(session=db, content_dir=tmp_path)
+
+    _setup_post(tmp_path, "2024-01-01-watch-edit.md", title="Watch Edited")
+    added = _setup_post(tmp_path, "2024-01-04-watch-new.md", title="Watch New")
+    page = _write_md(tmp_path / "pages", "about.md", "---\ntitle: About\n---\n")
+    removed.unlink()
+    project.unlink()
+    # Outside the batch: must not be treated as an orphan.
+    untouched.unlink()
+
+    sync_changed_files(
+        session=db,
+        content_dir=tmp_path,
+        changed=[edited, added, page],
+        deleted=[removed, project],
+    )
+
+    db.expire_all()
+    post = _get_post(db, "watch-edit")
+    assert post is not None
+    assert post.title == "Watch Edited"
+    assert _get_post(db, "watch-new") is not None
+    assert _get_post(db, "watch-gone") is None
+    assert _get_post(db, "watch-same") is not None
+    assert _get_project(db, "watch-proj") is None
+
+
+def test_sync_changed_files_rename_keeps_slug(db: Session, tmp_path: Path) -> None:
+    old = _setup_post(tmp_path, "2024-01-01-rename.md", title="Rename", slug="rename")
+    sync_content(session=db, content_dir=tmp_path)
+
+    new = old.with_name("2024-02-01-rename.md")
+    old.rename(new)
+    sync_changed_files(session=db, content_dir=tmp_path, changed=[new], deleted=[old])
+
+    db.expire_all()
+    post = _get_post(db, "rename")
+    assert post is not None
+    assert post.source_path == "posts/2024-02-01-rename.md"
+
+
 def test_empty_directory_no_errors(db: Session, tmp_path: Path) -> None:
     # tmp_path exists but has no posts/projects/pages subdirs
     sync_content(session=db, content_dir=tmp_path)
@@ -209,47 +580,57 @@ def test_missing_subdir_does_not_delete_posts(db: Session, tmp_path: Path) -> No
     assert _get_project(db, "survive-proj") is not None
 
 
-def test_sync_enriches_project_with_github_metadata(
-    db: Session, tmp_path: Path
-) -> None:
+def test_sync_does_not_fetch_github_metadata(db: Session, tmp_path: Path) -> None:
     _setup_project(
         tmp_path,
         "github-proj.md",
         title="GitHub Project",
         repo_url="https://github.com/owner/repo",
     )
-    mock_meta = GitHubRepoMeta(
-        stars=100,
-        language="Python",
-        forks=10,
-        last_pushed_at=datetime(2024, 6, 1, tzinfo=UTC),
-    )
 
-    with patch("app.services.project.fetch_repo_metadata", return_value=mock_meta):
+    with patch("app.services.project.fetch_repos") as mock_fetch:
         sync_content(session=db, content_dir=tmp_path)
+        sync_content(session=db, content_dir=tmp_path, bulk=True)
 
-    db.expire_all()
+    mock_fetch.assert_not_called()
     project = _get_project(db, "github-proj")
     assert project is not None
-    assert project.github_stars == 100
-    assert project.github_language == "Python"
-    assert project.github_forks == 10
-    assert project.github_last_pushed_at is not None
+    assert project.title == "GitHub Project"
+    assert project.github_stars is None
+    assert project.github_fetched_at is None
 
 
-def test_sync_continues_when_github_api_fails(db: Session, tmp_path: Path) -> None:
-    _setup_project(
-        tmp_path,
-        "failing-github-proj.md",
-        title="Failing GitHub Project",
-        repo_url="https://github.com/owner/repo",
-    )
+def test_check_content_reports_invalid_files_and_duplicate_slugs(
+    tmp_path: Path,
+) -> None:
+    _setup_post(tmp_path, "2024-01-01-first.md", title="First", slug="shared")
+    _setup_post(tmp_path, "2024-01-02-second.md", title="Second", slug="shared")
+    _write_md(tmp_path / "posts", "2024-01-03-untitled.md", "---\nslug: x\n---\n")
+    _setup_project(tmp_path, "tool.md", title="Tool")
 
-    with patch("app.services.project.fetch_repo_metadata", return_value=None):
-        sync_content(session=db, content_dir=tmp_path)
+    problems = check_content(content_dir=tmp_path)
 
-    db.expire_all()
-    project = _get_project(db, "failing-github-proj")
-    assert project is not None
-    assert project.title == "Failing GitHub Project"
-    assert project.github_stars is None
+    assert len(problems) == 2
+    assert problems[0].startswith("posts/2024-01-02-second.md: slug 'shared'")
+    assert problems[1].startswith("posts/2024-01-03-untitled.md: Missing required")
+
+
+def test_check_content_valid_tree_has_no_problems(tmp_path: Path) -> None:
+    _setup_post(tmp_path, "2024-01-01-one.md", title="One")
+    _setup_project(tmp_path, "tool.md", title="Tool")
+    assert check_content(content_dir=tmp_path) == []
+
+
+def test_sync_stores_table_of_contents(db: Session, tmp_path: Path) -> None:
+    _write_md(
+        tmp_path / "posts",
+        "2024-01-01-toc-sync.md",
+        "---\ntitle: ToC Sync\n---\n## First\n\n### Second `code`\n",
+    )
+    sync_content(session=db, content_dir=tmp_path)
+
+    post = db.exec(select(Post).where(Post.slug == "toc-sync")).one()
+    assert post.toc == [
+        {"level": 2, "id": "first", "text": "First"},
+        {"level": 3, "id": "second-code", "text": "Second code"},
+    ]
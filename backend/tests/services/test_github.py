@@ -1,10 +1,28 @@
-"""Unit tests for services.github — parse_github_url and fetch_repo_metadata."""
-
+"""Unit tests for services.github — URL parsing and metadata fetching.
+
+Batched fetching runs against a local stub of the GitHub API.
+"""
+
+import json
+import threading
+import time
+from collections.abc import Generator
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import httpx
+import pytest
 
-from app.services.github import fetch_repo_metadata, parse_github_url
+from app.services.github import (
+    RepoFetch,
+    RepoValidators,
+    fetch_repo_conditional,
+    fetch_repos,
+    github_client,
+    parse_github_url,
+)
 
 # ---------------------------------------------------------------------------
 # parse_github_url
@@ -52,103 +70,358 @@ def test_parse_github_url_whitespace_only() -> None:
 
 
 # ---------------------------------------------------------------------------
-# fetch_repo_metadata
+# fetch_repo_conditional
 # ---------------------------------------------------------------------------
 
 
-def _mock_response(status_code: int, json_body: dict) -> MagicMock:
-    mock = MagicMock()
-    mock.status_code = status_code
-    mock.json.return_value = json_body
-    return mock
+def _mock_client(status_code: int, json_body: dict) -> MagicMock:
+    client = MagicMock(spec=httpx.Client)
+    client.get.return_value = httpx.Response(status_code, json=json_body)
+    return client
 
 
-def test_fetch_repo_metadata_success() -> None:
+def test_fetch_repo_conditional_success() -> None:
     body = {
         "stargazers_count": 42,
         "language": "Python",
         "forks_count": 5,
         "pushed_at": "2024-06-15T10:30:00Z",
     }
-    with patch("app.services.github.httpx.get", return_value=_mock_response(200, body)):
-        meta = fetch_repo_metadata("https://github.com/owner/repo")
+    client = _mock_client(200, body)
+
+    meta = fetch_repo_conditional("https://github.com/owner/repo", client=client).meta
 
     assert meta is not None
     assert meta.stars == 42
     assert meta.language == "Python"
     assert meta.forks == 5
     assert meta.last_pushed_at is not None
+    assert client.get.call_args[0] == ("/repos/owner/repo",)
 
 
-def test_fetch_repo_metadata_sends_auth_header() -> None:
-    body = {
-        "stargazers_count": 10,
-        "language": "Go",
-        "forks_count": 2,
-        "pushed_at": "2024-01-01T00:00:00Z",
-    }
-    with patch(
-        "app.services.github.httpx.get", return_value=_mock_response(200, body)
-    ) as mock_get:
-        fetch_repo_metadata("https://github.com/owner/repo", token="mytoken")
+def test_github_client_sends_auth_header() -> None:
+    with github_client(token="mytoken") as client:
+        assert client.headers["Authorization"] == "Bearer mytoken"
 
-    assert mock_get.called
-    call_kwargs = mock_get.call_args[1]
-    assert "Authorization" in call_kwargs.get("headers", {})
-    assert call_kwargs["headers"]["Authorization"] == "Bearer mytoken"
 
+def test_fetch_repo_conditional_non_github_url_no_http_call() -> None:
+    client = _mock_client(200, {})
 
-def test_fetch_repo_metadata_non_github_url_no_http_call() -> None:
-    with patch("app.services.github.httpx.get") as mock_get:
-        meta = fetch_repo_metadata("https://gitlab.com/x/y")
+    result = fetch_repo_conditional("https://gitlab.com/x/y", client=client)
 
-    assert meta is None
-    mock_get.assert_not_called()
+    assert result == RepoFetch()
+    client.get.assert_not_called()
 
 
-def test_fetch_repo_metadata_404_returns_none() -> None:
-    with patch("app.services.github.httpx.get", return_value=_mock_response(404, {})):
-        meta = fetch_repo_metadata("https://github.com/owner/repo")
-    assert meta is None
+def test_fetch_repo_conditional_404_is_a_failure() -> None:
+    client = _mock_client(404, {})
+    result = fetch_repo_conditional("https://github.com/owner/repo", client=client)
+    assert result == RepoFetch()
 
 
-def test_fetch_repo_metadata_timeout_returns_none() -> None:
-    with patch(
-        "app.services.github.httpx.get",
-        side_effect=httpx.TimeoutException("timed out"),
-    ):
-        meta = fetch_repo_metadata("https://github.com/owner/repo")
-    assert meta is None
+def test_fetch_repo_conditional_timeout_is_a_failure() -> None:
+    client = MagicMock(spec=httpx.Client)
+    client.get.side_effect = httpx.TimeoutException("timed out")
+    result = fetch_repo_conditional("https://github.com/owner/repo", client=client)
+    assert result == RepoFetch()
 
 
-def test_fetch_repo_metadata_rate_limit_403_returns_none() -> None:
-    with patch("app.services.github.httpx.get", return_value=_mock_response(403, {})):
-        meta = fetch_repo_metadata("https://github.com/owner/repo")
-    assert meta is None
+def test_fetch_repo_conditional_rate_limit_403_is_a_failure() -> None:
+    client = _mock_client(403, {})
+    result = fetch_repo_conditional("https://github.com/owner/repo", client=client)
+    assert result == RepoFetch()
 
 
-def test_fetch_repo_metadata_null_language() -> None:
+def test_fetch_repo_conditional_null_language() -> None:
     body = {
         "stargazers_count": 7,
         "language": None,
         "forks_count": 1,
         "pushed_at": "2024-03-01T00:00:00Z",
     }
-    with patch("app.services.github.httpx.get", return_value=_mock_response(200, body)):
-        meta = fetch_repo_metadata("https://github.com/owner/repo")
+    client = _mock_client(200, body)
+
+    meta = fetch_repo_conditional("https://github.com/owner/repo", client=client).meta
 
     assert meta is not None
     assert meta.language is None
 
 
-def test_fetch_repo_metadata_missing_pushed_at() -> None:
+def test_fetch_repo_conditional_missing_pushed_at() -> None:
     body = {
         "stargazers_count": 3,
         "language": "Rust",
         "forks_count": 0,
     }
-    with patch("app.services.github.httpx.get", return_value=_mock_response(200, body)):
-        meta = fetch_repo_metadata("https://github.com/owner/repo")
+    client = _mock_client(200, body)
+
+    meta = fetch_repo_conditional("https://github.com/owner/repo", client=client).meta
 
     assert meta is not None
     assert meta.last_pushed_at is None
+
+
+# ---------------------------------------------------------------------------
+# fetch_repos (local stub server)
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _StubGitHub:
+    url: str
+    delay: float = 0.0
+    graphql_status: int = 200
+    paths: list[str] = field(default_factory=list)
+    heads: list[str] = field(default_factory=list)
+    connections: set[int] = field(default_factory=set)
+    auth_headers: list[str | None] = field(default_factory=list)
+    in_flight: int = 0
+    max_in_flight: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+_LAST_MODIFIED = "Sat, 15 Jun 2024 10:30:00 GMT"
+
+
+def _rest_repo(name: str) -> dict[str, Any]:
+    return {
+        "stargazers_count": len(name),
+        "language": "Python",
+        "forks_count": 1,
+        "pushed_at": "2024-06-15T10:30:00Z",
+    }
+
+
+def _graphql_repo(name: str) -> dict[str, Any]:
+    return {
+        "stargazerCount": len(name),
+        "forkCount": 2,
+        "pushedAt": "2024-06-15T10:30:00Z",
+        "primaryLanguage": {"name": "Go"},
+    }
+
+
+def _make_handler(stub: _StubGitHub) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *_args: Any) -> None:
+            pass
+
+        def _send(
+            self, status: int, body: object, headers: dict[str, str] | None = None
+        ) -> None:
+            payload = json.dumps(body).encode() if status != 304 else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _enter(self) -> None:
+            with stub.lock:
+                stub.paths.append(self.path)
+                stub.connections.add(self.client_address[1])
+                stub.auth_headers.append(self.headers.get("Authorization"))
+                stub.in_flight += 1
+                stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+            time.sleep(stub.delay)
+            with stub.lock:
+                stub.in_flight -= 1
+
+        def do_GET(self) -> None:
+            self._enter()
+            _, _, owner, repo = self.path.split("/")
+            etag = f'"{owner}-{repo}"'
+            validators = {"ETag": etag, "Last-Modified": _LAST_MODIFIED}
+            if repo == "missing":
+                self._send(404, {"message": "Not Found"})
+            elif repo == "garbled":
+                self.send_response(200)
+                self.send_header("Content-Length", "8")
+                self.end_headers()
+                self.wfile.write(b"not json")
+            elif self.headers.get("If-None-Match") == etag:
+                self._send(304, None, validators)
+            else:
+                self._send(200, _rest_repo(f"{owner}/{repo}"), validators)
+
+        def do_HEAD(self) -> None:
+            with stub.lock:
+                stub.heads.append(self.path)
+            _, _, owner, repo = self.path.split("/")
+            self.send_response(404 if repo == "missing" else 200)
+            self.send_header("ETag", f'"{owner}-{repo}"')
+            self.send_header("Last-Modified", _LAST_MODIFIED)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_POST(self) -> None:
+            length = int(self.headers["Content-Length"])
+            request = json.loads(self.rfile.read(length))
+            self._enter()
+            if stub.graphql_status != 200:
+                self._send(stub.graphql_status, {"message": "Bad credentials"})
+                return
+            variables = request["variables"]
+            data: dict[str, Any] = {}
+            errors = []
+            for i in range(len(variables) // 2):
+                repo = variables[f"n{i}"]
+                if repo == "missing":
+                    data[f"r{i}"] = None
+                    errors.append({"path": [f"r{i}"], "message": "Not found"})
+                else:
+                    data[f"r{i}"] = _graphql_repo(f"{variables[f'o{i}']}/{repo}")
+            self._send(200, {"data": data, "errors": errors})
+
+    return Handler
+
+
+@pytest.fixture()
+def stub_github() -> Generator[_StubGitHub]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BaseHTTPRequestHandler)
+    stub = _StubGitHub(url=f"http://127.0.0.1:{server.server_address[1]}")
+    server.RequestHandlerClass = _make_handler(stub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    with patch("app.core.config.settings.GITHUB_API_URL", stub.url):
+        yield stub
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_repos_rest_concurrent_with_pooled_client(
+    stub_github: _StubGitHub,
+) -> None:
+    stub_github.delay = 0.05
+    urls = [f"https://github.com/owner/repo{i}" for i in range(8)]
+
+    results = fetch_repos(dict.fromkeys(urls), max_concurrency=3)
+
+    assert all(results[url].meta is not None for url in urls)
+    meta = results[urls[0]].meta
+    assert meta is not None
+    assert meta.stars == len("owner/repo0")
+    assert len(stub_github.paths) == 8
+    assert 1 < stub_github.max_in_flight <= 3
+    assert len(stub_github.connections) <= 3
+
+
+def test_fetch_repos_rest_isolates_failures(
+    stub_github: _StubGitHub,
+) -> None:
+    results = fetch_repos(
+        dict.fromkeys(
+            [
+                "https://github.com/owner/ok",
+                "https://github.com/owner/missing",
+                "https://gitlab.com/owner/elsewhere",
+            ]
+        )
+    )
+
+    assert results["https://github.com/owner/ok"].meta is not None
+    assert results["https://github.com/owner/missing"] == RepoFetch()
+    assert results["https://gitlab.com/owner/elsewhere"] == RepoFetch()
+    assert sorted(stub_github.paths) == ["/repos/owner/missing", "/repos/owner/ok"]
+
+
+def test_fetch_repos_graphql_batches_with_token(
+    stub_github: _StubGitHub,
+) -> None:
+    urls = [f"https://github.com/owner/repo{i}" for i in range(60)]
+    urls.append("https://github.com/owner/missing")
+
+    results = fetch_repos(dict.fromkeys(urls), token="secret")
+
+    assert stub_github.paths == ["/graphql", "/graphql"]
+    assert stub_github.auth_headers == ["Bearer secret", "Bearer secret"]
+    assert results["https://github.com/owner/missing"] == RepoFetch()
+    meta = results[urls[0]].meta
+    assert meta is not None
+    assert meta.stars == len("owner/repo0")
+    assert meta.language == "Go"
+    assert meta.forks == 2
+    assert meta.last_pushed_at is not None
+    assert all(results[url].meta is not None for url in urls[:-1])
+
+
+def test_fetch_repos_graphql_error_is_a_failure(
+    stub_github: _StubGitHub,
+) -> None:
+    stub_github.graphql_status = 401
+    urls = ["https://github.com/owner/a", "https://github.com/owner/b"]
+
+    results = fetch_repos(dict.fromkeys(urls), token="bad")
+
+    assert results == {url: RepoFetch() for url in urls}
+
+
+def test_fetch_repos_unreachable_is_a_failure() -> None:
+    with patch("app.core.config.settings.GITHUB_API_URL", "http://127.0.0.1:9"):
+        results = fetch_repos({"https://github.com/owner/repo": None})
+    assert results == {"https://github.com/owner/repo": RepoFetch()}
+
+
+def test_fetch_repos_conditional_request_returns_not_modified(
+    stub_github: _StubGitHub,
+) -> None:
+    url = "https://github.com/owner/cached"
+
+    first = fetch_repos({url: None})[url]
+    assert first.meta is not None
+    assert first.validators == RepoValidators(
+        etag='"owner-cached"', last_modified=_LAST_MODIFIED
+    )
+
+    second = fetch_repos({url: first.validators})[url]
+    assert second.not_modified
+    assert second.meta is None
+    assert second.validators == first.validators
+    assert stub_github.paths == ["/repos/owner/cached", "/repos/owner/cached"]
+
+
+def test_fetch_repos_uses_rest_for_repos_with_validators_when_token_set(
+    stub_github: _StubGitHub,
+) -> None:
+    cached = "https://github.com/owner/cached"
+    fresh = "https://github.com/owner/fresh"
+
+    results = fetch_repos(
+        {cached: RepoValidators(etag='"owner-cached"'), fresh: None}, token="secret"
+    )
+
+    assert sorted(stub_github.paths) == ["/graphql", "/repos/owner/cached"]
+    assert results[cached].not_modified
+    assert results[fresh].meta is not None
+
+
+def test_fetch_repos_graphql_results_carry_validators_for_next_refresh(
+    stub_github: _StubGitHub,
+) -> None:
+    url = "https://github.com/owner/fresh"
+
+    first = fetch_repos({url: None}, token="secret")[url]
+    assert first.meta is not None
+    assert first.validators == RepoValidators(
+        etag='"owner-fresh"', last_modified=_LAST_MODIFIED
+    )
+    assert stub_github.heads == ["/repos/owner/fresh"]
+
+    second = fetch_repos({url: first.validators}, token="secret")[url]
+    assert second.not_modified
+    assert stub_github.paths == ["/graphql", "/repos/owner/fresh"]
+
+
+@pytest.mark.usefixtures("stub_github")
+def test_fetch_repos_invalid_json_is_a_failure() -> None:
+    url = "https://github.com/owner/garbled"
+
+    with patch("app.services.github.logger") as mock_logger:
+        result = fetch_repos({url: None})[url]
+
+    assert result == RepoFetch()
+    mock_logger.warning.assert_called_once_with("github_api_invalid_json", repo_url=url)
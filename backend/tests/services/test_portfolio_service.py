@@ -1,7 +1,9 @@
+import asyncio
 from pathlib import Path
 
 import pytest
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.exceptions import NotFoundError
 from app.crud.project import upsert_project
@@ -42,22 +44,24 @@ def _make_project(
 # ---------------------------------------------------------------------------
 
 
-def test_list_projects(db: Session) -> None:
+def test_list_projects(db: Session, async_db: AsyncSession) -> None:
     _make_project(db, slug="proj-a", title="Project A")
     _make_project(db, slug="proj-b", title="Project B")
 
-    projects, count = portfolio_service.list_projects(session=db)
+    projects, _ = asyncio.run(portfolio_service.list_projects(session=async_db))
 
     slugs = [p.slug for p in projects]
     assert "proj-a" in slugs
     assert "proj-b" in slugs
 
 
-def test_list_projects_featured_only(db: Session) -> None:
+def test_list_projects_featured_only(db: Session, async_db: AsyncSession) -> None:
     _make_project(db, slug="featured-proj", title="Featured Project", featured=True)
     _make_project(db, slug="normal-proj", title="Normal Project", featured=False)
 
-    projects, count = portfolio_service.list_projects(session=db, featured_only=True)
+    projects, _ = asyncio.run(
+        portfolio_service.list_projects(session=async_db, featured_only=True)
+    )
 
     slugs = [p.slug for p in projects]
     assert "featured-proj" in slugs
@@ -85,6 +89,22 @@ def test_get_about_page_found(tmp_path: Path) -> None:
     assert "software engineer" in page.content_html
 
 
+def test_get_about_page_resolves_by_file_name(tmp_path: Path) -> None:
+    pages_dir = tmp_path / "pages"
+    pages_dir.mkdir(parents=True)
+    (pages_dir / "about.md").write_text(
+        "---\ntitle: About Me\nslug: me\n---\nHello.", encoding="utf-8"
+    )
+    (pages_dir / "bio.md").write_text(
+        "---\ntitle: Bio\nslug: about\n---\nNot this one.", encoding="utf-8"
+    )
+
+    page = portfolio_service.get_about_page(content_dir=tmp_path)
+
+    assert page.title == "About Me"
+    assert page.slug == "me"
+
+
 def test_get_about_page_missing(tmp_path: Path) -> None:
     # tmp_path has no pages/about.md
     with pytest.raises(NotFoundError):
@@ -0,0 +1,193 @@
+"""Tests for services.project — GitHub metadata refresh."""
+
+from collections.abc import Mapping
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+from sqlmodel import Session
+
+from app.crud.project import upsert_project
+from app.models.project import Project
+from app.schemas.project import ProjectUpsert
+from app.services.github import GitHubRepoMeta, RepoFetch, RepoValidators
+from app.services.project import refresh_github_metadata
+from tests.utils.utils import random_lower_string
+
+_TTL = timedelta(hours=6)
+
+
+def _make_project(db: Session, *, repo_url: str | None) -> Project:
+    slug = f"gh-proj-{random_lower_string()}"
+    project = upsert_project(
+        session=db,
+        source_path=f"projects/{slug}.md",
+        data=ProjectUpsert(title=slug, slug=slug, repo_url=repo_url),
+    )
+    db.commit()
+    return project
+
+
+def _repo_url() -> str:
+    return f"https://github.com/owner/{random_lower_string()}"
+
+
+class _FakeFetch:
+    """Stand-in for ``fetch_repos`` that records the validators it was given."""
+
+    def __init__(self, results: Mapping[str, RepoFetch]) -> None:
+        self.results = results
+        self.calls: list[dict[str, RepoValidators | None]] = []
+
+    def __call__(
+        self, repos: Mapping[str, RepoValidators | None], **_kwargs: object
+    ) -> dict[str, RepoFetch]:
+        self.calls.append(dict(repos))
+        return {url: self.results.get(url, RepoFetch()) for url in repos}
+
+
+def test_refresh_stores_metadata_and_validators(db: Session) -> None:
+    url = _repo_url()
+    project = _make_project(db, repo_url=url)
+    fake = _FakeFetch(
+        {
+            url: RepoFetch(
+                meta=GitHubRepoMeta(
+                    stars=12,
+                    language="Python",
+                    forks=3,
+                    last_pushed_at=datetime(2024, 6, 1, tzinfo=UTC),
+                ),
+                validators=RepoValidators(etag='"abc"', last_modified="Mon"),
+            )
+        }
+    )
+
+    with patch("app.services.project.fetch_repos", side_effect=fake):
+        refreshed = refresh_github_metadata(session=db, ttl=_TTL)
+    db.commit()
+
+    assert refreshed >= 1
+    assert fake.calls[0][url] == RepoValidators()
+    db.refresh(project)
+    assert project.github_stars == 12
+    assert project.github_language == "Python"
+    assert project.github_etag == '"abc"'
+    assert project.github_last_modified == "Mon"
+    assert project.github_fetched_at is not None
+
+
+def test_refresh_not_modified_only_bumps_fetched_at(db: Session) -> None:
+    url = _repo_url()
+    project = _make_project(db, repo_url=url)
+    project.github_stars = 5
+    project.github_etag = '"v1"'
+    project.github_fetched_at = datetime.now(UTC) - _TTL * 2
+    db.add(project)
+    db.commit()
+    fake = _FakeFetch(
+        {url: RepoFetch(not_modified=True, validators=RepoValidators(etag='"v1"'))}
+    )
+
+    with patch("app.services.project.fetch_repos", side_effect=fake):
+        refresh_github_metadata(session=db, ttl=_TTL)
+    db.commit()
+
+    assert fake.calls[0][url] == RepoValidators(etag='"v1"')
+    db.refresh(project)
+    assert project.github_stars == 5
+    assert project.github_fetched_at is not None
+    assert project.github_fetched_at > datetime.now(UTC) - timedelta(minutes=1)
+
+
+def test_refresh_skips_fresh_projects_and_projects_without_repo(
+    db: Session,
+) -> None:
+    fresh_url = _repo_url()
+    fresh = _make_project(db, repo_url=fresh_url)
+    fresh.github_fetched_at = datetime.now(UTC) - timedelta(minutes=5)
+    db.add(fresh)
+    db.commit()
+    _make_project(db, repo_url=None)
+    fake = _FakeFetch({})
+
+    with patch("app.services.project.fetch_repos", side_effect=fake):
+        refresh_github_metadata(session=db, ttl=_TTL)
+
+    assert all(fresh_url not in call for call in fake.calls)
+    assert all(None not in call for call in fake.calls)
+
+
+def test_refresh_stamps_non_github_repos_without_fetching(db: Session) -> None:
+    url = f"https://gitlab.com/owner/{random_lower_string()}"
+    project = _make_project(db, repo_url=url)
+    fake = _FakeFetch({})
+
+    with patch("app.services.project.fetch_repos", side_effect=fake):
+        refresh_github_metadata(session=db, ttl=_TTL)
+        db.commit()
+        db.refresh(project)
+        stamped = project.github_fetched_at
+        refresh_github_metadata(session=db, ttl=_TTL)
+    db.commit()
+
+    assert all(url not in call for call in fake.calls)
+    db.refresh(project)
+    assert stamped is not None
+    assert project.github_fetched_at == stamped  # not claimed again within ttl
+    assert project.github_refresh_claimed_at is None
+
+
+def test_refresh_failure_leaves_project_due(db: Session) -> None:
+    url = _repo_url()
+    project = _make_project(db, repo_url=url)
+    fake = _FakeFetch({url: RepoFetch()})
+
+    with patch("app.services.project.fetch_repos", side_effect=fake):
+        refresh_github_metadata(session=db, ttl=_TTL)
+    db.commit()
+
+    db.refresh(project)
+    assert project.github_stars is None
+    assert project.github_fetched_at is None
+
+
+def test_refresh_fetches_outside_the_claim_transaction(db: Session) -> None:
+    url = _repo_url()
+    project = _make_project(db, repo_url=url)
+    in_transaction: list[bool] = []
+
+    def fake(
+        repos: Mapping[str, RepoValidators | None], **_kwargs: object
+    ) -> dict[str, RepoFetch]:
+        in_transaction.append(db.in_transaction())
+        return {repo: RepoFetch(not_modified=True) for repo in repos}
+
+    with patch("app.services.project.fetch_repos", side_effect=fake):
+        refresh_github_metadata(session=db, ttl=_TTL)
+    db.commit()
+
+    assert in_transaction == [False]
+    db.refresh(project)
+    assert project.github_fetched_at is not None
+    assert project.github_refresh_claimed_at is None
+
+
+def test_refresh_skips_projects_claimed_by_another_refresher(db: Session) -> None:
+    claimed_url = _repo_url()
+    claimed = _make_project(db, repo_url=claimed_url)
+    claimed.github_refresh_claimed_at = datetime.now(UTC) - timedelta(minutes=1)
+    abandoned_url = _repo_url()
+    abandoned = _make_project(db, repo_url=abandoned_url)
+    abandoned.github_refresh_claimed_at = datetime.now(UTC) - timedelta(hours=1)
+    db.add_all([claimed, abandoned])
+    db.commit()
+    fake = _FakeFetch({})
+
+    with patch("app.services.project.fetch_repos", side_effect=fake):
+        refresh_github_metadata(session=db, ttl=_TTL)
+    db.commit()
+
+    assert claimed_url not in fake.calls[0]
+    assert abandoned_url in fake.calls[0]
+    db.refresh(abandoned)
+    assert abandoned.github_refresh_claimed_at is None
@@ -7,5 +7,8 @@ register("SearchDialog", () => {
   if (!el || el.dataset.mounted) return;
   requireDataset(el, ["endpoint"]);
   el.dataset.mounted = "true";
-  mount(SearchDialog, { target: el, props: { endpoint: el.dataset.endpoint } });
+  mount(SearchDialog, {
+    target: el,
+    props: { endpoint: el.dataset.endpoint, index: el.dataset.index },
+  });
 });
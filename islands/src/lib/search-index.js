@@ -0,0 +1,180 @@
+/**
+ * In-browser search over the static index written by content sync
+ * (backend/app/content/static_search_index.py).
+ *
+ * Scoring follows the server's BM25 index: every query word must match,
+ * and a post scores its best matching term per word. Index terms are
+ * unstemmed, so each query word matches as a prefix instead.
+ */
+
+const FORMAT_VERSION = 1;
+const BM25_K1 = 1.2;
+const BM25_B = 0.75;
+const MAX_PREFIX_EXPANSIONS = 50;
+const WORD_RE = /[\p{L}\p{N}]+/gu;
+
+/**
+ * @typedef {{ slug: string, name: string }} IndexedTag
+ * @typedef {{
+ *   slug: string,
+ *   title: string,
+ *   excerpt: string | null,
+ *   publishedAt: string | null,
+ *   tags: IndexedTag[],
+ * }} IndexedPost
+ */
+
+/** @type {Map<string, Promise<SearchIndex>>} */
+const loaded = new Map();
+
+/**
+ * Fetch and parse the index at `url` once per page; later calls share it.
+ * The URL is fingerprinted, so the browser cache keeps it across pages too.
+ * @param {string} url
+ * @returns {Promise<SearchIndex>}
+ */
+export function loadSearchIndex(url) {
+  let promise = loaded.get(url);
+  if (!promise) {
+    promise = fetch(url)
+      .then((res) => {
+        if (!res.ok) throw new Error(`Search index failed (${res.status})`);
+        return res.json();
+      })
+      .then((data) => new SearchIndex(data));
+    // Let a later call retry after a failed load.
+    promise.catch(() => loaded.delete(url));
+    loaded.set(url, promise);
+  }
+  return promise;
+}
+
+export class SearchIndex {
+  /** @param {any} data */
+  constructor(data) {
+    if (data.version !== FORMAT_VERSION) {
+      throw new Error(`Unsupported search index version: ${data.version}`);
+    }
+    /** @type {IndexedPost[]} */
+    this.posts = data.posts.map(
+      (/** @type {any[]} */ [slug, title, excerpt, publishedAt, tags]) => ({
+        slug,
+        title,
+        excerpt,
+        publishedAt,
+        tags: tags.map((/** @type {string[]} */ [tagSlug, name]) => ({
+          slug: tagSlug,
+          name,
+        })),
+      })
+    );
+    /** @type {number[]} */
+    this.lengths = data.lengths;
+    /** @type {Record<string, number[]>} */
+    this.postings = data.terms;
+    this.terms = Object.keys(data.terms).sort();
+    this.stopWords = new Set(/** @type {string[]} */ (data.stopWords));
+    this.averageLength =
+      this.lengths.reduce((sum, length) => sum + length, 0) /
+      (this.lengths.length || 1);
+  }
+
+  /**
+   * @param {string} text
+   * @returns {string[]}
+   */
+  words(text) {
+    return (text.toLowerCase().match(WORD_RE) ?? []).filter(
+      (word) => !this.stopWords.has(word)
+    );
+  }
+
+  /**
+   * Index terms starting with `prefix`, in sorted order.
+   * @param {string} prefix
+   */
+  expand(prefix) {
+    let low = 0;
+    let high = this.terms.length;
+    while (low < high) {
+      const mid = (low + high) >> 1;
+      if (this.terms[mid] < prefix) low = mid + 1;
+      else high = mid;
+    }
+    const expansions = [];
+    for (let i = low; i < this.terms.length; i++) {
+      if (!this.terms[i].startsWith(prefix)) break;
+      expansions.push(this.terms[i]);
+      if (expansions.length === MAX_PREFIX_EXPANSIONS) break;
+    }
+    return expansions;
+  }
+
+  /**
+   * BM25 score of `term` for each post containing it.
+   * @param {string} term
+   * @returns {Map<number, number>}
+   */
+  termScores(term) {
+    const flat = this.postings[term] ?? [];
+    const count = flat.length / 2;
+    const scores = new Map();
+    if (!count) return scores;
+    const idf = Math.log(1 + (this.posts.length - count + 0.5) / (count + 0.5));
+    for (let i = 0; i < flat.length; i += 2) {
+      const doc = flat[i];
+      const tf = flat[i + 1];
+      const norm =
+        1 - BM25_B + (BM25_B * this.lengths[doc]) / this.averageLength;
+      scores.set(doc, (idf * tf * (BM25_K1 + 1)) / (tf + BM25_K1 * norm));
+    }
+    return scores;
+  }
+
+  /**
+   * The best `limit` posts matching every word of `query`, newest first on ties.
+   * @param {string} query
+   * @param {number} [limit]
+   * @returns {IndexedPost[]}
+   */
+  search(query, limit = 20) {
+    const queryWords = this.words(query);
+    if (!queryWords.length) return [];
+
+    /** @type {Map<number, number> | null} */
+    let totals = null;
+    for (const word of queryWords) {
+      /** @type {Map<number, number>} */
+      const wordScores = new Map();
+      for (const term of this.expand(word)) {
+        for (const [doc, score] of this.termScores(term)) {
+          if (score > (wordScores.get(doc) ?? 0)) wordScores.set(doc, score);
+        }
+      }
+      if (totals === null) {
+        totals = wordScores;
+      } else {
+        /** @type {Map<number, number>} */
+        const next = new Map();
+        for (const [doc, total] of totals) {
+          const score = wordScores.get(doc);
+          if (score !== undefined) next.set(doc, total + score);
+        }
+        totals = next;
+      }
+      if (!totals.size) return [];
+    }
+
+    const scored = /** @type {Map<number, number>} */ (totals);
+    return [...scored.keys()]
+      .sort((a, b) => {
+        const byScore = /** @type {number} */ (scored.get(b)) - /** @type {number} */ (scored.get(a));
+        if (byScore) return byScore;
+        const dateA = this.posts[a].publishedAt ?? "";
+        const dateB = this.posts[b].publishedAt ?? "";
+        return dateA < dateB ? 1 : dateA > dateB ? -1 : 0;
+      })
+      .slice(0, limit)
+      .map((doc) => this.posts[doc]);
+  }
+}